@@ -2,10 +2,14 @@
 API v1 URL configuration.
 """
 
-from django.urls import include, path
+import re
+
+from django.conf import settings
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
 from apps.accounts.views import (
+    AsyncAgentListView,
     BecomeAgentView,
     CurrentUserView,
     health_check,
@@ -15,7 +19,8 @@ from apps.accounts.views import (
     FeaturedAgentsView,
     ReferrerListView,
 )
-from apps.common.views import LocationViewSet
+from apps.analytics.views import MarketAnalyticsViewSet
+from apps.common.views import AsyncLocationDetailView, AsyncLocationListView, LocationViewSet
 from apps.inquiries.views import AgentInquiryViewSet, PublicInquiryView
 from apps.projects.views import (
     AdminAssetViewSet,
@@ -24,13 +29,18 @@ from apps.projects.views import (
     AdminPaymentViewSet,
     AdminProjectUpdateViewSet,
     AdminProjectViewSet,
+    AsyncProjectDetailView,
+    AsyncProjectListView,
     BuyerContractViewSet,
     PublicProjectViewSet,
 )
 from apps.properties.views import (
     AgentPropertyViewSet,
+    AsyncPropertyDetailView,
+    AsyncPropertyListView,
     PublicPropertyViewSet,
     SavedPropertyViewSet,
+    SavedSearchViewSet,
 )
 
 # Create routers
@@ -40,6 +50,7 @@ router = DefaultRouter()
 router.register(r"properties", PublicPropertyViewSet, basename="public-properties")
 router.register(r"projects", PublicProjectViewSet, basename="public-projects")
 router.register(r"locations", LocationViewSet, basename="locations")
+router.register(r"analytics/market", MarketAnalyticsViewSet, basename="market-analytics")
 
 # Agent routes (auth required)
 router.register(r"agent/properties", AgentPropertyViewSet, basename="agent-properties")
@@ -53,6 +64,7 @@ router.register(r"my/contracts", BuyerContractViewSet, basename="buyer-contracts
 
 # User routes
 router.register(r"saved-properties", SavedPropertyViewSet, basename="saved-properties")
+router.register(r"saved-searches", SavedSearchViewSet, basename="saved-searches")
 
 urlpatterns = [
     # Health check
@@ -124,6 +136,11 @@ urlpatterns = [
         AdminContractViewSet.as_view({"get": "list", "post": "create"}),
         name="admin-project-contracts-list",
     ),
+    path(
+        "admin/projects/<uuid:project_pk>/contracts/export/",
+        AdminContractViewSet.as_view({"get": "export"}),
+        name="admin-project-contracts-export",
+    ),
     path(
         "admin/projects/<uuid:project_pk>/contracts/<uuid:pk>/",
         AdminContractViewSet.as_view(
@@ -157,6 +174,11 @@ urlpatterns = [
         AdminPaymentViewSet.as_view({"get": "list", "post": "create"}),
         name="admin-contract-payments-list",
     ),
+    path(
+        "admin/projects/<uuid:project_pk>/contracts/<uuid:contract_pk>/payments/export/",
+        AdminPaymentViewSet.as_view({"get": "export"}),
+        name="admin-contract-payments-export",
+    ),
     path(
         "admin/projects/<uuid:project_pk>/contracts/<uuid:contract_pk>/payments/<uuid:pk>/",
         AdminPaymentViewSet.as_view(
@@ -180,3 +202,28 @@ urlpatterns = [
     # Router URLs (must be last)
     path("", include(router.urls)),
 ]
+
+
+def async_detail_path(prefix, view, viewset, name):
+    """
+    ``<prefix>/<slug>/`` for an async detail view, leaving the viewset's
+    list actions (``<prefix>/featured/`` etc.) to the router.
+    """
+    actions = "|".join(re.escape(action.url_path) for action in viewset.get_extra_actions() if not action.detail)
+    return re_path(rf"^{prefix}/(?!(?:{actions})/$)(?P<slug>[^/.]+)/$", view.as_view(), name=name)
+
+
+# Async read path for the public catalogue (ASGI deployments); same URLs
+# and names as the routes they front, so they take precedence
+async_urlpatterns = [
+    path("properties/", AsyncPropertyListView.as_view(), name="public-properties-list"),
+    async_detail_path("properties", AsyncPropertyDetailView, PublicPropertyViewSet, "public-properties-detail"),
+    path("projects/", AsyncProjectListView.as_view(), name="public-projects-list"),
+    async_detail_path("projects", AsyncProjectDetailView, PublicProjectViewSet, "public-projects-detail"),
+    path("locations/", AsyncLocationListView.as_view(), name="locations-list"),
+    async_detail_path("locations", AsyncLocationDetailView, LocationViewSet, "locations-detail"),
+    path("agents/", AsyncAgentListView.as_view(), name="agent-list"),
+]
+
+if settings.ASYNC_PUBLIC_API:
+    urlpatterns = async_urlpatterns + urlpatterns
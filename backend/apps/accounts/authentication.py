@@ -2,16 +2,16 @@
 Auth0 JWT Authentication for Django REST Framework.
 """
 
-import json
 import logging
 from typing import Tuple
 
 import jwt
 from django.conf import settings
-from jwt import PyJWKClient
 from rest_framework import authentication, exceptions
 
+from .jwks import get_key_store, get_token_cache
 from .models import User
+from .principals import resolve_principal
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +31,7 @@ class Auth0JWTAuthentication(authentication.BaseAuthentication):
 
         try:
             payload = self._decode_token(token)
-            user = self._get_or_create_user(payload)
+            user = resolve_principal(payload, self._get_or_create_user)
             return (user, payload)
         except jwt.ExpiredSignatureError:
             raise exceptions.AuthenticationFailed("Token has expired")
@@ -45,13 +45,21 @@ class Auth0JWTAuthentication(authentication.BaseAuthentication):
     def _decode_token(self, token: str) -> dict:
         """
         Decode and verify the JWT token using Auth0's JWKS.
-        """
-        jwks_url = f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
-        jwks_client = PyJWKClient(jwks_url)
 
+        Keys come from the process-wide JWKS store and tokens verified
+        before are served from the token cache until they expire.
+        """
+        token_cache = get_token_cache()
+        payload = token_cache.get(token)
+        if payload is not None:
+            return payload
+
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not kid:
+            raise jwt.InvalidTokenError("Token has no key id")
         try:
-            signing_key = jwks_client.get_signing_key_from_jwt(token)
-        except Exception as e:
+            signing_key = get_key_store().get_key(kid)
+        except jwt.InvalidTokenError as e:
             logger.error(f"Failed to get signing key: {e}")
             raise jwt.InvalidTokenError("Failed to get signing key")
 
@@ -62,7 +70,7 @@ class Auth0JWTAuthentication(authentication.BaseAuthentication):
             audience=settings.AUTH0_API_IDENTIFIER,
             issuer=f"https://{settings.AUTH0_DOMAIN}/",
         )
-
+        token_cache.put(token, payload)
         return payload
 
     def _get_or_create_user(self, payload: dict) -> User:
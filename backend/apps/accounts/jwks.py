@@ -0,0 +1,174 @@
+"""
+Process-wide JWKS key store and verified-token cache for Auth0 tokens.
+
+Signing keys are fetched once per process and parsed once, then reused
+until ``AUTH0_JWKS_TTL`` expires. After that the stale keys keep being
+served while a background thread refreshes them, so key rotation never
+blocks a request. A token signed with an unknown ``kid`` (a freshly
+rotated key) triggers a synchronous refresh, rate-limited so bogus kids
+cannot make us hammer the JWKS endpoint.
+
+Verified tokens are kept in a bounded LRU keyed by the SHA-256 of the
+token until their ``exp``, so repeated calls with the same token skip the
+RSA signature check entirely.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import urllib.request
+
+import jwt
+from django.conf import settings
+
+from apps.common.cache import ExpiringLRU
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between refreshes triggered by unknown kids
+UNKNOWN_KID_REFRESH_INTERVAL = 30
+FETCH_TIMEOUT = 5
+
+
+class JWKSKeyStore:
+    """
+    Signing keys from one JWKS URL, refreshed every ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float,
+        refresh_interval: float = UNKNOWN_KID_REFRESH_INTERVAL,
+        clock=time.monotonic,
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.keys = {}
+        self.fetched_at = None
+        self.attempted_at = None
+        self._lock = threading.Lock()
+        self._background_lock = threading.Lock()
+        self._background = None
+
+    def fetch(self) -> dict:
+        """Download and parse the key set; returns ``{kid: PyJWK}``."""
+        request = urllib.request.Request(self.url, headers={"Accept": "application/json"})
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            data = json.load(response)
+        return {key.key_id: key for key in jwt.PyJWKSet.from_dict(data).keys if key.key_id}
+
+    def refresh(self, min_interval: float = 0) -> bool:
+        """
+        Reload the keys unless another thread did within ``min_interval``.
+
+        Returns whether the keys were reloaded. Fetch errors keep the
+        current keys.
+        """
+        requested_at = self.clock()
+        with self._lock:
+            now = self.clock()
+            if self.attempted_at is not None and (
+                self.attempted_at >= requested_at or now - self.attempted_at < min_interval
+            ):
+                # Another thread refreshed while we waited, or did so recently
+                return self.fetched_at == self.attempted_at
+            self.attempted_at = now
+            try:
+                keys = self.fetch()
+            except (OSError, ValueError, jwt.PyJWKError, jwt.PyJWKSetError) as exc:
+                logger.warning("Could not refresh JWKS from %s: %s", self.url, exc)
+                return False
+            self.keys = keys
+            self.fetched_at = now
+            return True
+
+    def _refresh_in_background(self) -> None:
+        with self._background_lock:
+            if self._background is not None and self._background.is_alive():
+                return
+            self._background = threading.Thread(
+                target=self.refresh,
+                kwargs={"min_interval": self.refresh_interval},
+                name="jwks-refresh",
+                daemon=True,
+            )
+            self._background.start()
+
+    def get_key(self, kid: str):
+        """
+        Return the signing key for ``kid``.
+
+        Raises ``jwt.InvalidTokenError`` if the key is unknown even after a
+        refresh.
+        """
+        if self.fetched_at is None:
+            # Retry a failed first fetch at most every refresh_interval
+            self.refresh(min_interval=self.refresh_interval if self.attempted_at is not None else 0)
+        elif self.clock() - self.fetched_at >= self.ttl:
+            self._refresh_in_background()
+
+        key = self.keys.get(kid)
+        if key is None and self.refresh(min_interval=self.refresh_interval):
+            key = self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key '{kid}'")
+        return key
+
+
+class VerifiedTokenCache(ExpiringLRU):
+    """
+    Bounded LRU of verified token payloads, valid until their ``exp``.
+    """
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str, default=None):
+        payload = super().get(self._key(token))
+        return default if payload is None else dict(payload)
+
+    def put(self, token: str, payload: dict) -> None:
+        expires_at = payload.get("exp")
+        if isinstance(expires_at, (int, float)):
+            self.set(self._key(token), dict(payload), expires_at)
+
+
+_lock = threading.Lock()
+_key_stores = {}
+_token_cache = None
+
+
+def jwks_url() -> str:
+    return settings.AUTH0_JWKS_URL or f"https://{settings.AUTH0_DOMAIN}/.well-known/jwks.json"
+
+
+def get_key_store() -> JWKSKeyStore:
+    """Return the process-wide key store for the configured JWKS URL."""
+    url = jwks_url()
+    with _lock:
+        if url not in _key_stores:
+            _key_stores[url] = JWKSKeyStore(url, ttl=settings.AUTH0_JWKS_TTL)
+        return _key_stores[url]
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    """Return the process-wide verified-token cache."""
+    global _token_cache
+    with _lock:
+        if _token_cache is None:
+            _token_cache = VerifiedTokenCache(settings.AUTH0_TOKEN_CACHE_SIZE)
+        return _token_cache
+
+
+def reset() -> None:
+    """Drop the process-wide key stores and token cache (tests)."""
+    global _token_cache
+    with _lock:
+        _key_stores.clear()
+        _token_cache = None
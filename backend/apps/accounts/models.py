@@ -162,10 +162,11 @@ class User(AbstractUser, TimeStampedModel):
     def save(self, *args, **kwargs):
         # Auto-generate slug for agents
         if self.role == self.Role.AGENT and not self.slug:
-            from apps.common.utils import generate_unique_slug
+            from apps.common.utils import save_with_unique_slug
             base_name = self.company_name if self.agent_type == 'company' else self.full_name
-            self.slug = generate_unique_slug(User, base_name or self.email.split('@')[0])
-        super().save(*args, **kwargs)
+            save_with_unique_slug(self, base_name or self.email.split('@')[0], super().save, *args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
 
     @property
     def full_name(self) -> str:
@@ -0,0 +1,100 @@
+"""
+Cached resolution of Auth0 token subjects to users.
+
+Resolving ``sub`` to a ``User`` (and syncing profile claims onto it) costs
+one or two queries and sometimes a write. The result is cached per
+``sub`` in two tiers: an in-process LRU for ``AUTH0_PRINCIPAL_LOCAL_TTL``
+seconds, backed by the shared cache for ``AUTH0_PRINCIPAL_CACHE_TIMEOUT``.
+Each entry records a fingerprint of the profile claims it was resolved
+from, so a token with changed claims goes to the database again.
+
+Saving or deleting a user drops its entries (see ``signals``). Other
+processes may keep serving their local copy for up to the local TTL.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.common.cache import ExpiringLRU
+
+PRINCIPAL_CACHE_PREFIX = "auth:principal"
+
+
+def profile_claims(payload: dict) -> dict:
+    """Return the token claims that ``_get_or_create_user`` reads."""
+    namespaced_email = f"{settings.AUTH0_API_IDENTIFIER}/email"
+    return {
+        name: payload.get(name)
+        for name in ("sub", "email", namespaced_email, "name")
+        if payload.get(name) is not None
+    }
+
+
+def claims_fingerprint(payload: dict) -> str:
+    encoded = json.dumps(profile_claims(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def principal_cache_key(sub: str) -> str:
+    return f"{PRINCIPAL_CACHE_PREFIX}:{hashlib.sha256(sub.encode()).hexdigest()}"
+
+
+_lock = threading.Lock()
+_local = None
+
+
+def get_local_cache() -> ExpiringLRU:
+    global _local
+    with _lock:
+        if _local is None:
+            _local = ExpiringLRU(settings.AUTH0_PRINCIPAL_CACHE_SIZE, clock=time.monotonic)
+        return _local
+
+
+def resolve_principal(payload: dict, load):
+    """
+    Return the user for a verified token payload.
+
+    ``load(payload)`` resolves (and updates) the user from the database on
+    a miss or when the profile claims changed since the cached entry.
+    Callers get their own copy of the cached instance.
+    """
+    sub = payload.get("sub")
+    if not sub:
+        return load(payload)
+    fingerprint = claims_fingerprint(payload)
+    local = get_local_cache()
+
+    entry = local.get(sub)
+    if entry is None or entry[0] != fingerprint:
+        entry = cache.get(principal_cache_key(sub))
+        if entry is not None and entry[0] == fingerprint:
+            local.set(sub, entry, time.monotonic() + settings.AUTH0_PRINCIPAL_LOCAL_TTL)
+        else:
+            user = load(payload)
+            entry = (fingerprint, copy.copy(user))
+            cache.set(principal_cache_key(sub), entry, settings.AUTH0_PRINCIPAL_CACHE_TIMEOUT)
+            local.set(sub, entry, time.monotonic() + settings.AUTH0_PRINCIPAL_LOCAL_TTL)
+            return user
+    return copy.copy(entry[1])
+
+
+def forget_principal(sub: str) -> None:
+    """Drop the cached user for ``sub`` in this process and the shared cache."""
+    if not sub:
+        return
+    get_local_cache().delete(sub)
+    cache.delete(principal_cache_key(sub))
+
+
+def reset() -> None:
+    """Drop the in-process principal cache (tests)."""
+    global _local
+    with _lock:
+        _local = None
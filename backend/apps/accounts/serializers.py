@@ -217,5 +217,9 @@ class AgentWithPropertiesSerializer(AgentDetailSerializer):
 
     def get_properties(self, obj):
         from apps.properties.serializers import PropertyListSerializer
-        properties = obj.properties.filter(status='active').order_by('-is_featured', '-created_at')[:12]
+        properties = (
+            obj.properties.filter(status='active')
+            .select_related('agent', 'card')
+            .order_by('-is_featured', '-created_at')[:12]
+        )
         return PropertyListSerializer(properties, many=True, context=self.context).data
@@ -0,0 +1,34 @@
+"""
+Signal handlers for the accounts app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.cache import invalidate
+
+from .models import User
+from .principals import forget_principal
+
+# Saves that never change public agent data
+IGNORED_FIELDS = {"last_login"}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_agent_caches(sender, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and set(update_fields) <= IGNORED_FIELDS):
+        return
+    invalidate("agents")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_principal(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not instance.auth0_id or (update_fields is not None and set(update_fields) <= IGNORED_FIELDS):
+        return
+    sub = instance.auth0_id
+    forget_principal(sub)
+    # Again after commit, in case a concurrent request re-cached the old row
+    transaction.on_commit(lambda: forget_principal(sub))
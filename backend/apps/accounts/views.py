@@ -9,6 +9,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.common.async_views import AsyncReadView
+from apps.common.cache import cached_response, get_or_refresh, request_cache_key
+from apps.common.replicas import ReadReplicaMixin
+
 from .models import User
 from .serializers import (
     UserProfileUpdateSerializer,
@@ -104,11 +108,12 @@ class BecomeAgentView(APIView):
         )
 
 
-class AgentListView(generics.ListAPIView):
+class AgentListView(ReadReplicaMixin, generics.ListAPIView):
     """
     List all agents and companies (public directory).
     """
 
+    read_replica_tags = ("agents", "properties")
     serializer_class = AgentListSerializer
     permission_classes = [permissions.AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -128,6 +133,7 @@ class AgentListView(generics.ListAPIView):
             )
         )
 
+    @cached_response("agents", "properties")
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
@@ -150,11 +156,19 @@ class AgentListView(generics.ListAPIView):
         return Response({"success": True, "data": serializer.data})
 
 
-class AgentDetailView(generics.RetrieveAPIView):
+class AsyncAgentListView(AsyncReadView):
+    """Async front for ``AgentListView`` (``ASYNC_PUBLIC_API``)."""
+
+    sync_view = AgentListView.as_view()
+    cache_tags = ("agents", "properties")
+
+
+class AgentDetailView(ReadReplicaMixin, generics.RetrieveAPIView):
     """
     Get agent/company profile by slug ("Tu Página").
     """
 
+    read_replica_tags = ("agents", "properties")
     serializer_class = AgentWithPropertiesSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = "slug"
@@ -176,11 +190,12 @@ class AgentDetailView(generics.RetrieveAPIView):
         return Response({"success": True, "data": serializer.data})
 
 
-class CompanyAgentsView(generics.ListAPIView):
+class CompanyAgentsView(ReadReplicaMixin, generics.ListAPIView):
     """
     List agents working for a specific company.
     """
 
+    read_replica_tags = ("agents", "properties")
     serializer_class = AgentListSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -203,11 +218,12 @@ class CompanyAgentsView(generics.ListAPIView):
         return Response({"success": True, "data": serializer.data})
 
 
-class FeaturedAgentsView(generics.ListAPIView):
+class FeaturedAgentsView(ReadReplicaMixin, generics.ListAPIView):
     """
     List featured/verified agents and companies.
     """
 
+    read_replica_tags = ("agents", "properties")
     serializer_class = AgentListSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -224,9 +240,13 @@ class FeaturedAgentsView(generics.ListAPIView):
         ).order_by("-total_listings")[:8]
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({"success": True, "data": serializer.data})
+        def compute():
+            return self.get_serializer(self.get_queryset(), many=True).data
+
+        data = get_or_refresh(
+            request_cache_key("featured_agents", request), compute, tags=("agents", "properties")
+        )
+        return Response({"success": True, "data": data})
 
 
 class ReferrerListView(generics.ListAPIView):
@@ -0,0 +1,34 @@
+"""
+Admin configuration for the analytics app.
+"""
+
+from django.contrib import admin
+
+from .models import MarketRollup
+
+
+@admin.register(MarketRollup)
+class MarketRollupAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for market rollups (written by refresh_market_rollups).
+    """
+
+    list_display = [
+        "period",
+        "scope",
+        "key",
+        "listing_type",
+        "property_type",
+        "listing_count",
+        "price_median",
+        "price_per_sqm_median",
+    ]
+    list_filter = ["period", "scope", "listing_type", "property_type"]
+    search_fields = ["city", "state", "location__name"]
+    date_hierarchy = "period"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,25 @@
+"""
+Recompute today's market analytics rollups.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics.rollups import DEFAULT_RETENTION_DAYS, refresh_market_rollups
+from apps.common.cache import invalidate
+
+
+class Command(BaseCommand):
+    help = "Snapshot price, price-per-sqm and inventory statistics per market segment (run daily)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=DEFAULT_RETENTION_DAYS,
+            help="Delete rollups older than this many days (0 keeps everything)",
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_market_rollups(keep_days=options["keep_days"])
+        invalidate("analytics")
+        self.stdout.write(self.style.SUCCESS(f"Done! Wrote {count} market rollups."))
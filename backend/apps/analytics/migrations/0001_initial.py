@@ -0,0 +1,213 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("common", "0001_add_location_model"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MarketRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("period", models.DateField(db_index=True, help_text="Snapshot date")),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[
+                            ("market", "Market"),
+                            ("state", "State"),
+                            ("city", "City"),
+                            ("location", "Location"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        blank=True,
+                        help_text='"", the state, "city|state" or the location id',
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "listing_type",
+                    models.CharField(
+                        choices=[("sale", "For Sale"), ("rent", "For Rent")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "property_type",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("beach_apartment", "Beach Apartment"),
+                            ("apartment", "Apartment"),
+                            ("house", "House"),
+                            ("villa", "Villa"),
+                            ("penthouse", "Penthouse"),
+                            ("finca", "Finca / Country Estate"),
+                            ("townhouse", "Townhouse"),
+                            ("beach_house", "Beach House"),
+                            ("land", "Land"),
+                            ("commercial", "Commercial"),
+                        ],
+                        help_text="Empty for all types",
+                        max_length=20,
+                    ),
+                ),
+                ("city", models.CharField(blank=True, max_length=100)),
+                ("state", models.CharField(blank=True, max_length=100)),
+                ("listing_count", models.PositiveIntegerField(default=0)),
+                (
+                    "new_listing_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Active listings created in the trailing window",
+                    ),
+                ),
+                (
+                    "price_min",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "price_p10",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "price_p25",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "price_median",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "price_p75",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "price_p90",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "price_max",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "price_mean",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=14, null=True
+                    ),
+                ),
+                (
+                    "area_sample",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Listings with an area"
+                    ),
+                ),
+                (
+                    "price_per_sqm_p25",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=12, null=True
+                    ),
+                ),
+                (
+                    "price_per_sqm_median",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=12, null=True
+                    ),
+                ),
+                (
+                    "price_per_sqm_p75",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=12, null=True
+                    ),
+                ),
+                (
+                    "price_per_sqm_mean",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=12, null=True
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="market_rollups",
+                        to="common.location",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Market Rollup",
+                "verbose_name_plural": "Market Rollups",
+                "ordering": [
+                    "-period",
+                    "scope",
+                    "key",
+                    "listing_type",
+                    "property_type",
+                ],
+                "indexes": [
+                    models.Index(
+                        fields=[
+                            "scope",
+                            "key",
+                            "listing_type",
+                            "property_type",
+                            "period",
+                        ],
+                        name="analytics_m_scope_85c5a3_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "period",
+                            "scope",
+                            "key",
+                            "listing_type",
+                            "property_type",
+                        ),
+                        name="unique_market_rollup",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,85 @@
+"""
+Models for the analytics app.
+"""
+
+from django.db import models
+
+from apps.common.models import TimeStampedModel
+from apps.properties.models import ListingType, PropertyType
+
+
+class MarketRollup(TimeStampedModel):
+    """
+    Daily market statistics for one segment of the active inventory.
+
+    A segment is a geographic scope (whole market, state, city/state or
+    Location) crossed with a listing type and optionally a property type
+    (``property_type=""`` covers all types). Rows are written by the
+    ``refresh_market_rollups`` command and are the only thing the public
+    analytics endpoints read.
+    """
+
+    class Scope(models.TextChoices):
+        MARKET = "market", "Market"
+        STATE = "state", "State"
+        CITY = "city", "City"
+        LOCATION = "location", "Location"
+
+    period = models.DateField(db_index=True, help_text="Snapshot date")
+    scope = models.CharField(max_length=10, choices=Scope.choices)
+    key = models.CharField(
+        max_length=255, blank=True, help_text='"", the state, "city|state" or the location id'
+    )
+    listing_type = models.CharField(max_length=10, choices=ListingType.choices)
+    property_type = models.CharField(
+        max_length=20, choices=PropertyType.choices, blank=True, help_text="Empty for all types"
+    )
+    city = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=100, blank=True)
+    location = models.ForeignKey(
+        "common.Location",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="market_rollups",
+    )
+
+    # Inventory
+    listing_count = models.PositiveIntegerField(default=0)
+    new_listing_count = models.PositiveIntegerField(
+        default=0, help_text="Active listings created in the trailing window"
+    )
+
+    # Price distribution (USD)
+    price_min = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    price_p10 = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    price_p25 = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    price_median = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    price_p75 = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    price_p90 = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    price_max = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    price_mean = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+
+    # Price per square meter, over listings with a known area
+    area_sample = models.PositiveIntegerField(default=0, help_text="Listings with an area")
+    price_per_sqm_p25 = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    price_per_sqm_median = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    price_per_sqm_p75 = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    price_per_sqm_mean = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Market Rollup"
+        verbose_name_plural = "Market Rollups"
+        ordering = ["-period", "scope", "key", "listing_type", "property_type"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "scope", "key", "listing_type", "property_type"],
+                name="unique_market_rollup",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["scope", "key", "listing_type", "property_type", "period"]),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.scope}:{self.key or '*'} {self.listing_type}/{self.property_type or 'all'}"
@@ -0,0 +1,171 @@
+"""
+Market rollup computation.
+
+The active inventory is loaded once as NumPy arrays; every listing is
+assigned to each segment it belongs to (market, state, city, location x
+all types / its own type, within its listing type), and the statistics of
+all segments are computed together: values are sorted by (segment, value)
+and each quantile is read by position from the segment's sorted run.
+"""
+
+import datetime
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from apps.properties.models import Property, PropertyStatus
+
+from .models import MarketRollup
+
+NEW_LISTING_DAYS = 30
+DEFAULT_RETENTION_DAYS = 730
+
+# Quantile -> (price field, price-per-sqm field)
+QUANTILES = (
+    (0.0, "price_min", None),
+    (0.1, "price_p10", None),
+    (0.25, "price_p25", "price_per_sqm_p25"),
+    (0.5, "price_median", "price_per_sqm_median"),
+    (0.75, "price_p75", "price_per_sqm_p75"),
+    (0.9, "price_p90", None),
+    (1.0, "price_max", None),
+)
+
+
+def grouped_stats(codes: np.ndarray, values: np.ndarray, quantiles) -> dict:
+    """
+    Compute per-group quantiles and means of ``values``.
+
+    ``codes`` assigns each value to a group; NaN values are ignored.
+    Quantiles use linear interpolation, like ``np.quantile``. Returns
+    ``{code: (count, [quantile values], mean)}`` for groups with data.
+    """
+    keep = ~np.isnan(values)
+    codes, values = codes[keep], values[keep]
+    if not len(values):
+        return {}
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    groups, starts, counts = np.unique(codes, return_index=True, return_counts=True)
+
+    positions = starts[:, None] + np.asarray(quantiles)[None, :] * (counts[:, None] - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.ceil(positions).astype(int)
+    results = values[lower] + (values[upper] - values[lower]) * (positions - lower)
+    means = np.add.reduceat(values, starts) / counts
+
+    return {
+        int(code): (int(count), row.tolist(), float(mean))
+        for code, count, row, mean in zip(groups, counts, results, means)
+    }
+
+
+def _segments(row) -> list:
+    """
+    Return the segment keys a listing contributes to.
+    """
+    listing_type, property_type, city, state, location_id = row
+    scopes = [
+        (MarketRollup.Scope.MARKET, "", "", "", None),
+        (MarketRollup.Scope.STATE, state, "", state, None),
+        (MarketRollup.Scope.CITY, f"{city}|{state}", city, state, None),
+    ]
+    if location_id:
+        scopes.append((MarketRollup.Scope.LOCATION, str(location_id), "", "", location_id))
+    return [
+        (scope, key, listing_type, kind, city_name, state_name, location)
+        for scope, key, city_name, state_name, location in scopes
+        for kind in ("", property_type)
+    ]
+
+
+def _money(value):
+    return None if value is None or np.isnan(value) else Decimal(f"{value:.2f}")
+
+
+def compute_rollups(period: datetime.date = None) -> list:
+    """
+    Build (unsaved) rollup rows for the current active inventory.
+    """
+    period = period or timezone.localdate()
+    rows = list(
+        Property.objects.filter(status=PropertyStatus.ACTIVE)
+        .order_by()
+        .values_list(
+            "listing_type", "property_type", "city", "state", "location_id", "price", "area_sqm", "created_at"
+        )
+    )
+    if not rows:
+        return []
+
+    price = np.array([float(row[5]) for row in rows])
+    area = np.array([float(row[6]) if row[6] else np.nan for row in rows])
+    price_per_sqm = price / area
+    cutoff = timezone.now() - datetime.timedelta(days=NEW_LISTING_DAYS)
+    is_new = np.array([row[7] >= cutoff for row in rows])
+
+    segment_codes = {}
+    members, codes = [], []
+    for index, row in enumerate(rows):
+        for segment in _segments(row[:5]):
+            members.append(index)
+            codes.append(segment_codes.setdefault(segment, len(segment_codes)))
+    members = np.array(members)
+    codes = np.array(codes)
+
+    listing_counts = np.bincount(codes, minlength=len(segment_codes))
+    new_counts = np.bincount(codes, weights=is_new[members], minlength=len(segment_codes))
+    levels = [quantile for quantile, _price_field, _sqm_field in QUANTILES]
+    price_stats = grouped_stats(codes, price[members], levels)
+    sqm_stats = grouped_stats(codes, price_per_sqm[members], levels)
+
+    rollups = []
+    for segment, code in segment_codes.items():
+        scope, key, listing_type, property_type, city, state, location_id = segment
+        values = {
+            "listing_count": int(listing_counts[code]),
+            "new_listing_count": int(new_counts[code]),
+        }
+        if code in price_stats:
+            _count, quantiles, mean = price_stats[code]
+            for (_level, field, _sqm_field), value in zip(QUANTILES, quantiles):
+                values[field] = _money(value)
+            values["price_mean"] = _money(mean)
+        if code in sqm_stats:
+            count, quantiles, mean = sqm_stats[code]
+            values["area_sample"] = count
+            for (_level, _field, sqm_field), value in zip(QUANTILES, quantiles):
+                if sqm_field:
+                    values[sqm_field] = _money(value)
+            values["price_per_sqm_mean"] = _money(mean)
+        rollups.append(
+            MarketRollup(
+                period=period,
+                scope=scope,
+                key=key,
+                listing_type=listing_type,
+                property_type=property_type,
+                city=city,
+                state=state,
+                location_id=location_id,
+                **values,
+            )
+        )
+    return rollups
+
+
+def refresh_market_rollups(period: datetime.date = None, keep_days: int = DEFAULT_RETENTION_DAYS) -> int:
+    """
+    Replace the rollups of ``period`` (today by default) and drop rows
+    older than ``keep_days``; returns the number of rows written.
+    """
+    period = period or timezone.localdate()
+    rollups = compute_rollups(period)
+    with transaction.atomic():
+        MarketRollup.objects.filter(period=period).delete()
+        MarketRollup.objects.bulk_create(rollups, batch_size=1000)
+        if keep_days:
+            MarketRollup.objects.filter(period__lt=period - datetime.timedelta(days=keep_days)).delete()
+    return len(rollups)
@@ -0,0 +1,72 @@
+"""
+Serializers for the analytics app.
+"""
+
+from rest_framework import serializers
+
+from .models import MarketRollup
+
+
+class MarketRollupSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a market segment snapshot.
+    """
+
+    location = serializers.SlugRelatedField(slug_field="slug", read_only=True)
+    location_name = serializers.CharField(source="location.name", read_only=True, default=None)
+    price = serializers.SerializerMethodField()
+    price_per_sqm = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MarketRollup
+        fields = [
+            "period",
+            "scope",
+            "listing_type",
+            "property_type",
+            "city",
+            "state",
+            "location",
+            "location_name",
+            "listing_count",
+            "new_listing_count",
+            "price",
+            "area_sample",
+            "price_per_sqm",
+        ]
+
+    def get_price(self, obj):
+        return {
+            "min": obj.price_min,
+            "p10": obj.price_p10,
+            "p25": obj.price_p25,
+            "median": obj.price_median,
+            "p75": obj.price_p75,
+            "p90": obj.price_p90,
+            "max": obj.price_max,
+            "mean": obj.price_mean,
+        }
+
+    def get_price_per_sqm(self, obj):
+        return {
+            "p25": obj.price_per_sqm_p25,
+            "median": obj.price_per_sqm_median,
+            "p75": obj.price_per_sqm_p75,
+            "mean": obj.price_per_sqm_mean,
+        }
+
+
+class MarketTrendSerializer(serializers.ModelSerializer):
+    """
+    Compact serializer for one point of a segment's time series.
+    """
+
+    class Meta:
+        model = MarketRollup
+        fields = [
+            "period",
+            "listing_count",
+            "new_listing_count",
+            "price_median",
+            "price_per_sqm_median",
+        ]
@@ -0,0 +1,112 @@
+"""
+Views for the analytics app.
+"""
+
+import datetime
+
+from django.db.models import Max
+from django.utils.dateparse import parse_date
+from rest_framework import permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from apps.common.cache import cached_response
+from apps.properties.models import ListingType, PropertyType
+
+from .models import MarketRollup
+from .rollups import DEFAULT_RETENTION_DAYS
+from .serializers import MarketRollupSerializer, MarketTrendSerializer
+
+DEFAULT_TREND_DAYS = 90
+# Parameters that identify a single segment of each scope
+TREND_REQUIRED_PARAMS = {
+    MarketRollup.Scope.STATE: ("state",),
+    MarketRollup.Scope.CITY: ("city", "state"),
+    MarketRollup.Scope.LOCATION: ("location",),
+}
+
+
+class MarketAnalyticsViewSet(viewsets.GenericViewSet):
+    """
+    Public market statistics, served from precomputed rollups only.
+
+    Query parameters:
+    - scope: market, state, city or location (default: location when
+      ``location`` is given, else city)
+    - state, city, location (slug): narrow the segments
+    - listing_type: sale (default) or rent
+    - property_type: a property type (default: all types combined)
+    """
+
+    permission_classes = [permissions.AllowAny]
+    serializer_class = MarketRollupSerializer
+    pagination_class = None
+
+    def get_scope(self):
+        params = self.request.query_params
+        return params.get("scope") or (
+            MarketRollup.Scope.LOCATION if params.get("location") else MarketRollup.Scope.CITY
+        )
+
+    def get_segment_queryset(self):
+        params = self.request.query_params
+        scope = self.get_scope()
+        if scope not in MarketRollup.Scope.values:
+            raise ValidationError({"scope": [f"Invalid scope '{scope}'"]})
+        listing_type = params.get("listing_type") or ListingType.SALE
+        if listing_type not in ListingType.values:
+            raise ValidationError({"listing_type": [f"Invalid listing type '{listing_type}'"]})
+        property_type = params.get("property_type", "")
+        if property_type and property_type not in PropertyType.values:
+            raise ValidationError({"property_type": [f"Invalid property type '{property_type}'"]})
+
+        queryset = MarketRollup.objects.filter(
+            scope=scope, listing_type=listing_type, property_type=property_type
+        ).select_related("location")
+        if params.get("state"):
+            queryset = queryset.filter(state__iexact=params["state"])
+        if params.get("city"):
+            queryset = queryset.filter(city__iexact=params["city"])
+        if params.get("location"):
+            queryset = queryset.filter(location__slug=params["location"])
+        return queryset
+
+    @cached_response("analytics")
+    def list(self, request):
+        """Get the latest (or ``period``) snapshot of the matching segments."""
+        queryset = self.get_segment_queryset()
+        if request.query_params.get("period"):
+            period = parse_date(request.query_params["period"])
+            if period is None:
+                raise ValidationError({"period": ["Use the YYYY-MM-DD format"]})
+        else:
+            period = MarketRollup.objects.aggregate(latest=Max("period"))["latest"]
+
+        rollups = queryset.filter(period=period).order_by("-listing_count", "key")
+        serializer = self.get_serializer(rollups, many=True)
+        return Response({"success": True, "data": serializer.data, "meta": {"period": period}})
+
+    @action(detail=False, methods=["get"])
+    @cached_response("analytics")
+    def trend(self, request):
+        """Get the daily time series of one segment over the last ``days`` days."""
+        params = request.query_params
+        queryset = self.get_segment_queryset()
+        scope = self.get_scope()
+        missing = [name for name in TREND_REQUIRED_PARAMS.get(scope, ()) if not params.get(name)]
+        if missing:
+            raise ValidationError({name: [f"This parameter is required for the {scope} scope"] for name in missing})
+
+        try:
+            days = int(params.get("days", DEFAULT_TREND_DAYS))
+        except ValueError:
+            raise ValidationError({"days": ["days must be an integer"]})
+        days = min(max(days, 1), DEFAULT_RETENTION_DAYS)
+        latest = queryset.aggregate(latest=Max("period"))["latest"]
+        if latest is None:
+            return Response({"success": True, "data": []})
+
+        series = queryset.filter(period__gt=latest - datetime.timedelta(days=days)).order_by("period")
+        serializer = MarketTrendSerializer(series, many=True)
+        return Response({"success": True, "data": serializer.data})
@@ -5,3 +5,6 @@ class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.common"
     verbose_name = "Common"
+
+    def ready(self):
+        from . import signals  # noqa: F401
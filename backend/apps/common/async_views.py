@@ -0,0 +1,156 @@
+"""
+Async read path for public catalogue endpoints.
+
+Enabled with ``ASYNC_PUBLIC_API`` when serving through ASGI (uvicorn). An
+``AsyncReadView`` answers what it can without leaving the event loop:
+
+- conditional GETs, validated with the async ORM and async cache calls
+  (``304 Not Modified``);
+- anonymous responses already in the response cache (same keys as
+  ``cached_response``, so both paths share entries).
+
+Both are subject to the DRF view's throttles, as on the sync path.
+Anything else (cache misses, authenticated requests) is handed to the
+regular DRF view in a worker thread, so filtering, serializers and the
+response envelope stay in one place, and the response it produces fills
+the cache for the next anonymous request.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import classonlymethod
+from django.utils.http import http_date, quote_etag
+from django.views import View
+from rest_framework.renderers import JSONRenderer
+
+from .cache import aget_generations, build_response_cache_key
+from .conditional import validators_from
+from .replicas import PIN_COOKIE, arecently_changed, use_read_replica
+
+
+async def amake_validators(updated_at, tags=(), *parts):
+    """Async ``make_validators``."""
+    return validators_from(updated_at, await aget_generations(*tags), *parts)
+
+
+def is_anonymous(request) -> bool:
+    """
+    Whether a request carries no credentials, without touching the session
+    or user (which would need the database).
+    """
+    return "HTTP_AUTHORIZATION" not in request.META and settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    """Render ``data`` exactly like DRF's JSON renderer."""
+    response = HttpResponse(JSONRenderer().render(data), status=status, content_type="application/json")
+    response["Vary"] = "Accept"
+    return response
+
+
+def _set_validator_headers(response, etag, timestamp):
+    response.headers.setdefault("ETag", quote_etag(etag))
+    if timestamp is not None:
+        response.headers.setdefault("Last-Modified", http_date(timestamp))
+    return response
+
+
+class AsyncReadView(View):
+    """
+    Async front for a read-only DRF view.
+
+    Subclasses set ``sync_view`` (e.g. ``ViewSet.as_view({"get": "list"})``)
+    and optionally ``cache_tags`` (the tags of its ``cached_response``) and
+    an async ``get_validators`` mirroring its ``conditional`` validators.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    sync_view = None
+    cache_tags = ()
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # DRF views are CSRF-exempt and these only answer safe methods
+        view.csrf_exempt = True
+        return view
+
+    async def get_validators(self, request, *args, **kwargs):
+        """Return ``(etag, last_modified)`` or None to skip conditional GET."""
+        return None
+
+    async def not_modified(self, request, *args, **kwargs):
+        """Hook run before answering 304 (e.g. to count the view)."""
+
+    async def throttled(self, request) -> bool:
+        """
+        Whether a throttle of the DRF view refuses this anonymous request.
+
+        Only checked before answering from here; refused requests are then
+        delegated so the DRF view produces its 429.
+        """
+        if not hasattr(request, "user"):
+            request.user = AnonymousUser()
+        throttles = [throttle_class() for throttle_class in type(self).sync_view.cls.throttle_classes]
+        if not throttles:
+            return False
+
+        def refused():
+            return not all(throttle.allow_request(request, self) for throttle in throttles)
+
+        # Throttles use the (thread-safe) cache, not the database
+        return await sync_to_async(refused, thread_sensitive=False)()
+
+    async def reads_from_replica(self, request) -> bool:
+        """``ReadReplicaMixin`` rules, for the validator queries."""
+        tags = getattr(type(self).sync_view.cls, "read_replica_tags", ())
+        return bool(
+            settings.DATABASE_REPLICAS and PIN_COOKIE not in request.COOKIES and not await arecently_changed(*tags)
+        )
+
+    async def get(self, request, *args, **kwargs):
+        if not is_anonymous(request):
+            return await self.delegate(request, *args, **kwargs)
+
+        if await self.reads_from_replica(request):
+            with use_read_replica():
+                validators = await self.get_validators(request, *args, **kwargs)
+        else:
+            validators = await self.get_validators(request, *args, **kwargs)
+        if validators is not None:
+            etag, last_modified = validators
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is not None:
+                if await self.throttled(request):
+                    return await self.delegate(request, *args, **kwargs)
+                await self.not_modified(request, *args, **kwargs)
+                return _set_validator_headers(response, etag, timestamp)
+
+        if self.cache_tags:
+            key = build_response_cache_key(request, await aget_generations(*self.cache_tags))
+            data = await cache.aget(key)
+            if data is not None:
+                if await self.throttled(request):
+                    return await self.delegate(request, *args, **kwargs)
+                response = json_response(data)
+                if validators is not None:
+                    _set_validator_headers(response, etag, timestamp)
+                return response
+
+        # The DRF view applies its own throttles
+        return await self.delegate(request, *args, **kwargs)
+
+    async def delegate(self, request, *args, **kwargs):
+        """Run (and render) the DRF view in a worker thread."""
+        return await sync_to_async(self.render_sync_view)(request, *args, **kwargs)
+
+    def render_sync_view(self, request, *args, **kwargs):
+        response = type(self).sync_view(request, *args, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        return response
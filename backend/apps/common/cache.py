@@ -0,0 +1,282 @@
+"""
+Cache key and invalidation helpers.
+
+Cached responses are keyed by a stable digest of their inputs plus the
+current *generation* of every data tag they depend on (``"properties"``,
+``"projects"``...). Writes bump the generation instead of deleting keys, so
+invalidation is O(1) on any cache backend and stale entries simply expire.
+"""
+
+import functools
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import get_language_from_request
+from rest_framework.response import Response
+
+GENERATION_PREFIX = "gen"
+# Query parameters that never change the underlying result set
+PAGINATION_PARAMS = frozenset({"page", "page_size", "cursor", "pagination"})
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Stale-while-revalidate defaults (seconds)
+SWR_SOFT_TTL = 60
+SWR_HARD_TTL = 3600
+SWR_LOCK_TIMEOUT = 30
+SWR_COLD_WAIT = 1.0
+
+
+def make_cache_key(prefix: str, *parts, params=None) -> str:
+    """
+    Build a cache key from a prefix, positional parts and a params mapping.
+
+    Unlike ``hash()``, the digest is stable across processes.
+    """
+    payload = json.dumps([parts, params or {}], sort_keys=True, default=str, separators=(",", ":"))
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def normalize_params(query_params, exclude=PAGINATION_PARAMS) -> dict:
+    """
+    Return query parameters as a canonical dict: empty values and excluded
+    names are dropped and repeated values are sorted.
+    """
+    normalized = {}
+    for name in sorted(query_params.keys()):
+        if name in exclude:
+            continue
+        values = sorted(value.strip() for value in query_params.getlist(name) if value.strip())
+        if values:
+            normalized[name] = values if len(values) > 1 else values[0]
+    return normalized
+
+
+def _generation_key(tag: str) -> str:
+    return f"{GENERATION_PREFIX}:{tag}"
+
+
+def get_generations(*tags) -> dict:
+    """
+    Return the current generation of each tag.
+
+    A missing generation (cold or evicted cache) is seeded from the clock so
+    it can never roll back to a value used by entries still in the cache.
+    """
+    keys = {_generation_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    generations = {}
+    for key, tag in keys.items():
+        value = found.get(key)
+        if value is None:
+            value = int(time.time() * 1000)
+            if not cache.add(key, value, timeout=None):
+                value = cache.get(key, value)
+        generations[tag] = value
+    return generations
+
+
+async def aget_generations(*tags) -> dict:
+    """Async ``get_generations``, for async views."""
+    keys = {_generation_key(tag): tag for tag in tags}
+    found = await cache.aget_many(list(keys))
+    generations = {}
+    for key, tag in keys.items():
+        value = found.get(key)
+        if value is None:
+            value = int(time.time() * 1000)
+            if not await cache.aadd(key, value, timeout=None):
+                value = await cache.aget(key, value)
+        generations[tag] = value
+    return generations
+
+
+def bump_generation(*tags) -> None:
+    """
+    Invalidate every cached entry that depends on any of the tags.
+    """
+    now = int(time.time() * 1000)
+    keys = [_generation_key(tag) for tag in tags]
+    current = cache.get_many(keys)
+    cache.set_many({key: max(current.get(key, 0) + 1, now) for key in keys}, timeout=None)
+
+
+def invalidate(*tags) -> None:
+    """
+    Bump the tags now and again once the current transaction commits, so a
+    reader racing the write cannot re-cache pre-commit data under the new
+    generation.
+    """
+    bump_generation(*tags)
+    transaction.on_commit(lambda: bump_generation(*tags))
+
+
+def response_cache_key(request, *tags) -> str:
+    """
+    Key a GET response by absolute path, canonical query parameters,
+    negotiated language and the generations of the tags it depends on.
+    """
+    return build_response_cache_key(request, get_generations(*tags))
+
+
+def build_response_cache_key(request, generations: dict) -> str:
+    # Works for Django and DRF requests (``GET`` is ``query_params``)
+    return make_cache_key(
+        "response",
+        request.build_absolute_uri(request.path),
+        get_language_from_request(request),
+        generations,
+        params=normalize_params(request.GET, exclude=()),
+    )
+
+
+def cached_response(*tags, timeout: int = RESPONSE_CACHE_TIMEOUT):
+    """
+    Cache successful anonymous GET responses of a view method.
+
+    ``tags`` name the data the response is built from; bumping any of them
+    (see ``invalidate``) makes the cached entry unreachable.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method != "GET" or request.user.is_authenticated:
+                return method(view, request, *args, **kwargs)
+            key = response_cache_key(request, *tags)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def request_cache_key(prefix: str, request) -> str:
+    """
+    Key data that varies only by host (absolute URLs) and language.
+    """
+    return make_cache_key(
+        prefix, request.build_absolute_uri(request.path), get_language_from_request(request)
+    )
+
+
+def _store(key: str, compute, soft_ttl: int, hard_ttl: int, generations: dict):
+    started = time.monotonic()
+    value = compute()
+    entry = {
+        "value": value,
+        "soft_expires": time.time() + soft_ttl,
+        "delta": time.monotonic() - started,
+        "generations": generations,
+    }
+    cache.set(key, entry, hard_ttl)
+    return value
+
+
+def _is_fresh(entry: dict, generations: dict, beta: float) -> bool:
+    if entry["generations"] != generations:
+        return False
+    # XFetch: refresh early with a probability that grows as expiry nears
+    # and with how long the value takes to compute
+    jitter = entry["delta"] * beta * -math.log(1.0 - random.random())
+    return time.time() + jitter < entry["soft_expires"]
+
+
+def get_or_refresh(
+    key: str,
+    compute,
+    tags=(),
+    soft_ttl: int = SWR_SOFT_TTL,
+    hard_ttl: int = SWR_HARD_TTL,
+    beta: float = 1.0,
+):
+    """
+    Return a cached value, recomputing it with stale-while-revalidate.
+
+    Past ``soft_ttl`` (or after any of ``tags`` is bumped) the value is
+    stale: one caller wins a lock and recomputes while the others keep
+    serving the stale value until ``hard_ttl``. Values close to expiry are
+    refreshed early at random (XFetch) so the herd rarely sees a stale one.
+    On a cold miss callers briefly wait for the lock holder's result.
+    """
+    generations = get_generations(*tags)
+    lock_key = f"{key}:lock"
+    entry = cache.get(key)
+
+    if entry is not None:
+        if _is_fresh(entry, generations, beta):
+            return entry["value"]
+        if not cache.add(lock_key, 1, SWR_LOCK_TIMEOUT):
+            return entry["value"]
+    elif not cache.add(lock_key, 1, SWR_LOCK_TIMEOUT):
+        deadline = time.monotonic() + SWR_COLD_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry["value"]
+        return compute()
+
+    try:
+        return _store(key, compute, soft_ttl, hard_ttl, generations)
+    finally:
+        cache.delete(lock_key)
+
+
+class ExpiringLRU:
+    """
+    Thread-safe in-process LRU whose entries carry their own expiry.
+
+    ``expires_at`` is compared with ``clock()`` (``time.time`` by default).
+    """
+
+    def __init__(self, max_size: int, clock=time.time):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if self.clock() >= expires_at:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at: float) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
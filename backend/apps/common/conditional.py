@@ -0,0 +1,74 @@
+"""
+Conditional GET (ETag / Last-Modified) support for API views.
+"""
+
+import datetime
+import functools
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_generations
+
+
+def make_validators(updated_at, tags=(), *parts):
+    """
+    Build ``(etag, last_modified)`` for a representation.
+
+    The ETag covers the row timestamp, the generations of the tags the
+    representation embeds (related rows that do not touch ``updated_at``)
+    and any extra ``parts`` (e.g. the requesting user). Last-Modified is the
+    newest of ``updated_at`` and the tag generations, which are
+    millisecond timestamps.
+    """
+    return validators_from(updated_at, get_generations(*tags), *parts)
+
+
+def validators_from(updated_at, generations: dict, *parts):
+    """``make_validators`` with the tag generations already fetched."""
+    payload = "|".join(
+        [updated_at.isoformat() if updated_at else "", repr(sorted(generations.items())), *map(str, parts)]
+    )
+    etag = f'W/"{hashlib.sha1(payload.encode()).hexdigest()[:32]}"'
+
+    last_modified = updated_at
+    if generations:
+        newest = datetime.datetime.fromtimestamp(max(generations.values()) / 1000, tz=datetime.timezone.utc)
+        last_modified = max(last_modified, newest) if last_modified else newest
+    return etag, last_modified
+
+
+def conditional(validators):
+    """
+    Decorate a GET view method with ETag / Last-Modified handling.
+
+    ``validators`` names a view method called as ``(request, *args,
+    **kwargs)`` that returns ``(etag, last_modified)`` from a cheap query,
+    or None to skip (e.g. not found). A matching ``If-None-Match`` /
+    ``If-Modified-Since`` returns 304 before the decorated method (and its
+    serializer) runs.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            result = getattr(view, validators)(request, *args, **kwargs)
+            if result is None:
+                return method(view, request, *args, **kwargs)
+            etag, last_modified = result
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response.headers.setdefault("ETag", quote_etag(etag))
+            if timestamp is not None:
+                response.headers.setdefault("Last-Modified", http_date(timestamp))
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,73 @@
+"""
+Shared filter backends and filter sets.
+"""
+
+from django_filters import rest_framework as django_filters
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from . import geo
+from .search import SEARCH_RANK
+
+DEFAULT_RADIUS_KM = 10
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter aware of query-time annotations.
+
+    Full-text search results are ordered by relevance when the client did
+    not ask for an explicit ordering, and annotation-backed ordering fields
+    (e.g. ``distance``) are ignored unless the annotation is present.
+    """
+
+    annotation_fields = {"distance"}
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params and SEARCH_RANK in queryset.query.annotations:
+            return [f"-{SEARCH_RANK}", *(self.get_default_ordering(view) or [])]
+        return super().get_ordering(request, queryset, view)
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid = super().remove_invalid_fields(queryset, fields, view, request)
+        return [
+            term
+            for term in valid
+            if term.lstrip("-") not in self.annotation_fields
+            or term.lstrip("-") in queryset.query.annotations
+        ]
+
+
+class GeoFilterSet(django_filters.FilterSet):
+    """
+    Bounding-box and radius filters for models with ``latitude``,
+    ``longitude`` and an indexed ``geohash`` column.
+    """
+
+    bbox = django_filters.CharFilter(method="filter_bbox", help_text="south,west,north,east")
+    near = django_filters.CharFilter(method="filter_near", help_text="lat,lon")
+    radius_km = django_filters.NumberFilter(
+        method="filter_radius_km", help_text=f"Radius for 'near' (default {DEFAULT_RADIUS_KM} km)"
+    )
+
+    def filter_bbox(self, queryset, name, value):
+        try:
+            south, west, north, east = geo.parse_bbox(value)
+        except ValueError as exc:
+            raise ValidationError({"bbox": [str(exc)]})
+        return geo.filter_bbox(queryset, south, west, north, east)
+
+    def filter_near(self, queryset, name, value):
+        try:
+            latitude, longitude = geo.parse_point(value)
+        except ValueError as exc:
+            raise ValidationError({"near": [str(exc)]})
+        radius = self.form.cleaned_data.get("radius_km") or DEFAULT_RADIUS_KM
+        if radius <= 0:
+            raise ValidationError({"radius_km": ["radius_km must be positive"]})
+        return geo.filter_radius(queryset, latitude, longitude, float(radius))
+
+    def filter_radius_km(self, queryset, name, value):
+        # Consumed by filter_near
+        return queryset
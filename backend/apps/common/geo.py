@@ -0,0 +1,176 @@
+"""
+Geospatial helpers: geohash encoding, bounding-box covers and haversine
+distance, so map queries run on an indexed geohash prefix without PostGIS.
+"""
+
+import math
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9  # ~5m cells
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.195
+
+# Upper bound on prefixes OR-ed together for one bounding box
+MAX_COVER_CELLS = 32
+MAX_RADIUS_KM = 500
+
+
+def encode_geohash(latitude, longitude, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Encode a coordinate pair as a geohash string.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_for(latitude, longitude) -> str:
+    """
+    Return the stored geohash for optional coordinates ("" when missing).
+    """
+    if latitude is None or longitude is None:
+        return ""
+    return encode_geohash(latitude, longitude)
+
+
+def cell_size(precision: int) -> tuple:
+    """
+    Return the (latitude, longitude) size in degrees of a geohash cell.
+    """
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+
+def bbox_cover(south: float, west: float, north: float, east: float, max_cells: int = MAX_COVER_CELLS) -> list:
+    """
+    Return the geohash prefixes covering a bounding box, using the finest
+    precision that needs at most ``max_cells`` prefixes.
+    """
+    best = [""]
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        lat_size, lon_size = cell_size(precision)
+        lat_cells = _cell_index(north, -90, lat_size) - _cell_index(south, -90, lat_size) + 1
+        lon_cells = _cell_index(east, -180, lon_size) - _cell_index(west, -180, lon_size) + 1
+        if lat_cells * lon_cells > max_cells:
+            break
+        best = [
+            encode_geohash(-90 + (i + 0.5) * lat_size, -180 + (j + 0.5) * lon_size, precision)
+            for i in range(_cell_index(south, -90, lat_size), _cell_index(north, -90, lat_size) + 1)
+            for j in range(_cell_index(west, -180, lon_size), _cell_index(east, -180, lon_size) + 1)
+        ]
+    return best
+
+
+def _cell_index(value: float, origin: float, size: float) -> int:
+    limit = round(abs(origin) * 2 / size) - 1
+    return min(max(int((value - origin) // size), 0), limit)
+
+
+def bbox_around(latitude: float, longitude: float, radius_km: float) -> tuple:
+    """
+    Return the (south, west, north, east) box enclosing a radius.
+    """
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    dlon = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 0.01))
+    return (
+        max(latitude - dlat, -90.0),
+        max(longitude - dlon, -180.0),
+        min(latitude + dlat, 90.0),
+        min(longitude + dlon, 180.0),
+    )
+
+
+def parse_bbox(value: str) -> tuple:
+    """
+    Parse ``"south,west,north,east"``; raises ValueError when malformed.
+    """
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must be south,west,north,east")
+    south, west, north, east = parts
+    if not (-90 <= south <= north <= 90 and -180 <= west <= east <= 180):
+        raise ValueError("bbox is out of range or inverted")
+    return south, west, north, east
+
+
+def parse_point(value: str) -> tuple:
+    """
+    Parse ``"lat,lon"``; raises ValueError when malformed.
+    """
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 2:
+        raise ValueError("near must be lat,lon")
+    latitude, longitude = parts
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("near is out of range")
+    return latitude, longitude
+
+
+def haversine_distance(latitude: float, longitude: float, lat_field: str = "latitude", lon_field: str = "longitude"):
+    """
+    Return an ORM expression for the great-circle distance in km from a point.
+    """
+    row_lat = Radians(Cast(F(lat_field), FloatField()))
+    row_lon = Radians(Cast(F(lon_field), FloatField()))
+    lat = Value(math.radians(latitude), output_field=FloatField())
+    lon = Value(math.radians(longitude), output_field=FloatField())
+    a = Power(Sin((row_lat - lat) / 2), 2) + Value(math.cos(math.radians(latitude))) * Cos(row_lat) * Power(
+        Sin((row_lon - lon) / 2), 2
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a), output_field=FloatField())
+
+
+def filter_bbox(queryset, south: float, west: float, north: float, east: float):
+    """
+    Restrict a queryset to rows inside a bounding box.
+
+    The geohash prefixes select candidate rows through the index; the
+    coordinate ranges then trim the cells' overhang.
+    """
+    prefixes = Q()
+    for prefix in bbox_cover(south, west, north, east):
+        if prefix:
+            prefixes |= Q(geohash__startswith=prefix)
+    return queryset.filter(
+        prefixes,
+        latitude__gte=south,
+        latitude__lte=north,
+        longitude__gte=west,
+        longitude__lte=east,
+    )
+
+
+def filter_radius(queryset, latitude: float, longitude: float, radius_km: float):
+    """
+    Restrict a queryset to rows within ``radius_km`` of a point, annotated
+    with ``distance`` (km).
+    """
+    radius_km = min(radius_km, MAX_RADIUS_KM)
+    queryset = filter_bbox(queryset, *bbox_around(latitude, longitude, radius_km))
+    return queryset.annotate(distance=haversine_distance(latitude, longitude)).filter(
+        distance__lte=radius_km
+    )
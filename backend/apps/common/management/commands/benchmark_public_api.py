@@ -0,0 +1,165 @@
+"""
+Benchmark the public catalogue endpoints, sync (WSGI) against async (ASGI).
+
+Without ``--url`` it starts gunicorn twice on local ports with the same
+number of workers: once with sync workers on ``config.wsgi``, once with
+uvicorn workers on ``config.asgi`` and ``ASYNC_PUBLIC_API=True``. Each is
+then loaded by the same keep-alive client for ``--duration`` seconds, with
+throttling lifted.
+"""
+
+import asyncio
+import collections
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = ["/api/v1/properties/", "/api/v1/projects/", "/api/v1/locations/", "/api/v1/agents/"]
+STARTUP_TIMEOUT = 30
+
+
+async def _read_response(reader) -> tuple:
+    """Read one HTTP/1.1 response; returns ``(status, keep_alive)``."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed")
+    status = int(status_line.split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+        return status, headers.get("connection", "").lower() != "close"
+    await reader.read()
+    return status, False
+
+
+async def _client(host, port, paths, deadline, latencies, errors):
+    reader = writer = None
+    index = 0
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n\r\n".encode("latin-1")
+            )
+            status, keep_alive = await _read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError) as exc:
+            errors.append(type(exc).__name__)
+            keep_alive = False
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _load(host, port, paths, concurrency, duration) -> dict:
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(_client(host, port, paths, deadline, latencies, errors) for _ in range(concurrency)))
+    latencies.sort()
+
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000 if latencies else 0
+
+    return {
+        "requests": len(latencies),
+        "errors": collections.Counter(errors),
+        "rps": len(latencies) / duration,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+    }
+
+
+def run_load(url: str, paths, concurrency: int, duration: float) -> dict:
+    """Load ``url`` with ``concurrency`` keep-alive clients; returns the stats."""
+    parsed = urllib.parse.urlsplit(url)
+    return asyncio.run(_load(parsed.hostname, parsed.port or 80, paths, concurrency, duration))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"Server exited with code {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"Server did not start on port {port}")
+
+
+SERVERS = {
+    "wsgi": (["config.wsgi:application"], {}),
+    "asgi": (["config.asgi:application", "-k", "uvicorn.workers.UvicornWorker"], {"ASYNC_PUBLIC_API": "True"}),
+}
+# The load comes from one client address, which both throttles count
+UNTHROTTLED = {"THROTTLE_ANON_RATE": "1000000/s", "THROTTLE_USER_RATE": "1000000/s"}
+
+
+class Command(BaseCommand):
+    help = "Compare throughput and latency of the public read endpoints under WSGI and ASGI"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", help="Benchmark an already running server instead (e.g. http://127.0.0.1:8000)")
+        parser.add_argument("--workers", type=int, default=2, help="Server worker processes (same for both)")
+        parser.add_argument("--concurrency", type=int, default=50, help="Concurrent keep-alive connections")
+        parser.add_argument("--duration", type=float, default=10, help="Seconds of load per server")
+        parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS, help="Paths requested in turn")
+
+    def handle(self, *args, **options):
+        load = (options["paths"], options["concurrency"])
+        if options["url"]:
+            self.report(options["url"], run_load(options["url"], *load, options["duration"]))
+            return
+
+        for name, (arguments, environment) in SERVERS.items():
+            port = _free_port()
+            command = [
+                sys.executable, "-m", "gunicorn", *arguments,
+                "--bind", f"127.0.0.1:{port}",
+                "--workers", str(options["workers"]),
+                "--log-level", "warning",
+            ]  # fmt: skip
+            environment = {**os.environ, **UNTHROTTLED, **environment}
+            process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=environment)
+            try:
+                _wait_for_port(port, process)
+                url = f"http://127.0.0.1:{port}"
+                # Warm caches and connections before measuring
+                run_load(url, *load, 1)
+                self.report(name, run_load(url, *load, options["duration"]))
+            finally:
+                process.terminate()
+                process.wait()
+
+    def report(self, name, stats):
+        self.stdout.write(
+            f"{name}: {stats['rps']:.0f} req/s over {stats['requests']} requests "
+            f"(p50 {stats['p50']:.1f} ms, p95 {stats['p95']:.1f} ms, p99 {stats['p99']:.1f} ms)"
+        )
+        for error, count in stats["errors"].most_common():
+            self.stdout.write(self.style.WARNING(f"  {count} x {error}"))
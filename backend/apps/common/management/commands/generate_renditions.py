@@ -0,0 +1,41 @@
+"""
+Generate missing image renditions for property and project images.
+"""
+
+from concurrent.futures import wait
+
+from django.core.management.base import BaseCommand
+
+from apps.common.renditions import needs_renditions, release_renditions, schedule_renditions
+from apps.projects.models import ProjectImage
+from apps.properties.models import PropertyImage
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnail/card/large renditions for uploaded images that lack them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate renditions that already exist",
+        )
+
+    def handle(self, *args, **options):
+        for model in (PropertyImage, ProjectImage):
+            queryset = model.objects.exclude(image="").exclude(image__isnull=True).only("id", "image", "renditions")
+            futures, count = [], 0
+            for image in queryset.iterator(chunk_size=500):
+                if options["force"] and image.renditions:
+                    model.objects.filter(pk=image.pk).update(renditions={})
+                    release_renditions(model, image.renditions)
+                elif not needs_renditions(image):
+                    continue
+                future = schedule_renditions(model, image.pk)
+                if future is not None:
+                    futures.append(future)
+                count += 1
+            wait(futures)
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {count} processed")
+
+        self.stdout.write(self.style.SUCCESS("Done! Renditions generated."))
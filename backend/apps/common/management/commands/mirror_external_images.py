@@ -0,0 +1,39 @@
+"""
+Mirror external property and project image URLs into media storage.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.common.mirroring import DEFAULT_TIMEOUT, MAX_IMAGE_BYTES, mirror_external_images
+from apps.projects.models import ProjectImage
+from apps.properties.models import PropertyImage
+
+
+class Command(BaseCommand):
+    help = "Download external image URLs (content-addressed, deduplicated) and generate their renditions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="Concurrent downloads")
+        parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-request timeout (seconds)")
+        parser.add_argument("--max-bytes", type=int, default=MAX_IMAGE_BYTES, help="Largest image to download")
+
+    def handle(self, *args, **options):
+        for model in (PropertyImage, ProjectImage):
+            report = mirror_external_images(
+                model,
+                workers=options["workers"],
+                timeout=options["timeout"],
+                max_bytes=options["max_bytes"],
+            )
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {report['urls']} URLs, {report['stored']} stored, "
+                f"{report['reused']} already stored, {report['images']} images updated"
+            )
+            for failure in report["failed"]:
+                self.stdout.write(self.style.WARNING(f"  {failure['url']}: {failure['error']}"))
+            for failure in report["rendition_failures"]:
+                self.stdout.write(
+                    self.style.WARNING(f"  renditions of image {failure['id']}: {failure['error']}")
+                )
+
+        self.stdout.write(self.style.SUCCESS("Done! External images mirrored."))
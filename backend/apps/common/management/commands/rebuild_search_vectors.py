@@ -0,0 +1,24 @@
+"""
+Rebuild full-text search vectors for properties and projects.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.common.search import full_text_search_enabled, refresh_search_vectors
+from apps.projects.models import Project
+from apps.properties.models import Property
+
+
+class Command(BaseCommand):
+    help = "Recompute the tsvector search column for properties and projects (PostgreSQL only)"
+
+    def handle(self, *args, **options):
+        if not full_text_search_enabled():
+            self.stdout.write(self.style.WARNING("Full-text search requires PostgreSQL; nothing to do."))
+            return
+
+        for model in (Property, Project):
+            updated = refresh_search_vectors(model.objects.all())
+            self.stdout.write(
+                self.style.SUCCESS(f"  {model._meta.verbose_name_plural}: {updated} rows updated")
+            )
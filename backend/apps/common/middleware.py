@@ -0,0 +1,81 @@
+"""
+Middleware shared by the sync (WSGI) and async (ASGI) deployments.
+"""
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .replicas import PIN_COOKIE, database_scope
+
+
+class StaticFilesMiddleware:
+    """
+    WhiteNoise, usable in an async middleware stack.
+
+    WhiteNoise is sync-only; left in the stack under ASGI it would run every
+    request through Django's single sync thread. Async requests outside the
+    static prefix skip it instead, so API requests stay on the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            self.whitenoise = WhiteNoiseMiddleware(async_to_sync(get_response))
+        else:
+            self.whitenoise = WhiteNoiseMiddleware(get_response)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.whitenoise(request)
+
+    async def __acall__(self, request):
+        if request.path_info.startswith(self.whitenoise.static_prefix):
+            return await sync_to_async(self.whitenoise)(request)
+        return await self.get_response(request)
+
+
+class ReplicaPinningMiddleware:
+    """
+    Open the request's database scope (see ``replicas``) and pin clients
+    whose request wrote to the primary for ``DATABASE_REPLICA_LAG`` seconds.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with database_scope() as scope:
+            response = self.get_response(request)
+        return self.pin(scope, response)
+
+    async def __acall__(self, request):
+        with database_scope() as scope:
+            response = await self.get_response(request)
+        return self.pin(scope, response)
+
+    def pin(self, scope, response):
+        if scope.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_LAG,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
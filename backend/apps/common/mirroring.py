@@ -0,0 +1,199 @@
+"""
+Mirroring of external image URLs into media storage.
+
+Images that only have an ``image_url`` (seeded and imported listings) are
+downloaded by a bounded thread pool and stored content-addressed as
+``mirror/<sha256[:2]>/<sha256>.<ext>``. Identical downloads therefore share
+one file, and one URL used by several rows is fetched once. The rows'
+``image`` field is then pointed at the stored file (``image_url`` is kept
+as the source) and renditions are scheduled as for uploads, then waited
+for so callers see them stored (or failed).
+
+Only public hosts are fetched unless ``IMAGE_MIRROR_ALLOW_PRIVATE_HOSTS``
+is set, so URLs supplied by agents cannot reach internal services.
+"""
+
+import hashlib
+import io
+import ipaddress
+import logging
+import socket
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from PIL import Image
+
+from .renditions import schedule_renditions
+
+logger = logging.getLogger(__name__)
+
+MIRROR_DIRECTORY = "mirror"
+DEFAULT_TIMEOUT = 10
+MAX_IMAGE_BYTES = 15 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+USER_AGENT = "ViventaImageMirror/1.0"
+EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif", "AVIF": "avif"}
+
+# Identical images fetched concurrently are stored once
+_store_lock = threading.Lock()
+
+
+class MirrorError(Exception):
+    """An external image could not be mirrored."""
+
+
+def _check_host(url: str) -> None:
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise MirrorError("Only http(s) URLs can be mirrored")
+    if settings.IMAGE_MIRROR_ALLOW_PRIVATE_HOSTS:
+        return
+    try:
+        addresses = socket.getaddrinfo(parsed.hostname, parsed.port or 0, proto=socket.IPPROTO_TCP)
+    except socket.gaierror as exc:
+        raise MirrorError(f"Cannot resolve {parsed.hostname}: {exc}")
+    for address in addresses:
+        ip = ipaddress.ip_address(address[4][0])
+        if not ip.is_global:
+            raise MirrorError(f"{parsed.hostname} resolves to a non-public address")
+
+
+class _CheckedRedirectHandler(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        _check_host(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+_opener = urllib.request.build_opener(_CheckedRedirectHandler)
+
+
+def fetch(url: str, timeout: float = DEFAULT_TIMEOUT, max_bytes: int = MAX_IMAGE_BYTES) -> bytes:
+    """Download an image, refusing non-images and bodies over ``max_bytes``."""
+    _check_host(url)
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Accept": "image/*"})
+    try:
+        with _opener.open(request, timeout=timeout) as response:
+            content_type = response.headers.get_content_type()
+            if not content_type.startswith("image/"):
+                raise MirrorError(f"Not an image ({content_type})")
+            length = response.headers.get("Content-Length")
+            if length and length.isdigit() and int(length) > max_bytes:
+                raise MirrorError(f"Larger than {max_bytes} bytes")
+            body = bytearray()
+            while chunk := response.read(READ_CHUNK_SIZE):
+                body += chunk
+                if len(body) > max_bytes:
+                    raise MirrorError(f"Larger than {max_bytes} bytes")
+    except urllib.error.HTTPError as exc:
+        raise MirrorError(f"HTTP {exc.code}")
+    except (urllib.error.URLError, OSError) as exc:
+        raise MirrorError(str(getattr(exc, "reason", exc)))
+    return bytes(body)
+
+
+def content_name(data: bytes) -> str:
+    """Return the content-addressed storage name for image bytes."""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image_format = image.format
+            image.verify()
+    except Exception as exc:
+        raise MirrorError(f"Unreadable image: {exc}")
+    digest = hashlib.sha256(data).hexdigest()
+    extension = EXTENSIONS.get(image_format, (image_format or "img").lower())
+    return f"{MIRROR_DIRECTORY}/{digest[:2]}/{digest}.{extension}"
+
+
+def mirror_url(url: str, timeout: float = DEFAULT_TIMEOUT, max_bytes: int = MAX_IMAGE_BYTES, storage=None) -> tuple:
+    """
+    Download ``url`` into storage; returns ``(name, reused)``.
+
+    ``reused`` is True when identical content was already stored.
+    """
+    storage = storage or default_storage
+    data = fetch(url, timeout=timeout, max_bytes=max_bytes)
+    name = content_name(data)
+    with _store_lock:
+        if storage.exists(name):
+            return name, True
+        return storage.save(name, ContentFile(data)), False
+
+
+def mirror_external_images(
+    model,
+    queryset=None,
+    workers: int = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_bytes: int = MAX_IMAGE_BYTES,
+) -> dict:
+    """
+    Mirror the external URLs of ``model`` rows that have no uploaded image.
+
+    ``model`` is an image model with ``image``, ``image_url`` and
+    ``renditions`` fields. Returns a report of what was stored and failed,
+    including rows whose renditions could not be generated.
+    """
+    queryset = model._default_manager.all() if queryset is None else queryset
+    pending = defaultdict(list)
+    rows = (
+        queryset.filter(Q(image="") | Q(image__isnull=True))
+        .exclude(image_url="")
+        .values_list("pk", "image_url")
+    )
+    for pk, url in rows.iterator():
+        pending[url].append(pk)
+
+    report = {
+        "urls": len(pending),
+        "images": 0,
+        "stored": 0,
+        "reused": 0,
+        "failed": [],
+        "rendition_failures": [],
+    }
+    mirrored = []
+    with ThreadPoolExecutor(max_workers=workers or settings.IMAGE_MIRROR_WORKERS) as pool:
+        futures = {pool.submit(mirror_url, url, timeout, max_bytes): url for url in pending}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                name, reused = future.result()
+            except MirrorError as exc:
+                report["failed"].append({"url": url, "error": str(exc)})
+                continue
+            report["reused" if reused else "stored"] += 1
+            # Rows edited meanwhile keep their new image
+            updated = (
+                model._default_manager.filter(pk__in=pending[url], image_url=url)
+                .filter(Q(image="") | Q(image__isnull=True))
+                .update(image=name)
+            )
+            report["images"] += updated
+            mirrored += pending[url]
+
+    # None when renditions were generated inline
+    renditions = {schedule_renditions(model, pk): pk for pk in mirrored}
+    renditions.pop(None, None)
+    for future in as_completed(renditions):
+        pk = renditions[future]
+        try:
+            rendered = future.result()
+        except Exception as exc:
+            logger.error("Could not render %s %s", model._meta.label, pk, exc_info=exc)
+            report["rendition_failures"].append({"id": str(pk), "error": str(exc) or type(exc).__name__})
+        else:
+            if not rendered:
+                report["rendition_failures"].append({"id": str(pk), "error": "Renditions not generated"})
+    if report["failed"]:
+        logger.warning("Could not mirror %d of %d %s URLs", len(report["failed"]), len(pending), model._meta.label)
+    report["failed"].sort(key=lambda failure: failure["url"])
+    report["rendition_failures"].sort(key=lambda failure: failure["id"])
+    return report
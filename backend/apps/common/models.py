@@ -98,12 +98,13 @@ class Location(BaseModel):
         return self.name
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            from apps.common.utils import generate_unique_slug
-            self.slug = generate_unique_slug(Location, self.name)
         if not self.name_es:
             self.name_es = self.name
-        super().save(*args, **kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            from apps.common.utils import save_with_unique_slug
+            save_with_unique_slug(self, self.name, super().save, *args, **kwargs)
 
     @property
     def display_name(self):
@@ -2,20 +2,279 @@
 Custom pagination classes.
 """
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import datetime
+import json
+import uuid
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _encode_cursor_value(value):
+    # Full-precision encoding: keyset equality breaks if datetimes lose microseconds
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination following the queryset's current ordering.
+
+    The cursor is an opaque token holding the ordering values of the row at
+    the page boundary, so every page is an index range scan with no COUNT(*)
+    and no OFFSET. ``id`` is appended as a tiebreaker to keep the ordering
+    total; nullable ordering fields sort last in both directions.
+
+    Ordering terms must be readable off the page rows: order by an
+    annotation rather than across a to-many relation.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    tiebreaker = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.model = queryset.model
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["r"])
+        if cursor:
+            queryset = queryset.filter(self.build_keyset_filter(cursor["v"], reverse))
+        queryset = queryset.order_by(*self.build_order_by(reverse))
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            if size > 0:
+                return min(size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, queryset) -> list:
+        """
+        Return the ordering terms (``"-price"``, ``"id"``...) to key on.
+        """
+        query = queryset.query
+        terms = list(query.order_by) or list(query.get_meta().ordering)
+        terms = [term for term in terms if isinstance(term, str) and term != "?"]
+        names = {term.lstrip("-") for term in terms}
+        for name in names:
+            if self.is_multivalued(queryset.model, name):
+                raise ImproperlyConfigured(
+                    f"Keyset pagination cannot order by {name!r}, which crosses a "
+                    "to-many relation; annotate the value and order by the annotation."
+                )
+        if not names & {self.tiebreaker, "pk"}:
+            direction = "-" if terms and terms[0].startswith("-") else ""
+            terms.append(f"{direction}{self.tiebreaker}")
+        return terms
+
+    def build_order_by(self, reverse: bool) -> list:
+        # Walking backwards flips every direction, moving NULLs to the front
+        nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+        order_by = []
+        for term in self.ordering:
+            name, descending = term.lstrip("-"), term.startswith("-")
+            if descending != reverse:
+                order_by.append(F(name).desc(**nulls))
+            else:
+                order_by.append(F(name).asc(**nulls))
+        return order_by
+
+    def build_keyset_filter(self, values: list, reverse: bool) -> Q:
+        """
+        Build ``(a > x) OR (a = x AND b > y) OR ...`` for the boundary row,
+        honouring each term's direction and the nulls-last placement.
+        """
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for term, value in zip(self.ordering, values):
+            name, descending = term.lstrip("-"), term.startswith("-")
+            nullable = self.is_nullable(name)
+            greater = f"{name}__lt" if descending else f"{name}__gt"
+            lesser = f"{name}__gt" if descending else f"{name}__lt"
+
+            if not reverse:
+                # Rows after the boundary: further along, or in the NULL tail
+                if value is not None:
+                    step = Q(**{greater: value})
+                    if nullable:
+                        step |= Q(**{f"{name}__isnull": True})
+                    condition |= prefix & step
+            elif value is None:
+                condition |= prefix & Q(**{f"{name}__isnull": False})
+            else:
+                condition |= prefix & Q(**{lesser: value})
+
+            if value is None:
+                prefix &= Q(**{f"{name}__isnull": True})
+            else:
+                prefix &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def is_multivalued(model, name: str) -> bool:
+        for part in name.split("__"):
+            try:
+                field = model._meta.get_field(part)
+            except (FieldDoesNotExist, AttributeError):
+                return False
+            if field.many_to_many or field.one_to_many:
+                return True
+            model = field.related_model
+        return False
+
+    def is_nullable(self, name: str) -> bool:
+        model = self.model
+        for part in name.split("__"):
+            try:
+                field = model._meta.get_field(part)
+            except (FieldDoesNotExist, AttributeError):
+                return False
+            if field.null:
+                return True
+            model = field.related_model
+        return False
+
+    def row_values(self, row) -> list:
+        values = []
+        for term in self.ordering:
+            value = row
+            for part in term.lstrip("-").split("__"):
+                value = getattr(value, part, None)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, row, reverse: bool) -> str:
+        payload = {"o": self.ordering, "v": self.row_values(row), "r": reverse}
+        raw = json.dumps(payload, default=_encode_cursor_value, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            cursor = json.loads(raw)
+            valid = (
+                isinstance(cursor, dict)
+                and cursor.get("o") == self.ordering
+                and isinstance(cursor.get("v"), list)
+                and len(cursor["v"]) == len(self.ordering)
+            )
+        except (binascii.Error, ValueError, TypeError):
+            valid = False
+        if not valid:
+            raise NotFound(self.invalid_cursor_message)
+        cursor["r"] = bool(cursor.get("r"))
+        return cursor
+
+    def get_next_cursor(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_cursor(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "success": True,
+                "data": data,
+                "meta": {
+                    "page_size": self.page_size,
+                    "next_cursor": self.get_next_cursor(),
+                    "previous_cursor": self.get_previous_cursor(),
+                    "has_next": self.has_next,
+                    "has_previous": self.has_previous,
+                },
+            }
+        )
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor returned as meta.next_cursor / meta.previous_cursor.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
 
 
 class StandardResultsPagination(PageNumberPagination):
     """
     Standard pagination with configurable page size.
+
+    Clients can opt into keyset pagination with ``?pagination=cursor`` (or
+    by sending a ``cursor``), which skips the COUNT(*) and OFFSET scan.
     """
 
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+    mode_query_param = "pagination"
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_pagination_class()
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def use_keyset(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_pagination_class.cursor_query_param in request.query_params
+        )
 
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
         return Response(
             {
                 "success": True,
@@ -30,3 +289,15 @@ class StandardResultsPagination(PageNumberPagination):
                 },
             }
         )
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to 'cursor' for keyset pagination (no total count).",
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+            self.keyset_pagination_class().get_schema_operation_parameters(view)[0],
+        ]
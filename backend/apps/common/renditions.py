@@ -0,0 +1,339 @@
+"""
+Pre-generated image renditions.
+
+After an uploaded image is committed, its renditions (thumbnail, card,
+large) are encoded as JPEG plus WebP and AVIF when Pillow supports them.
+Decoding and encoding run in a process pool, fed by a small dispatcher
+thread pool that reads the source, saves the results to storage and
+records them on the model's ``renditions`` JSON field::
+
+    {
+        "source": "properties/2026/10/house.jpg",
+        "width": 3000,
+        "height": 2000,
+        "color": "#4a7fb0",
+        "placeholder": "data:image/webp;base64,...",
+        "sizes": {
+            "thumbnail": {"width": 400, "height": 300, "files": {"jpeg": "...", "webp": "..."}},
+            ...
+        },
+    }
+
+The intrinsic size, dominant colour and a tiny base64 placeholder (LQIP)
+are also copied to columns on the image row (``image_metadata``) so pages
+can reserve layout space and paint something before thumbnails load.
+
+Request paths only read that map (``rendition_url``, ``srcset``) and never
+open images. Until the renditions exist, the original image is served.
+
+The pools live in the web process and jobs are not queued anywhere else:
+work still pending when a worker restarts (e.g. on deploy) is dropped.
+Such images simply have no current renditions, so running the
+``generate_renditions`` command after deploys (or periodically) picks
+them up again.
+"""
+
+import base64
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection
+from PIL import ExifTags, Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# name: ((width, height), mode); "fill" crops to the exact size, "fit"
+# scales down to fit inside it
+RENDITIONS = {
+    "thumbnail": ((400, 300), "fill"),
+    "card": ((800, 600), "fill"),
+    "large": ((1200, 900), "fit"),
+}
+# Preferred first: browsers pick the first <source> they support
+FORMATS = ("avif", "webp", "jpeg")
+PIL_FORMATS = {"avif": "AVIF", "webp": "WEBP", "jpeg": "JPEG"}
+EXTENSIONS = {"avif": "avif", "webp": "webp", "jpeg": "jpg"}
+SAVE_OPTIONS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80, "method": 4},
+    "jpeg": {"quality": 85, "optimize": True, "progressive": True},
+}
+FALLBACK_FORMAT = "jpeg"
+# Longest side of the inline placeholder; it is blurred by the browser
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_OPTIONS = {"webp": {"quality": 40}, "jpeg": {"quality": 40}}
+# EXIF orientations that swap width and height
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+_lock = threading.Lock()
+_process_pool = None
+_dispatcher = None
+
+
+def available_formats() -> tuple:
+    """Return the rendition formats this Pillow build can encode."""
+    try:
+        # Registers AVIF on Pillow builds without native support
+        import pillow_avif  # noqa: F401
+    except ImportError:
+        pass
+    Image.init()
+    return tuple(fmt for fmt in FORMATS if PIL_FORMATS[fmt] in Image.SAVE)
+
+
+def _flatten(image):
+    if image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        flat = Image.new("RGB", rgba.size, (255, 255, 255))
+        flat.paste(rgba, mask=rgba.getchannel("A"))
+        return flat
+    return image.convert("RGB")
+
+
+def render(data: bytes, formats=(FALLBACK_FORMAT,)) -> dict:
+    """
+    Decode an image and encode all renditions in ``formats``.
+
+    Runs in the worker processes, so it only takes and returns plain data.
+    """
+    largest = max(max(size) for size, _mode in RENDITIONS.values())
+    with Image.open(io.BytesIO(data)) as source:
+        width, height = source.size
+        if source.getexif().get(ExifTags.Base.Orientation) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        # Let the JPEG decoder downscale while decoding
+        source.draft("RGB", (largest, largest))
+        image = _flatten(ImageOps.exif_transpose(source))
+
+    sizes = {}
+    for name, (size, mode) in RENDITIONS.items():
+        if mode == "fill":
+            resized = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail(size, Image.Resampling.LANCZOS)
+        files = {}
+        for fmt in formats:
+            buffer = io.BytesIO()
+            resized.save(buffer, PIL_FORMATS[fmt], **SAVE_OPTIONS[fmt])
+            files[fmt] = buffer.getvalue()
+        sizes[name] = {"width": resized.width, "height": resized.height, "files": files}
+    return {
+        "width": width,
+        "height": height,
+        "color": dominant_color(image),
+        "placeholder": placeholder(image, "webp" if "webp" in formats else FALLBACK_FORMAT),
+        "sizes": sizes,
+    }
+
+
+def dominant_color(image) -> str:
+    """Return the most common colour of an RGB image as ``#rrggbb``."""
+    small = image.copy()
+    small.thumbnail((64, 64))
+    palette = small.quantize(colors=5)
+    _count, index = max(palette.getcolors())
+    red, green, blue = palette.getpalette()[index * 3 : index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def placeholder(image, fmt: str = FALLBACK_FORMAT) -> str:
+    """Return a tiny ``data:`` URI preview of an RGB image."""
+    small = image.copy()
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    buffer = io.BytesIO()
+    small.save(buffer, PIL_FORMATS[fmt], **PLACEHOLDER_OPTIONS[fmt])
+    return f"data:image/{fmt};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def _rendition_name(source_name: str, name: str, fmt: str) -> str:
+    directory, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, "renditions", f"{stem}-{name}.{EXTENSIONS[fmt]}")
+
+
+def store_renditions(result: dict, source_name: str, storage=None) -> dict:
+    """Save rendered files next to the source; returns the ``renditions`` map."""
+    storage = storage or default_storage
+    sizes = {}
+    for name, rendition in result["sizes"].items():
+        files = {
+            fmt: storage.save(_rendition_name(source_name, name, fmt), ContentFile(data))
+            for fmt, data in rendition["files"].items()
+        }
+        sizes[name] = {"width": rendition["width"], "height": rendition["height"], "files": files}
+    return {
+        "source": source_name,
+        "width": result["width"],
+        "height": result["height"],
+        "color": result["color"],
+        "placeholder": result["placeholder"],
+        "sizes": sizes,
+    }
+
+
+def delete_renditions(renditions: dict, storage=None) -> None:
+    """Remove the files of a ``renditions`` map from storage."""
+    storage = storage or default_storage
+    for rendition in (renditions or {}).get("sizes", {}).values():
+        for name in rendition["files"].values():
+            try:
+                storage.delete(name)
+            except OSError:
+                logger.warning("Could not delete rendition %s", name)
+
+
+def release_renditions(model, renditions: dict) -> None:
+    """Delete rendition files unless another row of ``model`` still uses them."""
+    if renditions and not model._default_manager.filter(renditions=renditions).exists():
+        delete_renditions(renditions)
+
+
+def current_renditions(instance) -> dict:
+    """Return the instance's renditions if they match its current image."""
+    renditions = instance.renditions or {}
+    if instance.image and renditions.get("source") == instance.image.name:
+        return renditions
+    return {}
+
+
+def image_metadata(renditions: dict) -> dict:
+    """Return the image row columns filled from a ``renditions`` map."""
+    renditions = renditions or {}
+    return {
+        "width": renditions.get("width"),
+        "height": renditions.get("height"),
+        "dominant_color": renditions.get("color", ""),
+        "placeholder": renditions.get("placeholder", ""),
+    }
+
+
+def needs_renditions(instance) -> bool:
+    return bool(instance.image) and not current_renditions(instance)
+
+
+def rendition_url(renditions: dict, name: str, fmt: str = FALLBACK_FORMAT, storage=None):
+    """Return the URL of one rendition, or None if it was not generated."""
+    rendition = (renditions or {}).get("sizes", {}).get(name)
+    if not rendition or fmt not in rendition["files"]:
+        return None
+    return (storage or default_storage).url(rendition["files"][fmt])
+
+
+def srcset(renditions: dict, build_url=None, storage=None) -> dict:
+    """
+    Return ``{format: "url 400w, url 800w, ..."}`` for the renditions.
+
+    ``build_url`` optionally turns storage URLs into absolute ones.
+    """
+    storage = storage or default_storage
+    sizes = sorted((renditions or {}).get("sizes", {}).values(), key=lambda rendition: rendition["width"])
+    entries = {}
+    for rendition in sizes:
+        for fmt, name in rendition["files"].items():
+            url = storage.url(name)
+            if build_url is not None:
+                url = build_url(url)
+            entries.setdefault(fmt, []).append(f"{url} {rendition['width']}w")
+    return {fmt: ", ".join(entries[fmt]) for fmt in FORMATS if fmt in entries}
+
+
+def _get_process_pool():
+    global _process_pool
+    with _lock:
+        if _process_pool is None:
+            # Spawned workers do not inherit the server's threads or DB connections
+            _process_pool = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_RENDITION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def _get_dispatcher():
+    global _dispatcher
+    with _lock:
+        if _dispatcher is None:
+            _dispatcher = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_RENDITION_WORKERS, thread_name_prefix="renditions"
+            )
+        return _dispatcher
+
+
+def _render_in_pool(data: bytes, formats) -> dict:
+    global _process_pool
+    try:
+        return _get_process_pool().submit(render, data, formats).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory): start a fresh pool next time
+        with _lock:
+            _process_pool = None
+        raise
+
+
+def process_renditions(model, pk, renderer=render) -> bool:
+    """
+    Generate and record the renditions of one image; returns whether it did.
+    """
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None or not needs_renditions(instance):
+        return False
+    source_name = instance.image.name
+    # Rows sharing a file (e.g. mirrored duplicates) share its renditions
+    renditions = (
+        model._default_manager.filter(renditions__source=source_name)
+        .exclude(pk=pk)
+        .values_list("renditions", flat=True)
+        .first()
+    )
+    if renditions is None:
+        try:
+            with instance.image.open("rb") as source:
+                data = source.read()
+            result = renderer(data, available_formats())
+        except Exception:
+            logger.exception("Could not render %s %s", model._meta.label, pk)
+            return False
+        renditions = store_renditions(result, source_name)
+
+    # Only if the image was not replaced meanwhile; no signals are sent
+    metadata = image_metadata(renditions)
+    if not model._default_manager.filter(pk=pk, image=source_name).update(renditions=renditions, **metadata):
+        release_renditions(model, renditions)
+        return False
+    if instance.renditions and instance.renditions.get("source") != source_name:
+        release_renditions(model, instance.renditions)
+    instance.renditions = renditions
+    for field, value in metadata.items():
+        setattr(instance, field, value)
+    instance.renditions_ready()
+    return True
+
+
+def _process_in_background(model, pk) -> bool:
+    close_old_connections()
+    try:
+        return process_renditions(model, pk, renderer=_render_in_pool)
+    finally:
+        connection.close()
+
+
+def schedule_renditions(model, pk):
+    """
+    Generate renditions for an image off the request path.
+
+    Returns a future, or None when ``IMAGE_RENDITIONS_ASYNC`` is off and the
+    work was done inline (tests, one-off scripts).
+    """
+    if not settings.IMAGE_RENDITIONS_ASYNC:
+        process_renditions(model, pk)
+        return None
+    return _get_dispatcher().submit(_process_in_background, model, pk)
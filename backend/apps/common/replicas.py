@@ -0,0 +1,151 @@
+"""
+Read-replica routing for anonymous catalogue reads.
+
+Replicas are configured with ``DATABASE_REPLICA_URLS`` (aliases
+``replica_1``, ``replica_2``...). Reads go to one only inside a replica
+scope, which ``ReadReplicaMixin`` opens for anonymous safe requests to the
+public views (and ``AsyncReadView`` for its validator queries), unless:
+
+- the client wrote within ``DATABASE_REPLICA_LAG`` seconds (it carries the
+  pin cookie set by ``ReplicaPinningMiddleware``), so it reads its writes;
+- a cache tag the view depends on was invalidated within that window, so
+  lagging data is not cached under the new generation;
+- the request itself already wrote.
+
+Writes always go to the primary.
+"""
+
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+from .cache import aget_generations, get_generations
+
+PIN_COOKIE = "db_primary"
+
+
+class DatabaseScope:
+    """Routing state of one request (or ``use_read_replica`` block)."""
+
+    __slots__ = ("replica", "wrote")
+
+    def __init__(self, replica=None):
+        self.replica = replica
+        self.wrote = False
+
+
+_scope = contextvars.ContextVar("database_scope", default=None)
+
+
+def choose_replica():
+    """Return a random configured replica alias, or None."""
+    replicas = settings.DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else None
+
+
+@contextmanager
+def database_scope(replica=None):
+    """Open a routing scope; reads in it go to ``replica`` until a write."""
+    scope = DatabaseScope(replica)
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+@contextmanager
+def use_read_replica(alias=None):
+    """
+    Send reads in the block to ``alias`` (default: a random replica).
+
+    Also for reporting code outside requests; without replicas it is a
+    no-op.
+    """
+    with database_scope(alias or choose_replica()) as scope:
+        yield scope.replica
+
+
+def _changed_within_lag(generations: dict) -> bool:
+    # Generations are millisecond timestamps of the last invalidation
+    cutoff = (time.time() - settings.DATABASE_REPLICA_LAG) * 1000
+    return bool(generations) and max(generations.values()) > cutoff
+
+
+def recently_changed(*tags) -> bool:
+    """Whether any tag was invalidated within ``DATABASE_REPLICA_LAG``."""
+    return bool(tags) and _changed_within_lag(get_generations(*tags))
+
+
+async def arecently_changed(*tags) -> bool:
+    """Async ``recently_changed``."""
+    return bool(tags) and _changed_within_lag(await aget_generations(*tags))
+
+
+def can_read_from_replica(request, tags=()) -> bool:
+    return bool(
+        settings.DATABASE_REPLICAS
+        and request.method in SAFE_METHODS
+        and not request.user.is_authenticated
+        and PIN_COOKIE not in request.COOKIES
+        and not recently_changed(*tags)
+    )
+
+
+def route_reads_to_replica():
+    """Send the current request's remaining reads to a replica."""
+    scope = _scope.get()
+    if scope is not None and not scope.wrote:
+        scope.replica = choose_replica()
+    return scope.replica if scope is not None else None
+
+
+class ReadReplicaRouter:
+    """Database router for replica scopes; see the module docstring."""
+
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is not None and scope.replica and not scope.wrote:
+            return scope.replica
+        return None
+
+    def db_for_write(self, model, **hints):
+        scope = _scope.get()
+        if scope is not None:
+            scope.wrote = True
+        # Explicit, or instances read from a replica would be saved there
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas get the schema through replication
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReadReplicaMixin:
+    """
+    Serve anonymous safe requests to a DRF view from a read replica.
+
+    ``read_replica_tags`` are the cache tags of the data the view shows;
+    reads stay on the primary while one was invalidated recently.
+    """
+
+    read_replica_tags = ()
+
+    def initial(self, request, *args, **kwargs):
+        # After authentication, which reads and may write users
+        super().initial(request, *args, **kwargs)
+        if can_read_from_replica(request, self.read_replica_tags):
+            route_reads_to_replica()
@@ -0,0 +1,148 @@
+"""
+Bilingual full-text search helpers.
+
+On PostgreSQL each searchable model keeps a weighted ``tsvector`` column
+(English, Spanish and language-neutral parts) that is matched with
+``websearch`` queries, ranked and highlighted. Other backends (SQLite in
+tests) fall back to ``icontains`` matching over the same fields.
+"""
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.html import escape
+
+SEARCH_RANK = "search_rank"
+
+# Headlines are built from agent-entered text, so the database marks matches
+# with private-use sentinels and ``render_headline`` escapes the rest
+HEADLINE_START = "\ue000"
+HEADLINE_STOP = "\ue001"
+
+HEADLINE_OPTIONS = {
+    "start_sel": HEADLINE_START,
+    "stop_sel": HEADLINE_STOP,
+    "max_words": 35,
+    "min_words": 15,
+    "max_fragments": 2,
+}
+
+
+def full_text_search_enabled(using: str = "default") -> bool:
+    """
+    Return True if the database supports tsvector search.
+    """
+    return connections[using].vendor == "postgresql"
+
+
+def build_search_vector(search_fields: dict):
+    """
+    Build a weighted SearchVector expression.
+
+    ``search_fields`` maps a text search config to ``(field, weight)`` pairs,
+    e.g. ``{"english": [("title", "A"), ("description", "C")]}``.
+    """
+    vector = None
+    for config, fields in search_fields.items():
+        for field, weight in fields:
+            part = SearchVector(field, weight=weight, config=config)
+            vector = part if vector is None else vector + part
+    return vector
+
+
+def build_search_query(value: str, configs):
+    """
+    Build a websearch query matching the value in any of the configs.
+    """
+    query = None
+    for config in configs:
+        part = SearchQuery(value, config=config, search_type="websearch")
+        query = part if query is None else query | part
+    return query
+
+
+def render_headline(headline):
+    """
+    Return a database headline as HTML: escaped, with matches in ``<mark>``.
+    """
+    if headline is None:
+        return None
+    return (
+        escape(headline)
+        .replace(HEADLINE_START, "<mark>")
+        .replace(HEADLINE_STOP, "</mark>")
+    )
+
+
+def search_field_names(search_fields: dict) -> list:
+    """
+    Return the distinct model fields covered by a search definition.
+    """
+    names = []
+    for fields in search_fields.values():
+        for field, _weight in fields:
+            if field not in names:
+                names.append(field)
+    return names
+
+
+def search_queryset(queryset, value: str, search_fields: dict, headline_fields=None):
+    """
+    Filter a queryset by a free-text search value.
+
+    On PostgreSQL results are annotated with ``search_rank`` and, for each
+    ``headline_fields`` entry (``{annotation: (field, config)}``), a
+    highlighted snippet. Elsewhere an ``icontains`` OR is applied.
+    """
+    value = (value or "").strip()
+    if not value:
+        return queryset
+
+    if not full_text_search_enabled(queryset.db):
+        condition = Q()
+        for field in search_field_names(search_fields):
+            condition |= Q(**{f"{field}__icontains": value})
+        return queryset.filter(condition)
+
+    query = build_search_query(value, search_fields.keys())
+    queryset = queryset.filter(search_vector=query).annotate(
+        **{SEARCH_RANK: SearchRank(F("search_vector"), query)}
+    )
+    for annotation, (field, config) in (headline_fields or {}).items():
+        queryset = queryset.annotate(
+            **{annotation: SearchHeadline(field, query, config=config, **HEADLINE_OPTIONS)}
+        )
+    return queryset
+
+
+def update_search_vector(instance, using=None, update_fields=None) -> None:
+    """
+    Recompute the stored search vector for a saved model instance.
+
+    Skipped when ``update_fields`` does not touch any searchable field.
+    """
+    model = type(instance)
+    using = using or instance._state.db or "default"
+    if not full_text_search_enabled(using):
+        return
+    if update_fields is not None and not set(update_fields) & set(
+        search_field_names(model.SEARCH_FIELDS)
+    ):
+        return
+    model._default_manager.using(using).filter(pk=instance.pk).update(
+        search_vector=build_search_vector(model.SEARCH_FIELDS)
+    )
+
+
+def refresh_search_vectors(queryset) -> int:
+    """
+    Recompute search vectors for every row of a queryset.
+    """
+    if not full_text_search_enabled(queryset.db):
+        return 0
+    return queryset.update(search_vector=build_search_vector(queryset.model.SEARCH_FIELDS))
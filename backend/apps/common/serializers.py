@@ -5,6 +5,43 @@ Serializers for the common app.
 from rest_framework import serializers
 
 from .models import Location
+from .search import render_headline
+
+
+class SearchHighlightField(serializers.Field):
+    """
+    Read-only field exposing full-text search snippets annotated by
+    ``apps.common.search.search_queryset``, as escaped HTML with matches in
+    ``<mark>``.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        headline = getattr(obj, "search_headline", None)
+        headline_es = getattr(obj, "search_headline_es", None)
+        if headline is None and headline_es is None:
+            return None
+        return {"en": render_headline(headline), "es": render_headline(headline_es)}
+
+
+class DistanceField(serializers.FloatField):
+    """
+    Read-only distance in km annotated by ``apps.common.geo.filter_radius``
+    (null when no ``near`` filter was given).
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        distance = getattr(obj, "distance", None)
+        return None if distance is None else round(distance, 3)
 
 
 class LocationSerializer(serializers.ModelSerializer):
@@ -34,7 +71,10 @@ class LocationSerializer(serializers.ModelSerializer):
 
     def get_property_count(self, obj):
         """Get count of active properties in this location."""
-        return obj.properties.filter(status="active").count()
+        # Maintained in the properties app's ListingCount table
+        return next(
+            (row.count for row in obj.listing_counts.all() if row.listing_type == ""), 0
+        )
 
 
 class LocationDetailSerializer(LocationSerializer):
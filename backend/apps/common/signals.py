@@ -0,0 +1,16 @@
+"""
+Signal handlers for the common app.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate
+from .models import Location
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_caches(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate("locations")
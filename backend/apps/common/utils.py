@@ -2,27 +2,105 @@
 Common utility functions.
 """
 
+import functools
 import re
 from decimal import Decimal
 from typing import Any
 
 from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from slugify import slugify
 
+from .cache import get_generations, make_cache_key
+
+
+# Saves retried when a concurrent writer takes the allocated slug first
+SLUG_SAVE_ATTEMPTS = 3
+
+
+def _slug_condition(base: str, slug_field: str) -> Q:
+    # The prefix lookup can use the slug index; the regex drops longer slugs
+    # that merely share the prefix ("apartment-in-caracas-centro")
+    return Q(**{slug_field: base}) | Q(
+        **{
+            f"{slug_field}__startswith": f"{base}-",
+            f"{slug_field}__regex": rf"^{re.escape(base)}-[0-9]+$",
+        }
+    )
+
 
 def generate_unique_slug(model_class, value: str, slug_field: str = "slug") -> str:
     """
     Generate a unique slug for a model instance.
+
+    Uses a single query; the slug may still be taken by a concurrent
+    insert, see ``save_with_unique_slug``.
     """
-    base_slug = slugify(value)
-    slug = base_slug
-    counter = 1
+    return allocate_slugs(model_class, [value], slug_field)[0]
 
-    while model_class.objects.filter(**{slug_field: slug}).exists():
-        slug = f"{base_slug}-{counter}"
-        counter += 1
 
-    return slug
+def allocate_slugs(model_class, values, slug_field: str = "slug") -> list:
+    """
+    Generate unique slugs for several new instances at once.
+
+    Existing slugs sharing each base are fetched in one query per batch of
+    bases; new slugs continue after the highest numeric suffix in use.
+    """
+    bases = [slugify(value) for value in values]
+    distinct = sorted(set(bases))
+    next_suffix = {}
+    for start in range(0, len(distinct), 100):
+        chunk = distinct[start : start + 100]
+        condition = Q()
+        for base in chunk:
+            condition |= _slug_condition(base, slug_field)
+        for slug in model_class._default_manager.filter(condition).values_list(slug_field, flat=True):
+            head, _, tail = slug.rpartition("-")
+            candidates = [(slug, 1)]
+            if tail.isdigit():
+                candidates.append((head, int(tail) + 1))
+            for base, suffix in candidates:
+                if base in next_suffix or base in chunk:
+                    next_suffix[base] = max(next_suffix.get(base, 0), suffix)
+
+    slugs, used = [], set()
+    for base in bases:
+        suffix = next_suffix.get(base, 0)
+        slug = f"{base}-{suffix}" if suffix else base
+        # "foo-1" may also be the base of another title in the batch
+        while slug in used:
+            suffix += 1
+            slug = f"{base}-{suffix}"
+        used.add(slug)
+        slugs.append(slug)
+        next_suffix[base] = suffix + 1
+    return slugs
+
+
+def save_with_unique_slug(instance, value: str, save, *args, slug_field: str = "slug", **kwargs):
+    """
+    Allocate a slug from ``value`` and call ``save(*args, **kwargs)``.
+
+    If a concurrent insert takes the slug first, the unique constraint
+    fails; the save is rolled back to a savepoint and retried with a newly
+    allocated slug.
+    """
+    model_class = type(instance)
+    for attempt in range(SLUG_SAVE_ATTEMPTS):
+        slug = generate_unique_slug(model_class, value, slug_field)
+        setattr(instance, slug_field, slug)
+        try:
+            with transaction.atomic(using=kwargs.get("using")):
+                return save(*args, **kwargs)
+        except IntegrityError:
+            taken = (
+                model_class._default_manager.filter(**{slug_field: slug})
+                .exclude(pk=instance.pk)
+                .exists()
+            )
+            if not taken or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                raise
 
 
 def format_price_usd(amount: Decimal) -> str:
@@ -32,14 +110,18 @@ def format_price_usd(amount: Decimal) -> str:
     return f"${amount:,.2f}"
 
 
-def cache_result(key: str, timeout: int = 300):
+def cache_result(key: str, timeout: int = 300, tags=()):
     """
     Decorator to cache function results.
+
+    Keys are stable across processes; results are invalidated when any of
+    ``tags`` is bumped (see ``apps.common.cache.invalidate``).
     """
 
     def decorator(func):
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            cache_key = f"{key}:{hash(str(args) + str(kwargs))}"
+            cache_key = make_cache_key(key, args, get_generations(*tags), params=kwargs)
             result = cache.get(cache_key)
             if result is None:
                 result = func(*args, **kwargs)
@@ -51,13 +133,6 @@ def cache_result(key: str, timeout: int = 300):
     return decorator
 
 
-def invalidate_cache_pattern(pattern: str) -> None:
-    """
-    Invalidate all cache keys matching a pattern.
-    """
-    cache.delete_pattern(f"{pattern}*")
-
-
 def clean_phone_number(phone: str) -> str:
     """
     Clean and normalize a phone number.
@@ -2,48 +2,75 @@
 Views for the common app.
 """
 
+from django.db.models import Max
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from .async_views import AsyncReadView, amake_validators
+from .cache import cached_response, get_or_refresh, request_cache_key
+from .conditional import conditional, make_validators
 from .models import Location
+from .replicas import ReadReplicaMixin
 from .serializers import LocationSerializer, LocationDetailSerializer
 
 
-class LocationViewSet(viewsets.ReadOnlyModelViewSet):
+class LocationViewSet(ReadReplicaMixin, viewsets.ReadOnlyModelViewSet):
     """
     Public viewset for browsing locations.
     """
 
+    read_replica_tags = ("locations", "properties")
     serializer_class = LocationSerializer
     lookup_field = "slug"
 
     def get_queryset(self):
-        return Location.objects.filter(is_active=True).order_by("display_order", "name")
+        return (
+            Location.objects.filter(is_active=True)
+            .order_by("display_order", "name")
+            .prefetch_related("listing_counts")
+        )
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return LocationDetailSerializer
         return LocationSerializer
 
+    def get_collection_validators(self, request, *args, **kwargs):
+        # Location payloads embed children and property counts, so every
+        # action is validated against the whole active collection
+        updated_at = self.get_queryset().aggregate(latest=Max("updated_at"))["latest"]
+        return make_validators(updated_at, ("locations", "properties"))
+
+    @conditional("get_collection_validators")
+    @cached_response("locations", "properties")
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         serializer = self.get_serializer(queryset, many=True)
         return Response({"success": True, "data": serializer.data})
 
+    @conditional("get_collection_validators")
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         return Response({"success": True, "data": serializer.data})
 
     @action(detail=False, methods=["get"])
+    @conditional("get_collection_validators")
     def featured(self, request):
         """Get featured locations."""
-        queryset = self.get_queryset().filter(is_featured=True)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({"success": True, "data": serializer.data})
+
+        def compute():
+            queryset = self.get_queryset().filter(is_featured=True)
+            return self.get_serializer(queryset, many=True).data
+
+        data = get_or_refresh(
+            request_cache_key("featured_locations", request), compute, tags=("locations", "properties")
+        )
+        return Response({"success": True, "data": data})
 
     @action(detail=False, methods=["get"])
+    @conditional("get_collection_validators")
     def by_type(self, request):
         """Get locations grouped by type."""
         queryset = self.get_queryset()
@@ -56,3 +83,24 @@ class LocationViewSet(viewsets.ReadOnlyModelViewSet):
             grouped[loc_type].append(LocationSerializer(location).data)
 
         return Response({"success": True, "data": grouped})
+
+
+class AsyncLocationViewMixin:
+    """Conditional GET against the whole active collection, as in ``LocationViewSet``."""
+
+    async def get_validators(self, request, *args, **kwargs):
+        latest = await Location.objects.filter(is_active=True).aaggregate(latest=Max("updated_at"))
+        return await amake_validators(latest["latest"], ("locations", "properties"))
+
+
+class AsyncLocationListView(AsyncLocationViewMixin, AsyncReadView):
+    """Async front for ``LocationViewSet.list`` (``ASYNC_PUBLIC_API``)."""
+
+    sync_view = LocationViewSet.as_view({"get": "list"})
+    cache_tags = ("locations", "properties")
+
+
+class AsyncLocationDetailView(AsyncLocationViewMixin, AsyncReadView):
+    """Async front for ``LocationViewSet.retrieve`` (``ASYNC_PUBLIC_API``)."""
+
+    sync_view = LocationViewSet.as_view({"get": "retrieve"})
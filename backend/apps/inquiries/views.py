@@ -7,6 +7,7 @@ from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.common.exports import ExportMixin
 from apps.common.pagination import StandardResultsPagination
 
 from .models import Inquiry, InquiryNote
@@ -63,7 +64,7 @@ class PublicInquiryView(viewsets.GenericViewSet):
         return request.META.get("REMOTE_ADDR")
 
 
-class AgentInquiryViewSet(viewsets.ModelViewSet):
+class AgentInquiryViewSet(ExportMixin, viewsets.ModelViewSet):
     """
     Viewset for agents to manage inquiries on their properties.
     """
@@ -75,16 +76,35 @@ class AgentInquiryViewSet(viewsets.ModelViewSet):
     search_fields = ["full_name", "email", "phone", "message"]
     ordering_fields = ["created_at", "status"]
     ordering = ["-created_at"]
+    export_filename = "inquiries"
+    export_fields = (
+        ("id", "id"),
+        ("created_at", "created_at"),
+        ("status", "status"),
+        ("full_name", "full_name"),
+        ("email", "email"),
+        ("phone", "phone"),
+        ("country", "country"),
+        ("preferred_contact_method", "preferred_contact_method"),
+        ("preferred_language", "preferred_language"),
+        ("budget_min", "budget_min"),
+        ("budget_max", "budget_max"),
+        ("property", "property_listing__title"),
+        ("property_slug", "property_listing__slug"),
+        ("message", "message"),
+    )
 
     def get_queryset(self):
         """Get inquiries for properties owned by the current agent."""
         user = self.request.user
 
         if user.is_staff:
-            return Inquiry.objects.all().select_related("property_listing", "property_listing__agent")
+            return Inquiry.objects.all().select_related(
+                "property_listing", "property_listing__agent", "property_listing__card"
+            )
 
         return Inquiry.objects.filter(property_listing__agent=user).select_related(
-            "property_listing", "property_listing__agent"
+            "property_listing", "property_listing__agent", "property_listing__card"
         )
 
     def get_serializer_class(self):
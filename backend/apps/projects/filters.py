@@ -2,9 +2,11 @@
 Filter classes for the Projects module.
 """
 
-from django.db import models as django_models
 from django_filters import rest_framework as filters
 
+from apps.common.filters import GeoFilterSet
+from apps.common.search import search_queryset
+
 from .models import (
     AssetStatus,
     AssetType,
@@ -19,7 +21,7 @@ from .models import (
 )
 
 
-class ProjectFilter(filters.FilterSet):
+class ProjectFilter(GeoFilterSet):
     min_price = filters.NumberFilter(field_name="price_range_min", lookup_expr="gte")
     max_price = filters.NumberFilter(field_name="price_range_max", lookup_expr="lte")
     city = filters.CharFilter(lookup_expr="iexact")
@@ -33,12 +35,14 @@ class ProjectFilter(filters.FilterSet):
         fields = ["status", "city", "state", "is_featured"]
 
     def filter_search(self, queryset, name, value):
-        return queryset.filter(
-            django_models.Q(title__icontains=value)
-            | django_models.Q(title_es__icontains=value)
-            | django_models.Q(description__icontains=value)
-            | django_models.Q(developer_name__icontains=value)
-            | django_models.Q(city__icontains=value)
+        return search_queryset(
+            queryset,
+            value,
+            Project.SEARCH_FIELDS,
+            headline_fields={
+                "search_headline": ("description", "english"),
+                "search_headline_es": ("description_es", "spanish"),
+            },
         )
 
 
@@ -0,0 +1,59 @@
+# Full-text search vector for projects
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations
+
+from apps.common.search import build_search_vector
+
+SEARCH_FIELDS = {
+    "english": [("title", "A"), ("description", "C")],
+    "spanish": [("title_es", "A"), ("description_es", "C")],
+    "simple": [("developer_name", "B"), ("city", "B"), ("state", "B")],
+}
+INDEX = GinIndex(fields=["search_vector"], name="project_search_vector_gin")
+
+
+def create_index(apps, schema_editor):
+    # GIN indexes and tsvector values only exist on PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Project = apps.get_model("projects", "Project")
+    schema_editor.add_index(Project, INDEX)
+    Project.objects.using(schema_editor.connection.alias).update(
+        search_vector=build_search_vector(SEARCH_FIELDS)
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Project = apps.get_model("projects", "Project")
+    schema_editor.remove_index(Project, INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='project',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='project_search_vector_gin'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_index, drop_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:45
+
+from django.db import migrations, models
+
+from apps.common.geo import encode_geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    rows = Project.objects.using(schema_editor.connection.alias).filter(
+        latitude__isnull=False, longitude__isnull=False
+    )
+    for row in rows.only("pk", "latitude", "longitude").iterator():
+        row.geohash = encode_geohash(row.latitude, row.longitude)
+        row.save(update_fields=["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0002_project_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Geohash of latitude/longitude, maintained on save",
+                max_length=12,
+            ),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0003_project_geohash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectimage",
+            name="renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Generated renditions (see apps.common.renditions)",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0004_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectimage",
+            name="dominant_color",
+            field=models.CharField(
+                blank=True, editable=False, help_text="#rrggbb", max_length=7
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectimage",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="projectimage",
+            name="placeholder",
+            field=models.TextField(
+                blank=True, editable=False, help_text="Tiny base64 data URI preview"
+            ),
+        ),
+        migrations.AddField(
+            model_name="projectimage",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -5,13 +5,18 @@ Models for the Projects (Development & Pre-Sale) module.
 from decimal import Decimal
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils import timezone
 from django_fsm import FSMField, transition
 
+from apps.common.cache import invalidate
+from apps.common.geo import geohash_for
 from apps.common.models import BaseModel
-from apps.common.utils import generate_unique_slug
+from apps.common.search import update_search_vector
+from apps.common.utils import save_with_unique_slug
 
 
 # ==================== Choices ====================
@@ -99,6 +104,13 @@ class Project(BaseModel):
     longitude = models.DecimalField(
         max_digits=11, decimal_places=8, null=True, blank=True
     )
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="Geohash of latitude/longitude, maintained on save",
+    )
     location = models.ForeignKey(
         "common.Location",
         on_delete=models.SET_NULL,
@@ -166,6 +178,15 @@ class Project(BaseModel):
     # Flags
     is_featured = models.BooleanField(default=False, db_index=True)
 
+    # Full-text search (maintained on save, PostgreSQL only)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    SEARCH_FIELDS = {
+        "english": [("title", "A"), ("description", "C")],
+        "spanish": [("title_es", "A"), ("description_es", "C")],
+        "simple": [("developer_name", "B"), ("city", "B"), ("state", "B")],
+    }
+
     class Meta:
         verbose_name = "Project"
         verbose_name_plural = "Projects"
@@ -173,15 +194,22 @@ class Project(BaseModel):
         indexes = [
             models.Index(fields=["status", "city"]),
             models.Index(fields=["price_range_min", "price_range_max"]),
+            GinIndex(fields=["search_vector"], name="project_search_vector_gin"),
         ]
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = generate_unique_slug(Project, self.title)
-        super().save(*args, **kwargs)
+        self.geohash = geohash_for(self.latitude, self.longitude)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_unique_slug(self, self.title, super().save, *args, **kwargs)
+        update_search_vector(self, using=kwargs.get("using"), update_fields=kwargs.get("update_fields"))
 
     @property
     def location_display(self) -> str:
@@ -242,6 +270,14 @@ class ProjectImage(BaseModel):
     image_url = models.URLField(blank=True)
     caption = models.CharField(max_length=255, blank=True)
     order = models.PositiveIntegerField(default=0)
+    renditions = models.JSONField(
+        default=dict, blank=True, editable=False, help_text="Generated renditions (see apps.common.renditions)"
+    )
+    # Filled in with the renditions
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    dominant_color = models.CharField(max_length=7, blank=True, editable=False, help_text="#rrggbb")
+    placeholder = models.TextField(blank=True, editable=False, help_text="Tiny base64 data URI preview")
 
     class Meta:
         ordering = ["order", "created_at"]
@@ -251,6 +287,10 @@ class ProjectImage(BaseModel):
     def __str__(self):
         return f"Image for {self.project.title}"
 
+    def renditions_ready(self):
+        """Called once new renditions are stored."""
+        invalidate("projects")
+
 
 class SellableAsset(BaseModel):
     """Individual sellable unit within a project (apartment, parking, storage, etc.)."""
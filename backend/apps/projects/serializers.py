@@ -4,6 +4,9 @@ Serializers for the Projects module.
 
 from rest_framework import serializers
 
+from apps.common.renditions import current_renditions, rendition_url, srcset
+from apps.common.serializers import DistanceField, SearchHighlightField
+
 from .models import (
     BuyerContract,
     PaymentScheduleItem,
@@ -19,9 +22,41 @@ from .models import (
 
 
 class ProjectImageSerializer(serializers.ModelSerializer):
+    thumbnail_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = ProjectImage
-        fields = ["id", "image", "image_url", "caption", "order"]
+        fields = [
+            "id",
+            "image",
+            "image_url",
+            "thumbnail_url",
+            "srcset",
+            "width",
+            "height",
+            "dominant_color",
+            "placeholder",
+            "caption",
+            "order",
+        ]
+
+    def _absolute(self, url):
+        request = self.context.get("request")
+        if request and url:
+            return request.build_absolute_uri(url)
+        return url
+
+    def get_thumbnail_url(self, obj):
+        url = rendition_url(current_renditions(obj), "thumbnail")
+        if url:
+            return self._absolute(url)
+        if obj.image:
+            return self._absolute(obj.image.url)
+        return obj.image_url or None
+
+    def get_srcset(self, obj):
+        return srcset(current_renditions(obj), self._absolute)
 
 
 # ==================== Project ====================
@@ -31,6 +66,8 @@ class ProjectListSerializer(serializers.ModelSerializer):
     location_display = serializers.CharField(read_only=True)
     progress_percentage = serializers.IntegerField(read_only=True)
     cover_image_url = serializers.SerializerMethodField()
+    search_highlight = SearchHighlightField()
+    distance = DistanceField()
 
     class Meta:
         model = Project
@@ -53,6 +90,8 @@ class ProjectListSerializer(serializers.ModelSerializer):
             "cover_image_url",
             "progress_percentage",
             "is_featured",
+            "search_highlight",
+            "distance",
             "created_at",
         ]
 
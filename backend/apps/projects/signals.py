@@ -0,0 +1,40 @@
+"""
+Signal handlers for the Projects module.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.cache import invalidate
+from apps.common.renditions import needs_renditions, release_renditions, schedule_renditions
+
+from .models import Project, ProjectImage, ProjectMilestone, SellableAsset
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=ProjectImage)
+@receiver(post_delete, sender=ProjectImage)
+@receiver(post_save, sender=ProjectMilestone)
+@receiver(post_delete, sender=ProjectMilestone)
+@receiver(post_save, sender=SellableAsset)
+@receiver(post_delete, sender=SellableAsset)
+def invalidate_project_caches(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate("projects")
+
+
+@receiver(post_save, sender=ProjectImage)
+def schedule_image_renditions(sender, instance, raw=False, **kwargs):
+    if raw or not needs_renditions(instance):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: schedule_renditions(ProjectImage, pk))
+
+
+@receiver(post_delete, sender=ProjectImage)
+def delete_image_renditions(sender, instance, **kwargs):
+    renditions = instance.renditions
+    if renditions:
+        transaction.on_commit(lambda: release_renditions(ProjectImage, renditions))
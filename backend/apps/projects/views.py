@@ -8,7 +8,13 @@ from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.common.async_views import AsyncReadView, amake_validators
+from apps.common.cache import cached_response, get_or_refresh, request_cache_key
+from apps.common.conditional import conditional, make_validators
+from apps.common.exports import ExportMixin
+from apps.common.filters import RankedOrderingFilter
 from apps.common.pagination import StandardResultsPagination
+from apps.common.replicas import ReadReplicaMixin
 
 from .filters import (
     BuyerContractFilter,
@@ -52,22 +58,19 @@ from .serializers import (
 # ======================== PUBLIC VIEWS ========================
 
 
-class PublicProjectViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicProjectViewSet(ReadReplicaMixin, viewsets.ReadOnlyModelViewSet):
     """Public viewset for browsing active projects."""
 
+    read_replica_tags = ("projects",)
     pagination_class = StandardResultsPagination
-    filter_backends = [
-        DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
-    ]
+    filter_backends = [DjangoFilterBackend, RankedOrderingFilter]
     filterset_class = ProjectFilter
-    search_fields = ["title", "title_es", "description", "developer_name", "city"]
     ordering_fields = [
         "price_range_min",
         "created_at",
         "delivery_date",
         "total_units",
+        "distance",
     ]
     ordering = ["-created_at"]
     lookup_field = "slug"
@@ -82,6 +85,22 @@ class PublicProjectViewSet(viewsets.ReadOnlyModelViewSet):
             return ProjectDetailSerializer
         return ProjectListSerializer
 
+    @cached_response("projects")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    def get_retrieve_validators(self, request, slug=None, **kwargs):
+        row = (
+            Project.objects.exclude(status=ProjectStatus.DRAFT)
+            .filter(slug=slug)
+            .values("updated_at")
+            .first()
+        )
+        if row is None:
+            return None
+        return make_validators(row["updated_at"], ("projects",))
+
+    @conditional("get_retrieve_validators")
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -115,11 +134,39 @@ class PublicProjectViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=["get"])
     def featured(self, request):
         """List featured projects."""
-        projects = self.get_queryset().filter(is_featured=True)[:6]
-        serializer = ProjectListSerializer(
-            projects, many=True, context={"request": request}
+
+        def compute():
+            projects = self.get_queryset().filter(is_featured=True)[:6]
+            return ProjectListSerializer(projects, many=True, context={"request": request}).data
+
+        data = get_or_refresh(
+            request_cache_key("featured_projects", request), compute, tags=("projects",)
         )
-        return Response({"success": True, "data": serializer.data})
+        return Response({"success": True, "data": data})
+
+
+class AsyncProjectListView(AsyncReadView):
+    """Async front for ``PublicProjectViewSet.list`` (``ASYNC_PUBLIC_API``)."""
+
+    sync_view = PublicProjectViewSet.as_view({"get": "list"})
+    cache_tags = ("projects",)
+
+
+class AsyncProjectDetailView(AsyncReadView):
+    """Async front for ``PublicProjectViewSet.retrieve`` (``ASYNC_PUBLIC_API``)."""
+
+    sync_view = PublicProjectViewSet.as_view({"get": "retrieve"})
+
+    async def get_validators(self, request, slug=None, **kwargs):
+        row = await (
+            Project.objects.exclude(status=ProjectStatus.DRAFT)
+            .filter(slug=slug)
+            .values("updated_at")
+            .afirst()
+        )
+        if row is None:
+            return None
+        return await amake_validators(row["updated_at"], ("projects",))
 
 
 # ======================== PROJECT ADMIN VIEWS ========================
@@ -261,13 +308,28 @@ class AdminMilestoneViewSet(viewsets.ModelViewSet):
         serializer.save(project=project)
 
 
-class AdminContractViewSet(viewsets.ModelViewSet):
+class AdminContractViewSet(ExportMixin, viewsets.ModelViewSet):
     """ViewSet for managing buyer contracts within a project."""
 
     permission_classes = [IsProjectAdmin]
     pagination_class = StandardResultsPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = BuyerContractFilter
+    export_filename = "contracts"
+    export_fields = (
+        ("id", "id"),
+        ("project", "asset__project__title"),
+        ("asset", "asset__identifier"),
+        ("buyer_email", "buyer__email"),
+        ("buyer_first_name", "buyer__first_name"),
+        ("buyer_last_name", "buyer__last_name"),
+        ("status", "status"),
+        ("contract_date", "contract_date"),
+        ("total_price", "total_price"),
+        ("initial_payment", "initial_payment"),
+        ("payment_plan_months", "payment_plan_months"),
+        ("created_at", "created_at"),
+    )
 
     def get_queryset(self):
         project_id = self.kwargs.get("project_pk")
@@ -322,12 +384,24 @@ class AdminContractViewSet(viewsets.ModelViewSet):
         return self._do_contract_transition(self.get_object(), "cancel")
 
 
-class AdminPaymentViewSet(viewsets.ModelViewSet):
+class AdminPaymentViewSet(ExportMixin, viewsets.ModelViewSet):
     """ViewSet for managing payments within a contract."""
 
     permission_classes = [IsProjectAdmin]
     filter_backends = [DjangoFilterBackend]
     filterset_class = PaymentScheduleFilter
+    export_filename = "payments"
+    export_fields = (
+        ("id", "id"),
+        ("contract", "contract_id"),
+        ("due_date", "due_date"),
+        ("amount_usd", "amount_usd"),
+        ("concept", "concept"),
+        ("status", "status"),
+        ("paid_date", "paid_date"),
+        ("payment_reference", "payment_reference"),
+        ("notes", "notes"),
+    )
 
     def get_queryset(self):
         contract_id = self.kwargs.get("contract_pk")
@@ -0,0 +1,174 @@
+"""
+Faceted search counts for the properties app.
+
+Facets are disjunctive: the counts for one facet apply every active filter
+except that facet's own, so selecting "apartment" still shows how many
+houses match. Shared filters (search, bbox, area...) narrow a base queryset;
+per-facet selections become conditional ``Count(filter=...)`` expressions,
+evaluated in one aggregate query plus one grouped query for the
+open-ended dimensions (city, state, location).
+"""
+
+from collections import defaultdict
+
+from django.db.models import Count, Q
+from django_filters.constants import EMPTY_VALUES
+
+from .models import ListingType, PropertyType
+
+# Facet name -> the PropertyFilter parameters that select it
+FACET_PARAMS = {
+    "property_type": ("property_type",),
+    "listing_type": ("listing_type",),
+    "city": ("city",),
+    "state": ("state",),
+    "location": ("location",),
+    "bedrooms": ("min_bedrooms", "max_bedrooms"),
+    "price": ("min_price", "max_price"),
+    "is_featured": ("is_featured",),
+    "is_beachfront": ("is_beachfront",),
+    "is_new_construction": ("is_new_construction",),
+    "is_investment_opportunity": ("is_investment_opportunity",),
+}
+FACET_FILTERS = frozenset(name for names in FACET_PARAMS.values() for name in names)
+FLAG_FACETS = ("is_featured", "is_beachfront", "is_new_construction", "is_investment_opportunity")
+
+# (label, min, max) - bounds inclusive, None means open-ended
+BEDROOM_BUCKETS = (
+    ("0", 0, 0),
+    ("1", 1, 1),
+    ("2", 2, 2),
+    ("3", 3, 3),
+    ("4", 4, 4),
+    ("5+", 5, None),
+)
+
+# Histogram bin edges in USD (lower bound inclusive); rentals are per month
+PRICE_EDGES = {
+    ListingType.SALE: (0, 50_000, 100_000, 200_000, 350_000, 500_000, 1_000_000),
+    ListingType.RENT: (0, 300, 500, 1_000, 2_000, 5_000),
+}
+
+
+def _selection(filterset, facet: str) -> Q:
+    """
+    Return the condition for the facet's own active filters.
+    """
+    condition = Q()
+    for name in FACET_PARAMS[facet]:
+        value = filterset.form.cleaned_data.get(name)
+        if value in EMPTY_VALUES:
+            continue
+        field = filterset.filters[name]
+        condition &= Q(**{f"{field.field_name}__{field.lookup_expr}": value})
+    return condition
+
+
+def _bedrooms(low, high) -> Q:
+    if high is None:
+        return Q(bedrooms__gte=low)
+    return Q(bedrooms__gte=low, bedrooms__lte=high)
+
+
+def shared_queryset(filterset):
+    """
+    Apply every filter of a validated filterset except the facet selections.
+    """
+    queryset = filterset.queryset
+    for name, value in filterset.form.cleaned_data.items():
+        if name not in FACET_FILTERS:
+            queryset = filterset.filters[name].filter(queryset, value)
+    return queryset
+
+
+def compute_facets(queryset, filterset) -> dict:
+    """
+    Compute facet counts for a validated PropertyFilter.
+
+    ``queryset`` must already be narrowed by the shared filters (see
+    ``shared_queryset``).
+    """
+    selections = {facet: _selection(filterset, facet) for facet in FACET_PARAMS}
+
+    def others(facet):
+        condition = Q()
+        for name, selection in selections.items():
+            if name != facet:
+                condition &= selection
+        return condition
+
+    listing_type = filterset.form.cleaned_data.get("listing_type") or ListingType.SALE
+    edges = PRICE_EDGES[listing_type]
+    price_bins = list(zip(edges, (*edges[1:], None)))
+
+    aggregates = {"total": Count("id", filter=others(None))}
+    for value in PropertyType.values:
+        aggregates[f"property_type:{value}"] = Count(
+            "id", filter=others("property_type") & Q(property_type=value)
+        )
+    for value in ListingType.values:
+        aggregates[f"listing_type:{value}"] = Count(
+            "id", filter=others("listing_type") & Q(listing_type=value)
+        )
+    for label, low, high in BEDROOM_BUCKETS:
+        aggregates[f"bedrooms:{label}"] = Count(
+            "id", filter=others("bedrooms") & _bedrooms(low, high)
+        )
+    for index, (low, high) in enumerate(price_bins):
+        condition = Q(price__gte=low) if high is None else Q(price__gte=low, price__lt=high)
+        aggregates[f"price:{index}"] = Count("id", filter=others("price") & condition)
+    for flag in FLAG_FACETS:
+        aggregates[f"{flag}:true"] = Count("id", filter=others(flag) & Q(**{flag: True}))
+    counts = queryset.order_by().aggregate(**aggregates)
+
+    groups = (
+        queryset.order_by()
+        .values("city", "state", "location__slug", "location__name")
+        .annotate(
+            city_count=Count("id", filter=others("city")),
+            state_count=Count("id", filter=others("state")),
+            location_count=Count("id", filter=others("location")),
+        )
+    )
+    cities, states, locations = defaultdict(int), defaultdict(int), defaultdict(int)
+    location_names = {}
+    for row in groups:
+        cities[(row["city"], row["state"])] += row["city_count"]
+        states[row["state"]] += row["state_count"]
+        if row["location__slug"]:
+            locations[row["location__slug"]] += row["location_count"]
+            location_names[row["location__slug"]] = row["location__name"]
+
+    def ranked(buckets):
+        items = [(key, count) for key, count in buckets.items() if count]
+        return sorted(items, key=lambda item: (-item[1], str(item[0])))
+
+    return {
+        "total": counts["total"],
+        "property_type": [
+            {"value": value, "label": label, "count": counts[f"property_type:{value}"]}
+            for value, label in PropertyType.choices
+        ],
+        "listing_type": [
+            {"value": value, "label": label, "count": counts[f"listing_type:{value}"]}
+            for value, label in ListingType.choices
+        ],
+        "city": [
+            {"value": city, "state": state, "count": count}
+            for (city, state), count in ranked(cities)
+        ],
+        "state": [{"value": state, "count": count} for state, count in ranked(states)],
+        "location": [
+            {"value": slug, "label": location_names[slug], "count": count}
+            for slug, count in ranked(locations)
+        ],
+        "bedrooms": [
+            {"value": label, "min": low, "max": high, "count": counts[f"bedrooms:{label}"]}
+            for label, low, high in BEDROOM_BUCKETS
+        ],
+        "price": [
+            {"min": low, "max": high, "count": counts[f"price:{index}"]}
+            for index, (low, high) in enumerate(price_bins)
+        ],
+        "flags": {flag: counts[f"{flag}:true"] for flag in FLAG_FACETS},
+    }
@@ -4,10 +4,13 @@ Filters for the properties app.
 
 from django_filters import rest_framework as filters
 
+from apps.common.filters import GeoFilterSet
+from apps.common.search import search_queryset
+
 from .models import Property, PropertyStatus, PropertyType, ListingType
 
 
-class PropertyFilter(filters.FilterSet):
+class PropertyFilter(GeoFilterSet):
     """
     Filter set for property listings.
     """
@@ -30,6 +33,7 @@ class PropertyFilter(filters.FilterSet):
     # Location
     city = filters.CharFilter(lookup_expr="iexact")
     state = filters.CharFilter(lookup_expr="iexact")
+    location = filters.CharFilter(field_name="location__slug")
 
     # Types
     property_type = filters.ChoiceFilter(choices=PropertyType.choices)
@@ -60,15 +64,14 @@ class PropertyFilter(filters.FilterSet):
 
     def filter_search(self, queryset, name, value):
         """
-        Full-text search across title, description, address, and city.
+        Bilingual full-text search over titles, descriptions and location.
         """
-        return queryset.filter(
-            models.Q(title__icontains=value)
-            | models.Q(description__icontains=value)
-            | models.Q(address__icontains=value)
-            | models.Q(city__icontains=value)
+        return search_queryset(
+            queryset,
+            value,
+            Property.SEARCH_FIELDS,
+            headline_fields={
+                "search_headline": ("description", "english"),
+                "search_headline_es": ("description_es", "spanish"),
+            },
         )
-
-
-# Import models for Q objects
-from django.db import models
@@ -0,0 +1,263 @@
+"""
+Bulk property import from CSV or NDJSON.
+
+Rows are read and validated one at a time with the
+``PropertyCreateUpdateSerializer`` rules (a single serializer instance is
+reused, so its fields are built once). Valid rows are inserted in chunks,
+each inside its own transaction: slugs are allocated for the whole chunk
+at once and properties, images and listing cards are written with
+``bulk_create``. Imported listings start as drafts, like listings created
+through the API.
+
+Because ``bulk_create`` skips ``Property.save`` and the post_save signals,
+the importer fills in what they maintain (geohash, search vector, card)
+itself. Drafts do not count towards listing counts or saved-search
+matches, so those need nothing.
+"""
+
+import csv
+import json
+import logging
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import URLValidator
+from django.db import DatabaseError, IntegrityError, transaction
+from rest_framework import serializers
+
+from apps.common.cache import invalidate
+from apps.common.geo import geohash_for
+from apps.common.search import refresh_search_vectors
+from apps.common.utils import SLUG_SAVE_ATTEMPTS, allocate_slugs
+
+from .models import Property, PropertyCard, PropertyImage
+from .serializers import PropertyCreateUpdateSerializer
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 500
+# Columns that are not Property fields
+IMAGE_COLUMNS = ("image_url", "image_urls")
+# Set by the FSM workflow, not by imports
+IGNORED_COLUMNS = ("status",)
+LIST_SEPARATOR = "|"
+
+IMAGE_URL_MAX_LENGTH = PropertyImage._meta.get_field("image_url").max_length
+
+_url_validator = URLValidator(schemes=["http", "https"])
+
+
+def validate_image_url(url: str) -> None:
+    if not isinstance(url, str) or len(url) > IMAGE_URL_MAX_LENGTH:
+        raise DjangoValidationError(
+            f"Enter a valid URL of at most {IMAGE_URL_MAX_LENGTH} characters."
+        )
+    _url_validator(url)
+
+
+def detect_format(filename: str, default: str = "csv") -> str:
+    """
+    Guess the import format from a file name.
+    """
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def iter_rows(lines, file_format: str):
+    """
+    Yield ``(row_number, row)`` from an iterable of text lines.
+
+    Rows that cannot be parsed yield an exception instead of a dict.
+    """
+    if file_format == "csv":
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            yield number, row
+        return
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, exc
+            continue
+        if not isinstance(row, dict):
+            row = ValueError("Expected a JSON object")
+        yield number, row
+
+
+def _split(name: str, value):
+    if isinstance(value, list):
+        return value
+    value = (value or "").strip()
+    if value.startswith("["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise serializers.ValidationError({name: ["Invalid JSON list"]})
+    return [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+
+
+def clean_row(row: dict) -> tuple:
+    """
+    Split a raw row into serializer data and image URLs.
+
+    Empty CSV cells are dropped so model defaults apply; ``features`` and
+    ``image_urls`` accept a JSON list or ``|``-separated values. Raises
+    ``ValidationError`` for malformed lists and image URLs.
+    """
+    data = {}
+    for name, value in row.items():
+        if name is None or name in IGNORED_COLUMNS:
+            continue
+        name = name.strip()
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ("", None):
+            continue
+        data[name] = value
+
+    image_urls = []
+    for column in IMAGE_COLUMNS:
+        if column in data:
+            image_urls += _split(column, data.pop(column))
+    for url in image_urls:
+        try:
+            validate_image_url(url)
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError({"image_urls": [f"{url}: {exc.messages[0]}"]})
+    if "features" in data:
+        data["features"] = _split("features", data["features"])
+    return data, image_urls
+
+
+class PropertyImporter:
+    """
+    Import properties for one agent, collecting a per-row report.
+    """
+
+    def __init__(self, agent, chunk_size: int = DEFAULT_CHUNK_SIZE, context=None):
+        self.agent = agent
+        self.chunk_size = chunk_size
+        self.serializer = PropertyCreateUpdateSerializer(context=context or {})
+        self.created = []
+        self.errors = []
+        self.pending = []
+
+    def validate(self, number: int, row) -> None:
+        if isinstance(row, Exception):
+            self.errors.append({"row": number, "errors": {"non_field_errors": [str(row)]}})
+            return
+        try:
+            data, image_urls = clean_row(row)
+            validated = self.serializer.run_validation(data)
+        except serializers.ValidationError as exc:
+            self.errors.append({"row": number, "errors": exc.detail})
+            return
+        self.pending.append((number, validated, image_urls))
+        if len(self.pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert the pending valid rows in one transaction."""
+        chunk, self.pending = self.pending, []
+        if not chunk:
+            return
+        for _attempt in range(SLUG_SAVE_ATTEMPTS):
+            titles = [validated["title"] for _number, validated, _urls in chunk]
+            slugs = allocate_slugs(Property, titles)
+            try:
+                with transaction.atomic():
+                    properties = self.insert(chunk, slugs)
+                break
+            except IntegrityError as exc:
+                # Retry only if a concurrent insert took one of the slugs
+                if not Property.objects.filter(slug__in=slugs).exists():
+                    self.fail(chunk, f"Database error: {exc}", exc_info=True)
+                    return
+            except DatabaseError as exc:
+                self.fail(chunk, f"Database error: {exc}", exc_info=True)
+                return
+        else:
+            self.fail(chunk, "Could not allocate unique slugs")
+            return
+        self.created += [
+            {"row": number, "id": str(prop.pk), "slug": prop.slug}
+            for (number, _validated, _urls), prop in zip(chunk, properties)
+        ]
+
+    def fail(self, chunk, message: str, exc_info: bool = False) -> None:
+        logger.error("Bulk import chunk failed: %s", message, exc_info=exc_info)
+        self.errors += [
+            {"row": number, "errors": {"non_field_errors": [message]}}
+            for number, _validated, _urls in chunk
+        ]
+
+    def insert(self, chunk, slugs) -> list:
+        properties = []
+        for (_number, validated, _urls), slug in zip(chunk, slugs):
+            prop = Property(agent=self.agent, slug=slug, **validated)
+            prop.geohash = geohash_for(prop.latitude, prop.longitude)
+            properties.append(prop)
+        Property.objects.bulk_create(properties)
+
+        images = []
+        main_images = {}
+        for prop, (_number, _validated, image_urls) in zip(properties, chunk):
+            for order, url in enumerate(image_urls):
+                image = PropertyImage(property=prop, image_url=url, is_main=order == 0, order=order)
+                images.append(image)
+                if order == 0:
+                    main_images[prop.pk] = image
+        PropertyImage.objects.bulk_create(images)
+
+        cards = []
+        for prop in properties:
+            image = main_images.get(prop.pk)
+            cards.append(
+                PropertyCard(
+                    property=prop,
+                    main_image=image,
+                    image_url=image.image_url if image else "",
+                    thumbnail_url=image.image_url if image else "",
+                    agent_name=self.agent.full_name,
+                    location_display=prop.location_display,
+                )
+            )
+        PropertyCard.objects.bulk_create(cards)
+        refresh_search_vectors(Property.objects.filter(pk__in=[prop.pk for prop in properties]))
+        return properties
+
+    def run(self, rows) -> dict:
+        """Validate and import ``(row_number, row)`` pairs; returns the report."""
+        for number, row in rows:
+            self.validate(number, row)
+        self.flush()
+        if self.created:
+            invalidate("properties")
+        self.errors.sort(key=lambda error: error["row"])
+        return {
+            "created": len(self.created),
+            "failed": len(self.errors),
+            "properties": self.created,
+            "errors": self.errors,
+        }
+
+
+def import_properties(
+    lines, agent, file_format: str = "csv", chunk_size: int = DEFAULT_CHUNK_SIZE, context=None
+) -> dict:
+    """
+    Import properties for ``agent`` from text lines in ``file_format``.
+    """
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported format '{file_format}'")
+    return PropertyImporter(agent, chunk_size=chunk_size, context=context).run(
+        iter_rows(lines, file_format)
+    )
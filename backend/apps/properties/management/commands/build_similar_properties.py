@@ -0,0 +1,30 @@
+"""
+Build the similar-properties index used by /properties/{slug}/similar/.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.properties.similarity import DEFAULT_TOP_K, refresh_similar_properties
+
+
+class Command(BaseCommand):
+    help = "Compute nearest-neighbour listings for active properties (incremental by default)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute every property instead of only changed listings",
+        )
+        parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Neighbours stored per property")
+        parser.add_argument(
+            "--block-size",
+            type=int,
+            help="Rows compared per NumPy block (default: sized to a 64 MB budget)",
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_similar_properties(
+            full=options["full"], k=options["top_k"], block_size=options["block_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Done! Recomputed neighbours for {count} properties."))
@@ -0,0 +1,19 @@
+"""
+Apply buffered property view counts to the database.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.properties.view_counts import flush_view_counts
+
+
+class Command(BaseCommand):
+    help = "Flush buffered property views into Property.view_count (run periodically, e.g. every minute)"
+
+    def handle(self, *args, **options):
+        counts = flush_view_counts()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done! Flushed {sum(counts.values())} views for {len(counts)} properties."
+            )
+        )
@@ -0,0 +1,44 @@
+"""
+Bulk-import properties for an agent from a CSV or NDJSON file.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import User
+from apps.properties.importer import DEFAULT_CHUNK_SIZE, IMPORT_FORMATS, detect_format, import_properties
+
+
+class Command(BaseCommand):
+    help = "Import properties (as drafts) from a CSV or NDJSON file with external image URLs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file")
+        parser.add_argument("--agent", required=True, help="Email of the agent who owns the listings")
+        parser.add_argument("--format", dest="file_format", choices=IMPORT_FORMATS, help="Default: from the extension")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--report", help="Write the full JSON report to this file")
+
+    def handle(self, *args, **options):
+        try:
+            agent = User.objects.get(email=options["agent"], role=User.Role.AGENT)
+        except User.DoesNotExist:
+            raise CommandError(f"No agent with email {options['agent']}")
+        file_format = options["file_format"] or detect_format(options["path"])
+
+        with open(options["path"], encoding="utf-8-sig", newline="") as lines:
+            report = import_properties(
+                lines, agent, file_format=file_format, chunk_size=options["chunk_size"]
+            )
+
+        for error in report["errors"][:20]:
+            self.stdout.write(self.style.WARNING(f"Row {error['row']}: {json.dumps(error['errors'])}"))
+        if report["failed"] > 20:
+            self.stdout.write(self.style.WARNING(f"... and {report['failed'] - 20} more"))
+        if options["report"]:
+            with open(options["report"], "w") as output:
+                json.dump(report, output, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(f"Done! Imported {report['created']} properties ({report['failed']} rows rejected).")
+        )
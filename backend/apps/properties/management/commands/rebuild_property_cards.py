@@ -0,0 +1,30 @@
+"""
+Rebuild the denormalized listing cards for all properties.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.properties.models import Property, PropertyCard
+
+
+class Command(BaseCommand):
+    help = "Rebuild listing-card projections (main image, thumbnail, agent name, location)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only build cards for properties that do not have one yet",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Property.objects.select_related("agent").prefetch_related("images")
+        if options["missing_only"]:
+            queryset = queryset.filter(card__isnull=True)
+
+        count = 0
+        for property_obj in queryset.iterator(chunk_size=500):
+            PropertyCard.refresh(property_obj)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Done! Rebuilt {count} property cards."))
@@ -0,0 +1,17 @@
+"""
+Rebuild the city/location listing-count table from scratch.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.common.cache import invalidate
+from apps.properties.models import ListingCount
+
+
+class Command(BaseCommand):
+    help = "Recompute active listing counts per city/state and location (fixes drift from bulk updates)"
+
+    def handle(self, *args, **options):
+        count = ListingCount.rebuild()
+        invalidate("properties")
+        self.stdout.write(self.style.SUCCESS(f"Done! Rebuilt {count} listing counts."))
@@ -0,0 +1,59 @@
+# Full-text search vector for property listings
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations
+
+from apps.common.search import build_search_vector
+
+SEARCH_FIELDS = {
+    "english": [("title", "A"), ("description", "C")],
+    "spanish": [("title", "A"), ("description_es", "C")],
+    "simple": [("city", "B"), ("state", "B"), ("address", "B")],
+}
+INDEX = GinIndex(fields=["search_vector"], name="property_search_vector_gin")
+
+
+def create_index(apps, schema_editor):
+    # GIN indexes and tsvector values only exist on PostgreSQL
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Property = apps.get_model("properties", "Property")
+    schema_editor.add_index(Property, INDEX)
+    Property.objects.using(schema_editor.connection.alias).update(
+        search_vector=build_search_vector(SEARCH_FIELDS)
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Property = apps.get_model("properties", "Property")
+    schema_editor.remove_index(Property, INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0005_fsm_status_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='property',
+                    index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='property_search_vector_gin'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_index, drop_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0006_property_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PropertyCard",
+            fields=[
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "property",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="card",
+                        serialize=False,
+                        to="properties.property",
+                    ),
+                ),
+                (
+                    "image_url",
+                    models.CharField(
+                        blank=True, help_text="Original main image URL", max_length=500
+                    ),
+                ),
+                ("thumbnail_url", models.CharField(blank=True, max_length=500)),
+                ("agent_name", models.CharField(blank=True, max_length=255)),
+                ("location_display", models.CharField(blank=True, max_length=255)),
+                (
+                    "main_image",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="properties.propertyimage",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Property Card",
+                "verbose_name_plural": "Property Cards",
+            },
+        ),
+    ]
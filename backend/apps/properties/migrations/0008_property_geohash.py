@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:45
+
+from django.db import migrations, models
+
+from apps.common.geo import encode_geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    Property = apps.get_model("properties", "Property")
+    rows = Property.objects.using(schema_editor.connection.alias).filter(
+        latitude__isnull=False, longitude__isnull=False
+    )
+    for row in rows.only("pk", "latitude", "longitude").iterator():
+        row.geohash = encode_geohash(row.latitude, row.longitude)
+        row.save(update_fields=["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0007_property_card"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Geohash of latitude/longitude, maintained on save",
+                max_length=12,
+            ),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_counts(apps, schema_editor):
+    Property = apps.get_model("properties", "Property")
+    ListingCount = apps.get_model("properties", "ListingCount")
+    db = schema_editor.connection.alias
+    active = Property.objects.using(db).filter(status="active").order_by()
+    rows = []
+    for listing_type in ("", "sale", "rent"):
+        subset = active.filter(listing_type=listing_type) if listing_type else active
+        for row in subset.values("city", "state").annotate(total=Count("id")):
+            rows.append(
+                ListingCount(
+                    scope="city",
+                    key=f"{row['city']}|{row['state']}",
+                    listing_type=listing_type,
+                    city=row["city"],
+                    state=row["state"],
+                    count=row["total"],
+                )
+            )
+        grouped = subset.filter(location__isnull=False).values("location_id")
+        for row in grouped.annotate(total=Count("id")):
+            rows.append(
+                ListingCount(
+                    scope="location",
+                    key=str(row["location_id"]),
+                    listing_type=listing_type,
+                    location_id=row["location_id"],
+                    count=row["total"],
+                )
+            )
+    ListingCount.objects.using(db).bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0001_add_location_model"),
+        ("properties", "0008_property_geohash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListingCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[("city", "City"), ("location", "Location")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text='"city|state" or the location id', max_length=255
+                    ),
+                ),
+                (
+                    "listing_type",
+                    models.CharField(
+                        blank=True,
+                        choices=[("sale", "For Sale"), ("rent", "For Rent")],
+                        help_text="Empty for all types",
+                        max_length=10,
+                    ),
+                ),
+                ("city", models.CharField(blank=True, max_length=100)),
+                ("state", models.CharField(blank=True, max_length=100)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "location",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listing_counts",
+                        to="common.location",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Listing Count",
+                "verbose_name_plural": "Listing Counts",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("scope", "key", "listing_type"),
+                        name="unique_listing_count",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_counts, migrations.RunPython.noop),
+    ]
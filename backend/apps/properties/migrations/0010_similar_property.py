@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0009_listing_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarProperty",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                (
+                    "score",
+                    models.FloatField(
+                        help_text="Cosine similarity of the feature vectors"
+                    ),
+                ),
+                ("computed_at", models.DateTimeField()),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_entries",
+                        to="properties.property",
+                    ),
+                ),
+                (
+                    "similar",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_to_entries",
+                        to="properties.property",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Similar Property",
+                "verbose_name_plural": "Similar Properties",
+                "ordering": ["property", "rank"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("property", "rank"), name="unique_similar_property_rank"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0011_saved_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertycard",
+            name="renditions",
+            field=models.JSONField(
+                blank=True, default=dict, help_text="Main image renditions"
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Generated renditions (see apps.common.renditions)",
+            ),
+        ),
+    ]
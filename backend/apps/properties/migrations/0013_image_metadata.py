@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0012_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertycard",
+            name="image_color",
+            field=models.CharField(blank=True, max_length=7),
+        ),
+        migrations.AddField(
+            model_name="propertycard",
+            name="image_height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="propertycard",
+            name="image_placeholder",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="propertycard",
+            name="image_width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="dominant_color",
+            field=models.CharField(
+                blank=True, editable=False, help_text="#rrggbb", max_length=7
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="placeholder",
+            field=models.TextField(
+                blank=True, editable=False, help_text="Tiny base64 data URI preview"
+            ),
+        ),
+        migrations.AddField(
+            model_name="propertyimage",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -5,15 +5,22 @@ Property models for the real estate platform.
 from decimal import Decimal
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.cache import cache
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from django_fsm import FSMField, transition
-from imagekit.models import ImageSpecField
-from imagekit.processors import ResizeToFill, ResizeToFit
 
-from apps.common.models import BaseModel
-from apps.common.utils import generate_unique_slug
+from apps.common.cache import invalidate
+from apps.common.geo import geohash_for
+from apps.common.models import BaseModel, TimeStampedModel
+from apps.common.renditions import current_renditions, image_metadata, rendition_url
+from apps.common.search import update_search_vector
+from apps.common.utils import save_with_unique_slug
+
+SAVED_IDS_CACHE_TIMEOUT = 60 * 60 * 24
 
 
 class PropertyType(models.TextChoices):
@@ -116,6 +123,13 @@ class Property(BaseModel):
     longitude = models.DecimalField(
         max_digits=11, decimal_places=8, null=True, blank=True
     )
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="Geohash of latitude/longitude, maintained on save",
+    )
 
     # Custom location (Margarita, Los Roques, etc.)
     location = models.ForeignKey(
@@ -176,6 +190,16 @@ class Property(BaseModel):
         help_text="Internal notes for admins"
     )
 
+    # Full-text search (maintained on save, PostgreSQL only)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Text search config -> weighted fields feeding ``search_vector``
+    SEARCH_FIELDS = {
+        "english": [("title", "A"), ("description", "C")],
+        "spanish": [("title", "A"), ("description_es", "C")],
+        "simple": [("city", "B"), ("state", "B"), ("address", "B")],
+    }
+
     class Meta:
         verbose_name = "Property"
         verbose_name_plural = "Properties"
@@ -185,6 +209,7 @@ class Property(BaseModel):
             models.Index(fields=["price"]),
             models.Index(fields=["city", "state"]),
             models.Index(fields=["property_type"]),
+            GinIndex(fields=["search_vector"], name="property_search_vector_gin"),
         ]
         permissions = [
             ("can_approve_property", "Can approve/reject property listings"),
@@ -193,16 +218,43 @@ class Property(BaseModel):
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded state so listing counts can be moved on save
+        if all(name in instance.__dict__ for name in ListingCount.TRACKED_FIELDS):
+            instance._listing_snapshot = ListingCount.snapshot(instance)
+        return instance
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = generate_unique_slug(Property, self.title)
-        super().save(*args, **kwargs)
+        self.geohash = geohash_for(self.latitude, self.longitude)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            save_with_unique_slug(self, self.title, super().save, *args, **kwargs)
+        update_search_vector(self, using=kwargs.get("using"), update_fields=kwargs.get("update_fields"))
 
     @property
     def main_image(self):
         """Return the main/first image of the property."""
+        if "images" in getattr(self, "_prefetched_objects_cache", {}):
+            # Reuse prefetched images instead of two LIMIT 1 queries
+            images = list(self.images.all())
+            return next((image for image in images if image.is_main), None) or (
+                images[0] if images else None
+            )
         return self.images.filter(is_main=True).first() or self.images.first()
 
+    def get_card(self):
+        """Return the listing-card projection, or None if not built yet."""
+        try:
+            return self.card
+        except PropertyCard.DoesNotExist:
+            return None
+
     @property
     def location_display(self) -> str:
         """Return formatted location string."""
@@ -318,6 +370,14 @@ class PropertyImage(BaseModel):
     caption = models.CharField(max_length=255, blank=True)
     is_main = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
+    renditions = models.JSONField(
+        default=dict, blank=True, editable=False, help_text="Generated renditions (see apps.common.renditions)"
+    )
+    # Filled in with the renditions
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    dominant_color = models.CharField(max_length=7, blank=True, editable=False, help_text="#rrggbb")
+    placeholder = models.TextField(blank=True, editable=False, help_text="Tiny base64 data URI preview")
 
     def get_image_url(self):
         """Return the image URL, whether from upload or external."""
@@ -325,19 +385,10 @@ class PropertyImage(BaseModel):
             return self.image.url
         return self.image_url or ""
 
-    # Auto-generated thumbnails
-    thumbnail = ImageSpecField(
-        source="image",
-        processors=[ResizeToFill(400, 300)],
-        format="JPEG",
-        options={"quality": 85},
-    )
-    large = ImageSpecField(
-        source="image",
-        processors=[ResizeToFit(1200, 900)],
-        format="JPEG",
-        options={"quality": 90},
-    )
+    def renditions_ready(self):
+        """Called once new renditions are stored."""
+        PropertyCard.refresh_images(self.property_id)
+        invalidate("properties")
 
     class Meta:
         verbose_name = "Property Image"
@@ -356,6 +407,278 @@ class PropertyImage(BaseModel):
         super().save(*args, **kwargs)
 
 
+class PropertyCard(TimeStampedModel):
+    """
+    Denormalized listing-card data for a property.
+
+    Kept current by the signals in ``apps.properties.signals`` so list
+    endpoints can ``select_related("card")`` instead of querying images
+    and agents per row.
+    """
+
+    property = models.OneToOneField(
+        Property,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="card",
+    )
+    main_image = models.ForeignKey(
+        PropertyImage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    image_url = models.CharField(max_length=500, blank=True, help_text="Original main image URL")
+    thumbnail_url = models.CharField(max_length=500, blank=True)
+    renditions = models.JSONField(default=dict, blank=True, help_text="Main image renditions")
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_color = models.CharField(max_length=7, blank=True)
+    image_placeholder = models.TextField(blank=True)
+    agent_name = models.CharField(max_length=255, blank=True)
+    location_display = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        verbose_name = "Property Card"
+        verbose_name_plural = "Property Cards"
+
+    def __str__(self):
+        return f"Card for {self.property_id}"
+
+    @staticmethod
+    def build_values(property_obj) -> dict:
+        """Compute the card fields for a property."""
+        image = property_obj.main_image
+        image_url = thumbnail_url = ""
+        renditions = {}
+        if image is not None:
+            image_url = image.get_image_url()
+            renditions = current_renditions(image)
+            # The original until the renditions are generated
+            thumbnail_url = rendition_url(renditions, "thumbnail") or image_url
+        metadata = image_metadata(renditions)
+        return {
+            "main_image": image,
+            "image_url": image_url,
+            "thumbnail_url": thumbnail_url,
+            "renditions": renditions,
+            "image_width": metadata["width"],
+            "image_height": metadata["height"],
+            "image_color": metadata["dominant_color"],
+            "image_placeholder": metadata["placeholder"],
+            "agent_name": property_obj.agent.full_name,
+            "location_display": property_obj.location_display,
+        }
+
+    @classmethod
+    def refresh(cls, property_obj):
+        """Create or update the card for a property."""
+        card, _ = cls.objects.update_or_create(
+            property=property_obj, defaults=cls.build_values(property_obj)
+        )
+        return card
+
+    @classmethod
+    def refresh_images(cls, property_id):
+        """Update the image fields of an existing card (no-op if missing)."""
+        property_obj = Property.objects.filter(pk=property_id).select_related("agent").first()
+        if property_obj is None:
+            return
+        values = cls.build_values(property_obj)
+        cls.objects.filter(property_id=property_id).update(
+            main_image=values["main_image"],
+            image_url=values["image_url"],
+            thumbnail_url=values["thumbnail_url"],
+            renditions=values["renditions"],
+            image_width=values["image_width"],
+            image_height=values["image_height"],
+            image_color=values["image_color"],
+            image_placeholder=values["image_placeholder"],
+            updated_at=timezone.now(),
+        )
+
+
+class ListingCount(TimeStampedModel):
+    """
+    Active listing counts per (city, state) and per Location, overall
+    (``listing_type=""``) and per listing type.
+
+    Maintained incrementally by the Property signals from the state each
+    instance was loaded with; ``reconcile_listing_counts`` rebuilds it.
+    """
+
+    class Scope(models.TextChoices):
+        CITY = "city", "City"
+        LOCATION = "location", "Location"
+
+    # Fields that decide which counts a property contributes to
+    TRACKED_FIELDS = ("status", "city", "state", "location_id", "listing_type")
+
+    scope = models.CharField(max_length=10, choices=Scope.choices)
+    key = models.CharField(max_length=255, help_text='"city|state" or the location id')
+    listing_type = models.CharField(
+        max_length=10, choices=ListingType.choices, blank=True, help_text="Empty for all types"
+    )
+    city = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=100, blank=True)
+    location = models.ForeignKey(
+        "common.Location",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="listing_counts",
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Listing Count"
+        verbose_name_plural = "Listing Counts"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "key", "listing_type"], name="unique_listing_count"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key}:{self.listing_type or 'all'} = {self.count}"
+
+    @classmethod
+    def snapshot(cls, property_obj):
+        """Return the tracked field values of a property instance."""
+        return tuple(getattr(property_obj, name) for name in cls.TRACKED_FIELDS)
+
+    @classmethod
+    def keys_for(cls, snapshot) -> set:
+        """Return the count rows a property state contributes to."""
+        if snapshot is None:
+            return set()
+        status, city, state, location_id, listing_type = snapshot
+        if status != PropertyStatus.ACTIVE:
+            return set()
+        keys = set()
+        for kind in ("", listing_type):
+            keys.add((cls.Scope.CITY, f"{city}|{state}", kind, city, state, None))
+            if location_id:
+                keys.add((cls.Scope.LOCATION, str(location_id), kind, "", "", location_id))
+        return keys
+
+    @classmethod
+    def apply_change(cls, old_snapshot, new_snapshot) -> None:
+        """Move a property's contribution from one state to another."""
+        old_keys, new_keys = cls.keys_for(old_snapshot), cls.keys_for(new_snapshot)
+        for keys, delta in ((old_keys - new_keys, -1), (new_keys - old_keys, 1)):
+            for scope, key, listing_type, city, state, location_id in keys:
+                rows = cls.objects.filter(scope=scope, key=key, listing_type=listing_type)
+                if rows.update(count=models.F("count") + delta, updated_at=timezone.now()):
+                    continue
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(
+                            scope=scope,
+                            key=key,
+                            listing_type=listing_type,
+                            city=city,
+                            state=state,
+                            location_id=location_id,
+                            count=max(delta, 0),
+                        )
+                except IntegrityError:
+                    # Created concurrently
+                    rows.update(count=models.F("count") + delta, updated_at=timezone.now())
+
+    @classmethod
+    def recount(cls, keys) -> None:
+        """Set the given count rows to their exact values."""
+        for scope, key, listing_type, city, state, location_id in keys:
+            active = Property.objects.filter(status=PropertyStatus.ACTIVE)
+            if listing_type:
+                active = active.filter(listing_type=listing_type)
+            if scope == cls.Scope.CITY:
+                active = active.filter(city=city, state=state)
+            else:
+                active = active.filter(location_id=location_id)
+            cls.objects.update_or_create(
+                scope=scope,
+                key=key,
+                listing_type=listing_type,
+                defaults={
+                    "city": city,
+                    "state": state,
+                    "location_id": location_id,
+                    "count": active.count(),
+                },
+            )
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """Recompute every count from the properties table."""
+        active = Property.objects.filter(status=PropertyStatus.ACTIVE).order_by()
+        rows = []
+        for listing_type in ("", *ListingType.values):
+            subset = active.filter(listing_type=listing_type) if listing_type else active
+            for row in subset.values("city", "state").annotate(total=models.Count("id")):
+                rows.append(
+                    cls(
+                        scope=cls.Scope.CITY,
+                        key=f"{row['city']}|{row['state']}",
+                        listing_type=listing_type,
+                        city=row["city"],
+                        state=row["state"],
+                        count=row["total"],
+                    )
+                )
+            grouped = subset.filter(location__isnull=False).values("location_id")
+            for row in grouped.annotate(total=models.Count("id")):
+                rows.append(
+                    cls(
+                        scope=cls.Scope.LOCATION,
+                        key=str(row["location_id"]),
+                        listing_type=listing_type,
+                        location_id=row["location_id"],
+                        count=row["total"],
+                    )
+                )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+
+class SimilarProperty(models.Model):
+    """
+    Precomputed nearest neighbours of an active property.
+
+    Built by the ``build_similar_properties`` command (see
+    ``apps.properties.similarity``).
+    """
+
+    property = models.ForeignKey(
+        Property,
+        on_delete=models.CASCADE,
+        related_name="similar_entries",
+    )
+    similar = models.ForeignKey(
+        Property,
+        on_delete=models.CASCADE,
+        related_name="similar_to_entries",
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField(help_text="Cosine similarity of the feature vectors")
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Similar Property"
+        verbose_name_plural = "Similar Properties"
+        ordering = ["property", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["property", "rank"], name="unique_similar_property_rank"),
+        ]
+
+    def __str__(self):
+        return f"{self.property_id} #{self.rank}: {self.similar_id}"
+
+
 class SavedProperty(BaseModel):
     """
     Saved/favorited properties by users.
@@ -380,3 +703,114 @@ class SavedProperty(BaseModel):
 
     def __str__(self):
         return f"{self.user.email} saved {self.property.title}"
+
+    @staticmethod
+    def ids_cache_key(user_id) -> str:
+        return f"saved_property_ids:{user_id}"
+
+    @classmethod
+    def property_ids_for(cls, user) -> frozenset:
+        """
+        Return the ids of the properties a user has saved.
+
+        The set is cached per user and dropped by the SavedProperty signals,
+        so marking a whole page as saved/unsaved costs at most one query.
+        """
+        if not user.is_authenticated:
+            return frozenset()
+        key = cls.ids_cache_key(user.pk)
+        ids = cache.get(key)
+        if ids is None:
+            ids = frozenset(cls.objects.filter(user=user).values_list("property_id", flat=True))
+            cache.set(key, ids, SAVED_IDS_CACHE_TIMEOUT)
+        return ids
+
+
+class SavedSearch(BaseModel):
+    """
+    A user's saved property search (``PropertyFilter`` parameters).
+
+    New listings are matched against it through the ``SavedSearchTerm``
+    inverted index (see ``apps.properties.saved_searches``).
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="saved_searches",
+    )
+    name = models.CharField(max_length=100, blank=True)
+    query = models.JSONField(default=dict, blank=True, help_text="Normalized PropertyFilter parameters")
+    is_active = models.BooleanField(default=True, help_text="Inactive searches are not matched")
+
+    class Meta:
+        verbose_name = "Saved Search"
+        verbose_name_plural = "Saved Searches"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.user.email}: {self.name or self.query}"
+
+
+class SavedSearchTerm(models.Model):
+    """
+    Inverted index entry: a saved search accepts ``value`` for ``dimension``.
+
+    Every active search has at least one term per dimension; ``"*"`` means
+    the search does not restrict that dimension.
+    """
+
+    search = models.ForeignKey(
+        SavedSearch,
+        on_delete=models.CASCADE,
+        related_name="terms",
+    )
+    dimension = models.CharField(max_length=20)
+    value = models.CharField(max_length=100)
+
+    class Meta:
+        verbose_name = "Saved Search Term"
+        verbose_name_plural = "Saved Search Terms"
+        indexes = [
+            models.Index(fields=["dimension", "value"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["search", "dimension", "value"], name="unique_saved_search_term"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.value}"
+
+
+class SavedSearchMatch(BaseModel):
+    """
+    A listing that matched a saved search, pending or sent notification.
+    """
+
+    search = models.ForeignKey(
+        SavedSearch,
+        on_delete=models.CASCADE,
+        related_name="matches",
+    )
+    property = models.ForeignKey(
+        Property,
+        on_delete=models.CASCADE,
+        related_name="saved_search_matches",
+    )
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Saved Search Match"
+        verbose_name_plural = "Saved Search Matches"
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["search", "property"], name="unique_saved_search_match"),
+        ]
+        indexes = [
+            models.Index(fields=["notified_at", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.search_id} -> {self.property_id}"
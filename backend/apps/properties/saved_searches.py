@@ -0,0 +1,183 @@
+"""
+Saved-search indexing and new-listing matching.
+
+Each saved search is indexed as ``SavedSearchTerm`` rows: for every
+dimension (city, property type, listing type, price band, bedrooms) the
+values it accepts, or ``"*"`` when it does not restrict the dimension.
+Ranges (price, bedrooms) expand to the bands they overlap.
+
+A listing has exactly one value per dimension, so the candidate searches
+for it are those with a term matching ``(dimension, value)`` or
+``(dimension, "*")`` in *every* dimension: one grouped query over the
+term index instead of evaluating every saved search. Candidates are then
+confirmed with the full ``PropertyFilter`` (text search, area, flags,
+exact price bounds...) before a ``SavedSearchMatch`` is recorded.
+"""
+
+import logging
+import math
+
+from django.db.models import Count, Q
+from django.http import QueryDict
+
+from apps.common.cache import PAGINATION_PARAMS
+
+from .filters import PropertyFilter
+from .models import Property, PropertyStatus, SavedSearch, SavedSearchMatch, SavedSearchTerm
+
+logger = logging.getLogger(__name__)
+
+ANY = "*"
+DIMENSIONS = ("city", "property_type", "listing_type", "price_band", "bedrooms")
+# Parameters that are not part of a saved search
+IGNORED_PARAMS = PAGINATION_PARAMS | {"ordering", "status", "format"}
+
+# Price bands double in width: band n covers [2**n, 2**(n + 1)) USD
+MAX_PRICE_BAND = 30
+# Bedroom bands; the last one is open-ended ("5+")
+MAX_BEDROOM_BAND = 5
+
+
+def price_band(price) -> int:
+    return min(int(math.log2(max(float(price), 1.0))), MAX_PRICE_BAND)
+
+
+def bedroom_band(bedrooms) -> int:
+    return min(int(bedrooms), MAX_BEDROOM_BAND)
+
+
+def _value(query: dict, name: str):
+    value = query.get(name)
+    return value[0] if isinstance(value, list) else value
+
+
+def _number(query: dict, name: str):
+    value = _value(query, name)
+    return None if value in (None, "") else float(value)
+
+
+def _range_terms(low, high, band, max_band) -> list:
+    if low is None and high is None:
+        return [ANY]
+    first = band(low) if low is not None else 0
+    last = band(high) if high is not None else max_band
+    return [str(value) for value in range(first, last + 1)]
+
+
+def search_terms(query: dict) -> list:
+    """
+    Return the ``(dimension, value)`` index terms of a saved search query.
+    """
+    city = _value(query, "city")
+    terms = [
+        ("city", city.strip().lower() if city else ANY),
+        ("property_type", _value(query, "property_type") or ANY),
+        ("listing_type", _value(query, "listing_type") or ANY),
+    ]
+    min_price, max_price = _number(query, "min_price"), _number(query, "max_price")
+    terms += [
+        ("price_band", value)
+        for value in _range_terms(
+            max(min_price, 0) if min_price is not None else None,
+            max_price,
+            price_band,
+            MAX_PRICE_BAND,
+        )
+    ]
+    min_bedrooms, max_bedrooms = _number(query, "min_bedrooms"), _number(query, "max_bedrooms")
+    terms += [
+        ("bedrooms", value)
+        for value in _range_terms(
+            max(math.ceil(min_bedrooms), 0) if min_bedrooms is not None else None,
+            math.floor(max_bedrooms) if max_bedrooms is not None else None,
+            bedroom_band,
+            MAX_BEDROOM_BAND,
+        )
+    ]
+    return terms
+
+
+def property_terms(property_obj) -> list:
+    """
+    Return the ``(dimension, value)`` pairs describing a listing.
+    """
+    return [
+        ("city", property_obj.city.strip().lower()),
+        ("property_type", property_obj.property_type),
+        ("listing_type", property_obj.listing_type),
+        ("price_band", str(price_band(property_obj.price))),
+        ("bedrooms", str(bedroom_band(property_obj.bedrooms))),
+    ]
+
+
+def query_dict(query: dict) -> QueryDict:
+    """
+    Turn a stored query back into request-style parameters.
+    """
+    params = QueryDict(mutable=True)
+    for name, value in query.items():
+        params.setlist(name, value if isinstance(value, list) else [value])
+    return params
+
+
+def index_search(search: SavedSearch) -> None:
+    """
+    Rebuild the index terms of a saved search.
+    """
+    SavedSearchTerm.objects.filter(search=search).delete()
+    if not search.is_active:
+        return
+    # An empty range (min above max) yields no band: the search can never match
+    SavedSearchTerm.objects.bulk_create(
+        [
+            SavedSearchTerm(search=search, dimension=dimension, value=value)
+            for dimension, value in dict.fromkeys(search_terms(search.query))
+        ]
+    )
+
+
+def candidate_search_ids(property_obj) -> list:
+    """
+    Return the ids of saved searches whose indexed predicates accept a listing.
+    """
+    condition = Q()
+    for dimension, value in property_terms(property_obj):
+        condition |= Q(dimension=dimension, value__in=[value, ANY])
+    return list(
+        SavedSearchTerm.objects.filter(condition)
+        .values("search_id")
+        .annotate(dimensions=Count("dimension", distinct=True))
+        .filter(dimensions=len(DIMENSIONS))
+        .values_list("search_id", flat=True)
+    )
+
+
+def match_property(property_id) -> int:
+    """
+    Record matches between an active listing and the saved searches it
+    satisfies; returns the number of new matches.
+    """
+    property_obj = Property.objects.filter(pk=property_id, status=PropertyStatus.ACTIVE).first()
+    if property_obj is None:
+        return 0
+
+    candidates = SavedSearch.objects.filter(
+        pk__in=candidate_search_ids(property_obj), is_active=True
+    ).exclude(user_id=property_obj.agent_id)
+    already_matched = set(
+        SavedSearchMatch.objects.filter(property=property_obj).values_list("search_id", flat=True)
+    )
+    matches = []
+    for search in candidates:
+        if search.pk in already_matched:
+            continue
+        filterset = PropertyFilter(
+            data=query_dict(search.query), queryset=Property.objects.filter(pk=property_obj.pk)
+        )
+        if filterset.is_valid() and filterset.qs.exists():
+            matches.append(SavedSearchMatch(search=search, property=property_obj))
+
+    SavedSearchMatch.objects.bulk_create(matches, ignore_conflicts=True)
+    if matches:
+        logger.info("Listing %s matched %d saved searches", property_obj.pk, len(matches))
+    return len(matches)
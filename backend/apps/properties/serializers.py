@@ -5,8 +5,12 @@ Serializers for the properties app.
 from rest_framework import serializers
 
 from apps.accounts.serializers import AgentPublicSerializer
+from apps.common.renditions import current_renditions, image_metadata, rendition_url, srcset
+from apps.common.serializers import DistanceField, SearchHighlightField
 
-from .models import Property, PropertyImage, SavedProperty
+from .filters import PropertyFilter
+from .models import Property, PropertyImage, SavedProperty, SavedSearch
+from .saved_searches import IGNORED_PARAMS, query_dict
 
 
 class PropertyImageSerializer(serializers.ModelSerializer):
@@ -18,6 +22,7 @@ class PropertyImageSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
     thumbnail_url = serializers.SerializerMethodField()
     large_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = PropertyImage
@@ -28,42 +33,95 @@ class PropertyImageSerializer(serializers.ModelSerializer):
             "image_url",
             "thumbnail_url",
             "large_url",
+            "srcset",
+            "width",
+            "height",
+            "dominant_color",
+            "placeholder",
             "caption",
             "is_main",
             "order",
         ]
-        read_only_fields = ["id", "url", "thumbnail_url", "large_url"]
+        read_only_fields = [
+            "id",
+            "url",
+            "thumbnail_url",
+            "large_url",
+            "srcset",
+            "width",
+            "height",
+            "dominant_color",
+            "placeholder",
+        ]
+
+    def _absolute(self, url):
+        request = self.context.get("request")
+        if request and url:
+            return request.build_absolute_uri(url)
+        return url
 
     def get_url(self, obj):
         """Return the primary image URL (uploaded or external)."""
         if obj.image:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
+            return self._absolute(obj.image.url)
         return obj.image_url or None
 
+    def _rendition_url(self, obj, name):
+        # External URLs and not-yet-rendered uploads are served as-is
+        url = rendition_url(current_renditions(obj), name)
+        if url:
+            return self._absolute(url)
+        return self.get_url(obj)
+
     def get_thumbnail_url(self, obj):
-        # For external URLs, return the URL directly (no thumbnail processing)
-        if obj.image_url and not obj.image:
-            return obj.image_url
-        if obj.image and obj.thumbnail:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.thumbnail.url)
-            return obj.thumbnail.url
-        return None
+        return self._rendition_url(obj, "thumbnail")
 
     def get_large_url(self, obj):
-        # For external URLs, return the URL directly
-        if obj.image_url and not obj.image:
-            return obj.image_url
-        if obj.image and obj.large:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.large.url)
-            return obj.large.url
-        return None
+        return self._rendition_url(obj, "large")
+
+    def get_srcset(self, obj):
+        return srcset(current_renditions(obj), self._absolute)
+
+
+class IsSavedField(serializers.Field):
+    """
+    Whether the requesting user saved the property.
+
+    Resolved against the user's cached set of saved ids, loaded once per
+    serialization and shared through the root context.
+    """
+
+    context_key = "saved_property_ids"
+
+    def __init__(self, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        return obj.pk in saved_ids_from_context(self.context)
+
+
+def saved_ids_from_context(context) -> frozenset:
+    """
+    Return (and memoize in ``context``) the request user's saved property ids.
+    """
+    if IsSavedField.context_key not in context:
+        request = context.get("request")
+        user = getattr(request, "user", None)
+        context[IsSavedField.context_key] = (
+            SavedProperty.property_ids_for(user) if user is not None else frozenset()
+        )
+    return context[IsSavedField.context_key]
+
+
+def mark_saved(rows, request) -> list:
+    """
+    Set ``is_saved`` for the request user on serialized rows shared between
+    users (e.g. cached featured listings).
+    """
+    saved = {str(pk) for pk in saved_ids_from_context({"request": request})}
+    return [{**row, "is_saved": str(row["id"]) in saved} for row in rows]
 
 
 class PropertyListSerializer(serializers.ModelSerializer):
@@ -72,8 +130,13 @@ class PropertyListSerializer(serializers.ModelSerializer):
     """
 
     main_image = serializers.SerializerMethodField()
+    main_image_srcset = serializers.SerializerMethodField()
+    main_image_meta = serializers.SerializerMethodField()
     location_display = serializers.CharField(read_only=True)
-    agent_name = serializers.CharField(source="agent.full_name", read_only=True)
+    agent_name = serializers.SerializerMethodField()
+    search_highlight = SearchHighlightField()
+    distance = DistanceField()
+    is_saved = IsSavedField()
 
     class Meta:
         model = Property
@@ -92,32 +155,72 @@ class PropertyListSerializer(serializers.ModelSerializer):
             "state",
             "location_display",
             "main_image",
+            "main_image_srcset",
+            "main_image_meta",
             "agent_name",
             "is_featured",
             "is_beachfront",
             "is_investment_opportunity",
+            "search_highlight",
+            "distance",
+            "is_saved",
             "created_at",
         ]
 
+    def get_agent_name(self, obj):
+        card = obj.get_card()
+        if card is not None and card.agent_name:
+            return card.agent_name
+        return obj.agent.full_name
+
     def get_main_image(self, obj):
+        # Served from the denormalized card (select_related) when available
+        card = obj.get_card()
+        if card is not None:
+            if not card.thumbnail_url:
+                return None
+            request = self.context.get("request")
+            if request and not card.thumbnail_url.startswith(("http://", "https://")):
+                return request.build_absolute_uri(card.thumbnail_url)
+            return card.thumbnail_url
+
         main_img = obj.main_image
         if main_img:
-            # Check for external URL first
-            if main_img.image_url and not main_img.image:
-                return main_img.image_url
-            # Then check for uploaded image thumbnail
+            # The original until its renditions are generated
+            url = rendition_url(current_renditions(main_img), "thumbnail") or main_img.get_image_url()
             request = self.context.get("request")
-            if main_img.image:
-                if main_img.thumbnail:
-                    if request:
-                        return request.build_absolute_uri(main_img.thumbnail.url)
-                    return main_img.thumbnail.url
-                # Fallback to original image
-                if request:
-                    return request.build_absolute_uri(main_img.image.url)
-                return main_img.image.url
+            if request and main_img.image:
+                return request.build_absolute_uri(url)
+            return url or None
         return None
 
+    def get_main_image_srcset(self, obj):
+        card = obj.get_card()
+        if card is not None:
+            renditions = card.renditions
+        else:
+            main_img = obj.main_image
+            renditions = current_renditions(main_img) if main_img else {}
+        request = self.context.get("request")
+        return srcset(renditions, request.build_absolute_uri if request else None)
+
+    def get_main_image_meta(self, obj):
+        """Intrinsic size, dominant colour and inline placeholder, or None."""
+        card = obj.get_card()
+        if card is not None:
+            if card.image_width is None:
+                return None
+            return {
+                "width": card.image_width,
+                "height": card.image_height,
+                "dominant_color": card.image_color,
+                "placeholder": card.image_placeholder,
+            }
+        main_img = obj.main_image
+        if main_img is None or not current_renditions(main_img):
+            return None
+        return image_metadata(main_img.renditions)
+
 
 class PropertyDetailSerializer(serializers.ModelSerializer):
     """
@@ -127,7 +230,7 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
     images = PropertyImageSerializer(many=True, read_only=True)
     agent = AgentPublicSerializer(read_only=True)
     location_display = serializers.CharField(read_only=True)
-    is_saved = serializers.SerializerMethodField()
+    is_saved = IsSavedField()
 
     class Meta:
         model = Property
@@ -169,14 +272,6 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
-    def get_is_saved(self, obj):
-        request = self.context.get("request")
-        if request and request.user.is_authenticated:
-            return SavedProperty.objects.filter(
-                user=request.user, property=obj
-            ).exists()
-        return False
-
 
 class PropertyCreateUpdateSerializer(serializers.ModelSerializer):
     """
@@ -245,3 +340,40 @@ class SavedPropertySerializer(serializers.ModelSerializer):
         model = SavedProperty
         fields = ["id", "property", "created_at"]
         read_only_fields = ["id", "created_at"]
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for saved searches.
+    """
+
+    match_count = serializers.IntegerField(read_only=True, default=0)
+
+    class Meta:
+        model = SavedSearch
+        fields = ["id", "name", "query", "is_active", "match_count", "created_at", "updated_at"]
+        read_only_fields = ["id", "created_at", "updated_at"]
+
+    def validate_query(self, value):
+        """Keep the known PropertyFilter parameters and check they are valid."""
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Expected an object of filter parameters.")
+        unknown = sorted(set(value) - set(PropertyFilter.base_filters) - IGNORED_PARAMS)
+        if unknown:
+            raise serializers.ValidationError(f"Unknown filters: {', '.join(unknown)}")
+
+        query = {}
+        for name in sorted(value):
+            if name in IGNORED_PARAMS:
+                continue
+            values = value[name] if isinstance(value[name], list) else [value[name]]
+            values = [str(item).strip() for item in values if str(item).strip()]
+            if values:
+                query[name] = values if len(values) > 1 else values[0]
+
+        filterset = PropertyFilter(data=query_dict(query), queryset=Property.objects.none())
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        # Method filters (bbox, near...) parse their values when applied
+        filterset.qs
+        return query
@@ -0,0 +1,130 @@
+"""
+Signal handlers for the properties app.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common.cache import invalidate
+from apps.common.renditions import needs_renditions, release_renditions, schedule_renditions
+
+from .models import (
+    ListingCount,
+    Property,
+    PropertyCard,
+    PropertyImage,
+    PropertyStatus,
+    SavedProperty,
+    SavedSearch,
+)
+from .saved_searches import index_search, match_property
+
+# Fields that feed the denormalized listing card
+CARD_FIELDS = {"agent", "city", "state"}
+AGENT_NAME_FIELDS = {"first_name", "last_name", "email"}
+
+
+@receiver(post_save, sender=Property)
+def refresh_card_on_property_save(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if not created and update_fields is not None and not CARD_FIELDS & set(update_fields):
+        return
+    PropertyCard.refresh(instance)
+
+
+@receiver(post_save, sender=Property)
+def match_saved_searches_on_activation(sender, instance, created=False, raw=False, **kwargs):
+    # Registered before update_listing_counts_on_save, which replaces the snapshot
+    if raw or instance.status != PropertyStatus.ACTIVE:
+        return
+    # Previous state unknown: match anyway, matches are unique per listing
+    snapshot = getattr(instance, "_listing_snapshot", None)
+    if not created and snapshot is not None and snapshot[0] == PropertyStatus.ACTIVE:
+        return
+    property_id = instance.pk
+    transaction.on_commit(lambda: match_property(property_id))
+
+
+@receiver(post_save, sender=Property)
+def update_listing_counts_on_save(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    new = ListingCount.snapshot(instance)
+    if created:
+        ListingCount.apply_change(None, new)
+    elif hasattr(instance, "_listing_snapshot"):
+        ListingCount.apply_change(instance._listing_snapshot, new)
+    else:
+        # Not loaded from the database: previous state unknown
+        ListingCount.recount(ListingCount.keys_for(new))
+    instance._listing_snapshot = new
+
+
+@receiver(post_delete, sender=Property)
+def update_listing_counts_on_delete(sender, instance, **kwargs):
+    old = getattr(instance, "_listing_snapshot", None) or ListingCount.snapshot(instance)
+    ListingCount.apply_change(old, None)
+
+
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def refresh_card_on_image_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Update-only: during a cascade delete the card may already be gone
+    PropertyCard.refresh_images(instance.property_id)
+
+
+@receiver(post_save, sender=PropertyImage)
+def schedule_image_renditions(sender, instance, raw=False, **kwargs):
+    if raw or not needs_renditions(instance):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: schedule_renditions(PropertyImage, pk))
+
+
+@receiver(post_delete, sender=PropertyImage)
+def delete_image_renditions(sender, instance, **kwargs):
+    renditions = instance.renditions
+    if renditions:
+        transaction.on_commit(lambda: release_renditions(PropertyImage, renditions))
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def invalidate_property_caches(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate("properties")
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def refresh_cards_on_agent_save(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and not AGENT_NAME_FIELDS & set(update_fields):
+        return
+    PropertyCard.objects.filter(property__agent=instance).exclude(
+        agent_name=instance.full_name
+    ).update(agent_name=instance.full_name)
+
+
+@receiver(post_save, sender=SavedProperty)
+@receiver(post_delete, sender=SavedProperty)
+def drop_saved_ids_cache(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    key = SavedProperty.ids_cache_key(instance.user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+@receiver(post_save, sender=SavedSearch)
+def index_saved_search(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_search(instance)
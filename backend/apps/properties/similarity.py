@@ -0,0 +1,256 @@
+"""
+Similar-property index.
+
+Active properties are embedded as numeric float32 feature vectors (price,
+size, rooms, type, amenities, coordinates and flags), L2-normalized so a
+dot product is the cosine similarity, and compared with NumPy in blocks of
+rows sized to a memory budget. The top-k neighbours of each property are
+stored in ``SimilarProperty``.
+
+Incremental refreshes recompute only the properties that changed since
+their neighbours were computed, plus the unchanged properties whose lists
+a changed or removed listing enters or leaves.
+"""
+
+import math
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import ListingType, Property, PropertyStatus, PropertyType, SimilarProperty
+
+DEFAULT_TOP_K = 12
+# Bytes of scores (plus partition indices) held per block of rows
+DEFAULT_BLOCK_MEMORY = 64 * 1024 * 1024
+
+# Relative importance of each feature group in the cosine similarity
+WEIGHTS = {
+    "listing_type": 3.0,
+    "price": 2.0,
+    "size": 1.0,
+    "rooms": 1.0,
+    "property_type": 1.5,
+    "features": 1.0,
+    "geo": 1.5,
+    "flags": 0.5,
+}
+FLAGS = ("is_beachfront", "is_new_construction", "is_investment_opportunity")
+VALUE_FIELDS = (
+    "id",
+    "updated_at",
+    "price",
+    "area_sqm",
+    "bedrooms",
+    "bathrooms",
+    "property_type",
+    "listing_type",
+    "features",
+    "latitude",
+    "longitude",
+    *FLAGS,
+)
+
+
+def _standardize(column: np.ndarray) -> np.ndarray:
+    """Z-score a column, imputing missing values (NaN) with the mean."""
+    mask = np.isnan(column)
+    if mask.all():
+        return np.zeros_like(column)
+    mean = np.nanmean(column)
+    std = np.nanstd(column) or 1.0
+    column = np.where(mask, mean, column)
+    return (column - mean) / std
+
+
+def _one_hot(values, vocabulary) -> np.ndarray:
+    index = {value: i for i, value in enumerate(vocabulary)}
+    matrix = np.zeros((len(values), len(vocabulary)))
+    for row, value in enumerate(values):
+        if value in index:
+            matrix[row, index[value]] = 1.0
+    return matrix
+
+
+def _float(value) -> float:
+    return math.nan if value is None else float(value)
+
+
+def build_vectors(rows: list) -> np.ndarray:
+    """
+    Turn property value dicts into L2-normalized feature vectors.
+    """
+    if not rows:
+        return np.zeros((0, 0))
+
+    price = np.array([math.log1p(_float(row["price"])) for row in rows])
+    area = np.array([math.log1p(float(row["area_sqm"])) if row["area_sqm"] else math.nan for row in rows])
+    bedrooms = np.array([_float(row["bedrooms"]) for row in rows])
+    bathrooms = np.array([_float(row["bathrooms"]) for row in rows])
+    latitude = np.array([_float(row["latitude"]) for row in rows])
+    longitude = np.array([_float(row["longitude"]) for row in rows])
+
+    vocabulary = sorted(
+        {str(feature).strip().lower() for row in rows for feature in (row["features"] or [])}
+    )
+    amenities = np.zeros((len(rows), len(vocabulary)))
+    feature_index = {feature: i for i, feature in enumerate(vocabulary)}
+    for row_index, row in enumerate(rows):
+        for feature in row["features"] or []:
+            amenities[row_index, feature_index[str(feature).strip().lower()]] = 1.0
+    # Rows with many amenities should not dominate the dot product
+    amenities /= np.sqrt(np.maximum(amenities.sum(axis=1, keepdims=True), 1.0))
+
+    # Prices are only comparable within a listing type
+    price_columns = []
+    for listing_type in ListingType.values:
+        mask = np.array([row["listing_type"] == listing_type for row in rows])
+        price_columns.append(np.where(mask, _standardize(np.where(mask, price, np.nan)), 0.0))
+
+    groups = [
+        WEIGHTS["listing_type"] * _one_hot([row["listing_type"] for row in rows], ListingType.values),
+        WEIGHTS["price"] * np.column_stack(price_columns),
+        WEIGHTS["size"] * _standardize(area)[:, None],
+        WEIGHTS["rooms"] * np.column_stack([_standardize(bedrooms), _standardize(bathrooms)]),
+        WEIGHTS["property_type"] * _one_hot([row["property_type"] for row in rows], PropertyType.values),
+        WEIGHTS["features"] * amenities,
+        WEIGHTS["geo"] * np.column_stack([_standardize(latitude), _standardize(longitude)]),
+        WEIGHTS["flags"] * np.array([[float(row[flag]) for flag in FLAGS] for row in rows]),
+    ]
+    vectors = np.hstack(groups)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1.0, norms)).astype(np.float32)
+
+
+def block_rows(columns: int, itemsize: int, block_memory: int = DEFAULT_BLOCK_MEMORY) -> int:
+    """
+    Return how many rows of a ``rows x columns`` score matrix fit in
+    ``block_memory``, counting the intp indices ``argpartition`` returns.
+    """
+    per_row = max(columns, 1) * (itemsize + np.dtype(np.intp).itemsize)
+    return max(1, block_memory // per_row)
+
+
+def top_k(vectors: np.ndarray, rows: np.ndarray, k: int, block_size: int | None = None):
+    """
+    Yield ``(row, neighbour_indices, scores)`` for the given row indices,
+    computing similarities against all vectors one block at a time.
+    """
+    k = min(k, len(vectors) - 1)
+    if k <= 0:
+        return
+    block_size = block_size or block_rows(len(vectors), vectors.itemsize)
+    for start in range(0, len(rows), block_size):
+        block = rows[start : start + block_size]
+        scores = vectors[block] @ vectors.T
+        scores[np.arange(len(block)), block] = -np.inf
+        candidates = np.argpartition(scores, -k, axis=1)[:, -k:]
+        for offset, row in enumerate(block):
+            order = candidates[offset][np.argsort(scores[offset, candidates[offset]])[::-1]]
+            yield row, order, scores[offset, order]
+
+
+def _affected(vectors, ids, changed, stored, k, block_size) -> set:
+    """
+    Return indices of unchanged rows whose stored top-k a changed or
+    removed property enters or leaves.
+    """
+    index = {pk: i for i, pk in enumerate(ids)}
+    k = min(k, len(ids) - 1)
+    changed_ids = {ids[i] for i in changed}
+    unchanged = np.array([i for i in range(len(ids)) if i not in changed], dtype=int)
+    affected = set()
+
+    threshold = np.full(len(ids), -np.inf)
+    for property_id, neighbours in stored.items():
+        i = index.get(property_id)
+        if i is None:
+            continue
+        if len(neighbours) < k or any(
+            similar_id in changed_ids or similar_id not in index for similar_id, _score in neighbours
+        ):
+            affected.add(i)
+        else:
+            threshold[i] = min(score for _similar_id, score in neighbours)
+    for i in unchanged:
+        if ids[i] not in stored:
+            affected.add(int(i))
+
+    changed_vectors = vectors[np.array(sorted(changed), dtype=int)]
+    block_size = block_size or block_rows(len(changed_vectors), vectors.itemsize)
+    for start in range(0, len(unchanged), block_size):
+        block = unchanged[start : start + block_size]
+        best = (vectors[block] @ changed_vectors.T).max(axis=1)
+        affected.update(int(i) for i in block[best > threshold[block]])
+    return affected
+
+
+def refresh_similar_properties(
+    full: bool = False, k: int = DEFAULT_TOP_K, block_size: int | None = None
+) -> int:
+    """
+    Rebuild the similar-property table; returns how many properties had
+    their neighbours recomputed.
+
+    ``block_size`` (rows compared at once) defaults to what fits in
+    ``DEFAULT_BLOCK_MEMORY``.
+    """
+    rows = list(
+        Property.objects.filter(status=PropertyStatus.ACTIVE).order_by("pk").values(*VALUE_FIELDS)
+    )
+    ids = [row["id"] for row in rows]
+    computed = dict(
+        SimilarProperty.objects.order_by()
+        .values_list("property_id")
+        .annotate(latest=Max("computed_at"))
+    )
+    removed = set(computed) - set(ids)
+
+    if full:
+        changed = set(range(len(rows)))
+    else:
+        changed = {
+            i
+            for i, row in enumerate(rows)
+            if row["id"] not in computed or row["updated_at"] > computed[row["id"]]
+        }
+    if not changed and not removed:
+        return 0
+
+    vectors = build_vectors(rows)
+    recompute = set(changed)
+    if not full and len(changed) < len(rows):
+        stored = {}
+        for property_id, similar_id, score in SimilarProperty.objects.values_list(
+            "property_id", "similar_id", "score"
+        ):
+            stored.setdefault(property_id, []).append((similar_id, score))
+        if changed:
+            recompute |= _affected(vectors, ids, changed, stored, k, block_size)
+        else:
+            # Only removals: lists that referenced a removed property
+            index = {pk: i for i, pk in enumerate(ids)}
+            recompute |= {
+                index[pk]
+                for pk, neighbours in stored.items()
+                if pk in index and any(similar_id in removed for similar_id, _score in neighbours)
+            }
+
+    now = timezone.now()
+    entries = [
+        SimilarProperty(
+            property_id=ids[row],
+            similar_id=ids[neighbour],
+            rank=rank,
+            score=float(score),
+            computed_at=now,
+        )
+        for row, neighbours, scores in top_k(vectors, np.array(sorted(recompute), dtype=int), k, block_size)
+        for rank, (neighbour, score) in enumerate(zip(neighbours, scores), start=1)
+    ]
+    with transaction.atomic():
+        SimilarProperty.objects.filter(property_id__in=removed).delete()
+        SimilarProperty.objects.filter(property_id__in=[ids[i] for i in recompute]).delete()
+        SimilarProperty.objects.bulk_create(entries, batch_size=1000)
+    return len(recompute)
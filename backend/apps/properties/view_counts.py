@@ -0,0 +1,239 @@
+"""
+Buffered property view counting.
+
+Detail views record a view in the cache only; ``flush_view_counts`` (run
+periodically by the management command of the same name) applies the
+accumulated increments to ``Property.view_count`` in batched UPDATEs.
+
+With django-redis the buffer is a single Redis hash (``HINCRBY``), drained
+atomically with ``RENAME``; a crashed flush leaves it under
+``FLUSHING_KEY``, which is deleted only once its UPDATEs committed. Other
+shared caches (database, memcached...) use one counter key per property
+plus an index of pending ids, which only the first view of a property
+since the last flush updates, under a short lock; counters are only
+decremented once the UPDATEs committed. Either way a failed flush leaves
+its views to the next run.
+
+A flush holds ``FLUSH_LOCK_KEY`` from draining until its clean-up after
+commit, so overlapping runs (a slow flush and the next scheduled one)
+skip instead of applying the same views twice. A process-local cache such
+as LocMemCache only buffers views for its own process, so production
+deployments should use a shared cache.
+"""
+
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+
+from .models import Property
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = "property_views:pending"
+FLUSHING_KEY = "property_views:flushing"
+INDEX_KEY = "property_views:index"
+INDEX_LOCK_KEY = "property_views:index:lock"
+INDEX_LOCK_TIMEOUT = 5
+INDEX_LOCK_WAIT = 1.0
+INDEXED_PREFIX = "property_views:indexed"
+FLUSH_LOCK_KEY = "property_views:flush:lock"
+# Longer than any flush; a lock left by a killed run expires after it
+FLUSH_LOCK_TIMEOUT = 15 * 60
+COUNTER_PREFIX = "property_views:count"
+SEEN_PREFIX = "property_views:seen"
+FLUSH_BATCH_SIZE = 500
+
+
+def _redis():
+    """
+    Return the raw Redis client behind the default cache, or None.
+    """
+    try:
+        from django_redis import get_redis_connection
+        from django_redis.cache import RedisCache
+    except ImportError:
+        return None
+    from django.core.cache import caches
+
+    if not isinstance(caches["default"], RedisCache):
+        return None
+    return get_redis_connection("default")
+
+
+@contextmanager
+def _index_lock():
+    """
+    Hold the pending-index lock; yields False if it could not be taken.
+    """
+    deadline = time.monotonic() + INDEX_LOCK_WAIT
+    while not cache.add(INDEX_LOCK_KEY, 1, INDEX_LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            yield False
+            return
+        time.sleep(0.01)
+    try:
+        yield True
+    finally:
+        cache.delete(INDEX_LOCK_KEY)
+
+
+def client_fingerprint(request) -> str:
+    """
+    Identify the viewer for de-duplication (user id, else IP + user agent).
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        raw = f"user:{user.pk}"
+    else:
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+        ip = forwarded.split(",")[0].strip() if forwarded else request.META.get("REMOTE_ADDR", "")
+        raw = f"anon:{ip}:{request.META.get('HTTP_USER_AGENT', '')}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def record_view(property_id, fingerprint: str = "") -> bool:
+    """
+    Buffer one view of a property; returns False if it was de-duplicated.
+
+    Never touches the database.
+    """
+    window = getattr(settings, "VIEW_COUNT_DEDUPE_SECONDS", 0)
+    if window and fingerprint:
+        if not cache.add(f"{SEEN_PREFIX}:{property_id}:{fingerprint}", 1, timeout=window):
+            return False
+
+    redis = _redis()
+    if redis is not None:
+        redis.hincrby(BUFFER_KEY, str(property_id), 1)
+        return True
+
+    key = f"{COUNTER_PREFIX}:{property_id}"
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, 1, timeout=None)
+    # Only the first view since the last flush touches the shared index
+    indexed_key = f"{INDEXED_PREFIX}:{property_id}"
+    if cache.add(indexed_key, 1, timeout=None):
+        with _index_lock() as locked:
+            if locked:
+                pending = cache.get(INDEX_KEY) or set()
+                cache.set(INDEX_KEY, pending | {str(property_id)}, timeout=None)
+            else:
+                # Let a later view index it; the counter keeps this one
+                cache.delete(indexed_key)
+    return True
+
+
+def _drain_redis(redis) -> dict:
+    from redis.exceptions import ResponseError
+
+    # A FLUSHING_KEY left by a crashed flush is applied before taking new views
+    if not redis.exists(FLUSHING_KEY):
+        try:
+            redis.rename(BUFFER_KEY, FLUSHING_KEY)
+        except ResponseError:  # no pending views
+            return {}
+    return {key.decode(): int(value) for key, value in redis.hgetall(FLUSHING_KEY).items()}
+
+
+def _read_cache() -> tuple:
+    """
+    Return ``(pending ids, counts)`` without consuming anything.
+    """
+    with _index_lock() as locked:
+        pending = (cache.get(INDEX_KEY) or set()) if locked else set()
+    values = cache.get_many([f"{COUNTER_PREFIX}:{property_id}" for property_id in pending])
+    counts = {}
+    for property_id in pending:
+        value = values.get(f"{COUNTER_PREFIX}:{property_id}")
+        if value:
+            counts[property_id] = value
+    return pending, counts
+
+
+def _consume_cache(pending, counts) -> None:
+    """
+    Subtract applied counts and drop drained ids from the index.
+    """
+    # Before the counters, so views recorded meanwhile are re-indexed
+    cache.delete_many([f"{INDEXED_PREFIX}:{property_id}" for property_id in pending])
+    for property_id, value in counts.items():
+        # Subtract what we read so views recorded meanwhile are kept
+        try:
+            cache.decr(f"{COUNTER_PREFIX}:{property_id}", value)
+        except ValueError:
+            pass
+    with _index_lock() as locked:
+        if not locked:
+            return  # drained ids stay indexed and are dropped next time
+        remaining = cache.get_many([f"{COUNTER_PREFIX}:{property_id}" for property_id in pending])
+        drained = {
+            property_id
+            for property_id in pending
+            if not remaining.get(f"{COUNTER_PREFIX}:{property_id}")
+        }
+        cache.set(INDEX_KEY, (cache.get(INDEX_KEY) or set()) - drained, timeout=None)
+
+
+def apply_view_counts(counts: dict) -> int:
+    """
+    Add buffered increments to ``Property.view_count`` in batched UPDATEs,
+    all in one transaction.
+    """
+    updated = 0
+    items = list(counts.items())
+    with transaction.atomic():
+        for start in range(0, len(items), FLUSH_BATCH_SIZE):
+            batch = items[start : start + FLUSH_BATCH_SIZE]
+            increment = Case(*(When(pk=pk, then=Value(count)) for pk, count in batch), default=Value(0))
+            updated += Property.objects.filter(pk__in=[pk for pk, _count in batch]).update(
+                view_count=F("view_count") + increment
+            )
+    return updated
+
+
+def flush_view_counts() -> dict:
+    """
+    Drain the view buffer into the database; returns the applied counts.
+
+    Returns an empty dict without doing anything while another flush holds
+    the lock.
+    """
+    if not cache.add(FLUSH_LOCK_KEY, 1, FLUSH_LOCK_TIMEOUT):
+        logger.info("Skipped view count flush: another flush is running")
+        return {}
+    redis = _redis()
+    try:
+        if redis is not None:
+            counts = _drain_redis(redis)
+        else:
+            pending, counts = _read_cache()
+        if counts:
+            apply_view_counts(counts)
+            logger.info("Flushed %d views for %d properties", sum(counts.values()), len(counts))
+    except BaseException:
+        # Nothing was consumed: the next run applies these views
+        cache.delete(FLUSH_LOCK_KEY)
+        raise
+
+    def consume():
+        # Once applied, re-applying the drained views would count them twice
+        try:
+            if redis is not None:
+                redis.delete(FLUSHING_KEY)
+            else:
+                _consume_cache(pending, counts)
+        finally:
+            cache.delete(FLUSH_LOCK_KEY)
+
+    transaction.on_commit(consume)
+    return counts
@@ -2,26 +2,62 @@
 Views for the properties app.
 """
 
+import codecs
+import csv
+
+from asgiref.sync import sync_to_async
 from django.core.cache import cache
-from django.db.models import F
+from django.db.models import Avg, Count, F, Max, Min
+from django.db.models.functions import Substr
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, generics, permissions, status, viewsets
+from django_filters.utils import translate_validation
+from rest_framework import generics, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 
+from apps.common.async_views import AsyncReadView, amake_validators
+from apps.common.cache import (
+    cached_response,
+    get_generations,
+    get_or_refresh,
+    make_cache_key,
+    normalize_params,
+    request_cache_key,
+)
+from apps.common.conditional import conditional, make_validators
+from apps.common.exports import ExportMixin
+from apps.common.filters import RankedOrderingFilter
 from apps.common.pagination import StandardResultsPagination
+from apps.common.replicas import ReadReplicaMixin
 
+from .facets import compute_facets, shared_queryset
+from .importer import IMPORT_FORMATS, detect_format, import_properties
 from .filters import PropertyFilter
-from .models import Property, PropertyImage, PropertyStatus, SavedProperty
+from .models import (
+    ListingCount,
+    ListingType,
+    Property,
+    PropertyImage,
+    PropertyStatus,
+    SavedProperty,
+    SavedSearch,
+    SavedSearchMatch,
+)
 from .serializers import (
+    IsSavedField,
     PropertyCreateUpdateSerializer,
     PropertyDetailSerializer,
     PropertyImageSerializer,
     PropertyImageUploadSerializer,
     PropertyListSerializer,
     SavedPropertySerializer,
+    SavedSearchSerializer,
+    mark_saved,
 )
+from .view_counts import client_fingerprint, record_view
 
 
 class IsVerifiedAgent(permissions.BasePermission):
@@ -47,75 +83,230 @@ class IsVerifiedAgent(permissions.BasePermission):
         return obj.agent == request.user or request.user.is_staff
 
 
-class PublicPropertyViewSet(viewsets.ReadOnlyModelViewSet):
+# Geohash prefix length used to bin markers at each map zoom level (0-20)
+CLUSTER_PRECISION_BY_ZOOM = (1, 1, 1, 2, 2, 2, 3, 3, 4, 4, 4, 5, 5, 6, 6, 6, 7, 7, 8, 8, 9)
+CLUSTER_CACHE_TIMEOUT = 600
+FACET_CACHE_TIMEOUT = 600
+SIMILAR_MAX_LIMIT = 12
+
+
+class PublicPropertyViewSet(ReadReplicaMixin, viewsets.ReadOnlyModelViewSet):
     """
     Public viewset for browsing properties (no authentication required).
     """
 
+    read_replica_tags = ("properties", "agents")
     serializer_class = PropertyListSerializer
     pagination_class = StandardResultsPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, RankedOrderingFilter]
     filterset_class = PropertyFilter
-    search_fields = ["title", "description", "address", "city"]
-    ordering_fields = ["price", "created_at", "bedrooms", "area_sqm"]
+    ordering_fields = ["price", "created_at", "bedrooms", "area_sqm", "distance"]
     ordering = ["-created_at"]
     lookup_field = "slug"
 
     def get_queryset(self):
-        return (
-            Property.objects.filter(status=PropertyStatus.ACTIVE)
-            .select_related("agent")
-            .prefetch_related("images")
+        queryset = Property.objects.filter(status=PropertyStatus.ACTIVE).select_related(
+            "agent", "card"
         )
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related("images")
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return PropertyDetailSerializer
         return PropertyListSerializer
 
+    def get_retrieve_validators(self, request, slug=None, **kwargs):
+        row = (
+            Property.objects.filter(status=PropertyStatus.ACTIVE, slug=slug)
+            .values("pk", "updated_at")
+            .first()
+        )
+        if row is None:
+            return None
+        # Counted here so revalidated (304) page views are counted too;
+        # buffered in the cache and applied by the flush_view_counts command
+        record_view(row["pk"], client_fingerprint(request))
+        parts = []
+        if request.user.is_authenticated:
+            parts = [request.user.pk, row["pk"] in SavedProperty.property_ids_for(request.user)]
+        return make_validators(row["updated_at"], ("properties", "agents"), *parts)
+
+    @conditional("get_retrieve_validators")
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        # Increment view count
-        Property.objects.filter(pk=instance.pk).update(view_count=F("view_count") + 1)
         serializer = self.get_serializer(instance)
         return Response({"success": True, "data": serializer.data})
 
+    @cached_response("properties", "agents")
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
-        return response
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=True, methods=["get"])
+    @cached_response("properties", "agents")
+    def similar(self, request, slug=None):
+        """Get listings similar to this one (precomputed nearest neighbours)."""
+        property_obj = self.get_object()
+        try:
+            limit = min(max(int(request.query_params.get("limit", 6)), 1), SIMILAR_MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({"limit": ["limit must be an integer"]})
+        neighbours = (
+            Property.objects.filter(
+                status=PropertyStatus.ACTIVE, similar_to_entries__property=property_obj
+            )
+            .select_related("agent", "card")
+            .order_by("similar_to_entries__rank")[:limit]
+        )
+        serializer = PropertyListSerializer(neighbours, many=True, context=self.get_serializer_context())
+        return Response({"success": True, "data": serializer.data})
 
     @action(detail=False, methods=["get"])
     def featured(self, request):
         """Get featured properties."""
-        cache_key = "featured_properties"
-        cached_data = cache.get(cache_key)
 
-        if cached_data:
-            return Response({"success": True, "data": cached_data})
+        def compute():
+            queryset = self.get_queryset().filter(is_featured=True)[:10]
+            # Shared between users: saved state is applied per request below
+            context = {**self.get_serializer_context(), IsSavedField.context_key: frozenset()}
+            return self.get_serializer(queryset, many=True, context=context).data
 
-        queryset = self.get_queryset().filter(is_featured=True)[:10]
-        serializer = self.get_serializer(queryset, many=True)
-        cache.set(cache_key, serializer.data, timeout=300)
+        data = get_or_refresh(
+            request_cache_key("featured_properties", request), compute, tags=("properties", "agents")
+        )
+        return Response({"success": True, "data": mark_saved(data, request)})
 
-        return Response({"success": True, "data": serializer.data})
+    @action(detail=False, methods=["get"])
+    def clusters(self, request):
+        """
+        Get map clusters for a viewport (``bbox``) at a ``zoom`` level.
+
+        Listings are binned by geohash prefix in a single grouped query; any
+        PropertyFilter parameter narrows the listings being clustered.
+        """
+        try:
+            zoom = int(request.query_params.get("zoom", 6))
+        except ValueError:
+            raise ValidationError({"zoom": ["zoom must be an integer"]})
+        zoom = min(max(zoom, 0), len(CLUSTER_PRECISION_BY_ZOOM) - 1)
+        precision = CLUSTER_PRECISION_BY_ZOOM[zoom]
+
+        params = normalize_params(request.query_params, exclude={"zoom", "ordering", "page", "page_size"})
+        cache_key = make_cache_key(
+            "property_clusters", zoom, get_generations("properties"), params=params
+        )
+        clusters = cache.get(cache_key)
+        if clusters is None:
+            queryset = self.filter_queryset(self.get_queryset()).exclude(geohash="")
+            rows = (
+                queryset.order_by()
+                .annotate(cell=Substr("geohash", 1, precision))
+                .values("cell")
+                .annotate(
+                    count=Count("id"),
+                    latitude=Avg("latitude"),
+                    longitude=Avg("longitude"),
+                    min_price=Min("price"),
+                    max_price=Max("price"),
+                    sample_slug=Min("slug"),
+                )
+                .order_by("cell")
+            )
+            clusters = [
+                {
+                    "geohash": row["cell"],
+                    "count": row["count"],
+                    "latitude": round(float(row["latitude"]), 6),
+                    "longitude": round(float(row["longitude"]), 6),
+                    "min_price": f"{row['min_price']:.2f}",
+                    "max_price": f"{row['max_price']:.2f}",
+                    "sample_slug": row["sample_slug"],
+                }
+                for row in rows
+            ]
+            cache.set(cache_key, clusters, timeout=CLUSTER_CACHE_TIMEOUT)
+
+        return Response(
+            {
+                "success": True,
+                "data": clusters,
+                "meta": {
+                    "zoom": zoom,
+                    "precision": precision,
+                    "total_count": sum(cluster["count"] for cluster in clusters),
+                },
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        Get filter-sidebar counts for the current PropertyFilter parameters.
+
+        Each facet's counts apply all other active filters but not its own.
+        """
+        params = normalize_params(request.query_params, exclude={"ordering", "page", "page_size"})
+        cache_key = make_cache_key("property_facets", get_generations("properties"), params=params)
+        facets = cache.get(cache_key)
+        if facets is None:
+            filterset = PropertyFilter(request.query_params, queryset=self.get_queryset(), request=request)
+            if not filterset.is_valid():
+                raise translate_validation(filterset.errors)
+            facets = compute_facets(shared_queryset(filterset), filterset)
+            cache.set(cache_key, facets, timeout=FACET_CACHE_TIMEOUT)
+        return Response({"success": True, "data": facets})
 
     @action(detail=False, methods=["get"])
     def cities(self, request):
-        """Get list of cities with property counts."""
-        cities = (
-            Property.objects.filter(status=PropertyStatus.ACTIVE)
-            .values("city", "state")
-            .annotate(count=models.Count("id"))
-            .order_by("-count")
-        )
-        return Response({"success": True, "data": list(cities)})
+        """Get list of cities with property counts (optionally per ``listing_type``)."""
+        listing_type = request.query_params.get("listing_type", "")
+        if listing_type not in ("", *ListingType.values):
+            raise ValidationError({"listing_type": [f"Invalid listing type '{listing_type}'"]})
+
+        def compute():
+            return list(
+                ListingCount.objects.filter(
+                    scope=ListingCount.Scope.CITY, listing_type=listing_type, count__gt=0
+                )
+                .values("city", "state", "count")
+                .order_by("-count", "city")
+            )
+
+        data = get_or_refresh(f"property_cities:{listing_type}", compute, tags=("properties",))
+        return Response({"success": True, "data": data})
+
+
+class AsyncPropertyListView(AsyncReadView):
+    """Async front for ``PublicPropertyViewSet.list`` (``ASYNC_PUBLIC_API``)."""
+
+    sync_view = PublicPropertyViewSet.as_view({"get": "list"})
+    cache_tags = ("properties", "agents")
+
+
+class AsyncPropertyDetailView(AsyncReadView):
+    """Async front for ``PublicPropertyViewSet.retrieve`` (``ASYNC_PUBLIC_API``)."""
+
+    sync_view = PublicPropertyViewSet.as_view({"get": "retrieve"})
 
+    async def get_validators(self, request, slug=None, **kwargs):
+        row = await (
+            Property.objects.filter(status=PropertyStatus.ACTIVE, slug=slug)
+            .values("pk", "updated_at")
+            .afirst()
+        )
+        if row is None:
+            return None
+        self.property_id = row["pk"]
+        return await amake_validators(row["updated_at"], ("properties", "agents"))
 
-# Import for Count
-from django.db import models
+    async def not_modified(self, request, *args, **kwargs):
+        # Revalidated page views count, as in the sync view
+        fingerprint = client_fingerprint(request)
+        await sync_to_async(record_view)(self.property_id, fingerprint)
 
 
-class AgentPropertyViewSet(viewsets.ModelViewSet):
+class AgentPropertyViewSet(ExportMixin, viewsets.ModelViewSet):
     """
     Viewset for agents to manage their own properties.
     Only verified agents can create/edit properties.
@@ -124,13 +315,41 @@ class AgentPropertyViewSet(viewsets.ModelViewSet):
     permission_classes = [IsVerifiedAgent]
     pagination_class = StandardResultsPagination
     parser_classes = [MultiPartParser, FormParser]
+    filterset_class = PropertyFilter
+    export_filename = "properties"
+    export_fields = (
+        ("id", "id"),
+        ("slug", "slug"),
+        ("title", "title"),
+        ("status", "status"),
+        ("property_type", "property_type"),
+        ("listing_type", "listing_type"),
+        ("price", "price"),
+        ("price_negotiable", "price_negotiable"),
+        ("bedrooms", "bedrooms"),
+        ("bathrooms", "bathrooms"),
+        ("area_sqm", "area_sqm"),
+        ("address", "address"),
+        ("city", "city"),
+        ("state", "state"),
+        ("location", "location__slug"),
+        ("latitude", "latitude"),
+        ("longitude", "longitude"),
+        ("features", "features"),
+        ("agent_email", "agent__email"),
+        ("is_featured", "is_featured"),
+        ("view_count", "view_count"),
+        ("created_at", "created_at"),
+        ("updated_at", "updated_at"),
+    )
 
     def get_queryset(self):
-        return (
-            Property.objects.filter(agent=self.request.user)
-            .select_related("agent", "location")
-            .prefetch_related("images")
+        queryset = Property.objects.filter(agent=self.request.user).select_related(
+            "agent", "location", "card"
         )
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related("images")
+        return queryset
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -139,6 +358,11 @@ class AgentPropertyViewSet(viewsets.ModelViewSet):
             return PropertyDetailSerializer
         return PropertyListSerializer
 
+    def get_export_queryset(self):
+        # Staff export the full catalogue, agents their own listings
+        queryset = Property.objects.all() if self.request.user.is_staff else self.get_queryset()
+        return self.filter_queryset(queryset.order_by("created_at"))
+
     def perform_create(self, serializer):
         # New properties start as draft (FSM default)
         serializer.save(agent=self.request.user)
@@ -152,6 +376,46 @@ class AgentPropertyViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED,
         )
 
+    @action(detail=False, methods=["post"], url_path="import")
+    def bulk_import(self, request):
+        """
+        Import properties from an uploaded CSV or NDJSON ``file``.
+
+        Rows may carry external ``image_url``/``image_urls``. Valid rows are
+        created as drafts; the response reports every rejected row.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"success": False, "error": {"message": "file is required"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        file_format = request.data.get("file_format") or detect_format(upload.name)
+        if file_format not in IMPORT_FORMATS:
+            return Response(
+                {"success": False, "error": {"message": f"Unsupported format '{file_format}'"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            report = import_properties(
+                codecs.iterdecode(upload, "utf-8-sig"),
+                request.user,
+                file_format=file_format,
+                context=self.get_serializer_context(),
+            )
+        except (UnicodeDecodeError, csv.Error) as exc:
+            return Response(
+                {"success": False, "error": {"message": f"Could not read the file: {exc}"}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not report["created"]:
+            return Response(
+                {"success": False, "error": {"message": "No properties were imported", **report}},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"success": True, "data": report}, status=status.HTTP_201_CREATED)
+
     @action(detail=True, methods=["post"])
     def submit_for_review(self, request, pk=None):
         """Submit a property for admin review using FSM transition."""
@@ -333,7 +597,7 @@ class SavedPropertyViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         return SavedProperty.objects.filter(user=self.request.user).select_related(
-            "property", "property__agent"
+            "property", "property__agent", "property__card"
         )
 
     @action(detail=False, methods=["post"])
@@ -367,3 +631,45 @@ class SavedPropertyViewSet(viewsets.ModelViewSet):
             {"success": True, "data": {"is_saved": True}},
             status=status.HTTP_201_CREATED,
         )
+
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    """
+    Viewset for managing saved searches and browsing their matches.
+    """
+
+    serializer_class = SavedSearchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardResultsPagination
+
+    def get_queryset(self):
+        return SavedSearch.objects.filter(user=self.request.user).annotate(match_count=Count("matches"))
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @action(detail=True, methods=["get"])
+    def matches(self, request, pk=None):
+        """Get the active listings matched by a saved search, newest match first."""
+        search = self.get_object()
+        queryset = (
+            Property.objects.filter(
+                status=PropertyStatus.ACTIVE, saved_search_matches__search=search
+            )
+            .select_related("agent", "card")
+            # An annotation, so keyset cursors can read it off the rows
+            .annotate(matched_at=F("saved_search_matches__created_at"))
+            .order_by("-matched_at")
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = PropertyListSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["post"])
+    def mark_seen(self, request, pk=None):
+        """Mark every pending match of a saved search as notified."""
+        search = self.get_object()
+        updated = SavedSearchMatch.objects.filter(search=search, notified_at__isnull=True).update(
+            notified_at=timezone.now()
+        )
+        return Response({"success": True, "data": {"updated": updated}})
@@ -36,6 +36,22 @@ def create_user(db):
     return _create_user
 
 
+@pytest.fixture
+def locmem_cache(settings):
+    """Use a real (local memory) cache instead of the dummy test cache."""
+    from django.core.cache import cache
+
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "test-cache",
+        }
+    }
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
 @pytest.fixture
 def buyer_user(create_user):
     """Create a buyer user."""
@@ -2,9 +2,23 @@
 Tests for the accounts app.
 """
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import jwt
 import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
 
+from apps.accounts import jwks, principals
+from apps.accounts.authentication import Auth0JWTAuthentication
 from apps.accounts.models import User
 
 
@@ -85,6 +99,20 @@ class TestBecomeAgentView:
         assert response.status_code == 400
 
 
+@pytest.mark.django_db
+class TestAgentListView:
+    """Tests for the public agent directory."""
+
+    def test_directory_cache_invalidated_by_new_agent(self, api_client, agent_user, create_user, locmem_cache):
+        """Test the cached directory reflects newly created agents."""
+        url = reverse("agent-list")
+        assert len(api_client.get(url).data["data"]) == 1
+
+        create_user(email="second@example.com", role="agent", first_name="Second")
+
+        assert len(api_client.get(url).data["data"]) == 2
+
+
 @pytest.mark.django_db
 class TestHealthCheck:
     """Tests for health check endpoint."""
@@ -96,3 +124,185 @@ class TestHealthCheck:
 
         assert response.status_code == 200
         assert response.data["status"] == "healthy"
+
+
+class JWKSServer:
+    """Local stand-in for the Auth0 JWKS endpoint."""
+
+    def __init__(self):
+        self.keys = {}
+        self.hits = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.hits += 1
+                keys = [
+                    {**json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key())), "kid": kid}
+                    for kid, key in server.keys.items()
+                ]
+                body = json.dumps({"keys": keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/.well-known/jwks.json"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def add_key(self, kid):
+        self.keys[kid] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def token(self, kid, sub="auth0|buyer", expires_in=3600, **claims):
+        payload = {
+            "sub": sub,
+            "email": f"{sub.split('|')[-1]}@example.com",
+            "aud": "https://api.example.com",
+            "iss": "https://tenant.example.com/",
+            "exp": int(time.time()) + expires_in,
+            **claims,
+        }
+        return jwt.encode(payload, self.keys[kid], algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def jwks_server(settings):
+    server = JWKSServer()
+    server.add_key("key-1")
+    settings.AUTH0_DOMAIN = "tenant.example.com"
+    settings.AUTH0_API_IDENTIFIER = "https://api.example.com"
+    settings.AUTH0_JWKS_URL = server.url
+    jwks.reset()
+    principals.reset()
+    yield server
+    jwks.reset()
+    principals.reset()
+    server.httpd.shutdown()
+    server.httpd.server_close()
+
+
+def _authenticate(token):
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    return Auth0JWTAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+class TestAuth0JWTAuthentication:
+    """Tests for JWKS and verified-token caching."""
+
+    def test_keys_and_verified_tokens_are_cached(self, jwks_server):
+        """Test one JWKS fetch per process and no re-verification of known tokens."""
+        token = jwks_server.token("key-1")
+
+        user, payload = _authenticate(token)
+        assert user.auth0_id == "auth0|buyer"
+        with mock.patch("apps.accounts.authentication.jwt.decode", wraps=jwt.decode) as decode:
+            _authenticate(token)
+            _authenticate(jwks_server.token("key-1", sub="auth0|other"))
+
+        assert decode.call_count == 1
+        assert jwks_server.hits == 1
+
+    def test_unknown_kid_refreshes_once(self, jwks_server):
+        """Test a rotated key is picked up and bogus kids are rate-limited."""
+        now = [0.0]
+        jwks.get_key_store().clock = lambda: now[0]
+        _authenticate(jwks_server.token("key-1"))
+        jwks_server.add_key("key-2")
+        now[0] = jwks.UNKNOWN_KID_REFRESH_INTERVAL
+
+        user, _payload = _authenticate(jwks_server.token("key-2", sub="auth0|rotated"))
+        assert user.auth0_id == "auth0|rotated"
+        assert jwks_server.hits == 2
+
+        jwks_server.add_key("bogus")
+        bogus = jwks_server.token("bogus")
+        jwks_server.keys.pop("bogus")
+        for _attempt in range(3):
+            with pytest.raises(AuthenticationFailed):
+                _authenticate(bogus)
+        assert jwks_server.hits == 2
+
+        now[0] += jwks.UNKNOWN_KID_REFRESH_INTERVAL
+        with pytest.raises(AuthenticationFailed):
+            _authenticate(bogus)
+        assert jwks_server.hits == 3
+
+    def test_stale_keys_refresh_in_background(self, jwks_server):
+        """Test expired key sets are served while a background refresh runs."""
+        now = [0.0]
+        store = jwks.get_key_store()
+        store.clock = lambda: now[0]
+        store.get_key("key-1")
+
+        now[0] = store.ttl + 1
+        assert store.get_key("key-1") is not None
+        store._background.join(timeout=5)
+
+        assert jwks_server.hits == 2
+        assert store.fetched_at == store.ttl + 1
+
+    def test_expired_tokens_are_rejected(self, jwks_server):
+        """Test cached payloads expire with the token."""
+        token = jwks_server.token("key-1", expires_in=-10)
+        jwks.get_token_cache().put(token, jwt.decode(token, options={"verify_signature": False}))
+
+        with pytest.raises(AuthenticationFailed, match="expired"):
+            _authenticate(token)
+
+    def test_token_cache_is_bounded(self):
+        """Test the least recently used tokens are evicted."""
+        cache = jwks.VerifiedTokenCache(max_size=2)
+        expires = time.time() + 60
+        for token in ("a", "b"):
+            cache.put(token, {"sub": token, "exp": expires})
+        cache.get("a")
+        cache.put("c", {"sub": "c", "exp": expires})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"sub": "a", "exp": expires}
+        assert len(cache) == 2
+
+
+@pytest.mark.django_db
+class TestPrincipalCache:
+    """Tests for cached token subject to user resolution."""
+
+    def test_repeat_requests_need_no_queries(self, jwks_server, locmem_cache):
+        """Test the user is resolved once and served from the cache after."""
+        user, _payload = _authenticate(jwks_server.token("key-1", name="Ana Pérez"))
+        assert (user.first_name, user.last_name) == ("Ana", "Pérez")
+
+        with CaptureQueriesContext(connection) as queries:
+            cached, _payload = _authenticate(jwks_server.token("key-1", name="Ana Pérez", jti="2"))
+        assert len(queries) == 0
+        assert cached == user and cached is not user
+
+        # Another process: only the shared cache is warm
+        principals.reset()
+        with CaptureQueriesContext(connection) as queries:
+            _authenticate(jwks_server.token("key-1", name="Ana Pérez", jti="3"))
+        assert len(queries) == 0
+
+    def test_changed_claims_and_user_saves_reload(
+        self, jwks_server, locmem_cache, django_capture_on_commit_callbacks
+    ):
+        """Test profile claim changes and user saves go back to the database."""
+        user, _payload = _authenticate(jwks_server.token("key-1", email="old@example.com"))
+
+        with CaptureQueriesContext(connection) as queries:
+            _authenticate(jwks_server.token("key-1", email="old@example.com", name="Ana"))
+        assert len(queries) > 0
+        assert User.objects.get(pk=user.pk).first_name == "Ana"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            User.objects.filter(pk=user.pk).update(role="agent")
+            User.objects.get(pk=user.pk).save()
+        token = jwks_server.token("key-1", email="old@example.com", name="Ana", jti="2")
+        refreshed, _payload = _authenticate(token)
+        assert refreshed.role == "agent"
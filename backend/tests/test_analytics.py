@@ -0,0 +1,152 @@
+"""
+Tests for the analytics app.
+"""
+
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.analytics.models import MarketRollup
+from apps.analytics.rollups import grouped_stats, refresh_market_rollups
+from apps.common.models import Location
+from apps.properties.models import Property, PropertyStatus
+
+
+@pytest.fixture
+def market(agent_user):
+    """Create active listings in two cities, plus an inactive one."""
+    location = Location.objects.create(name="Margarita", slug="margarita", state="Nueva Esparta")
+    listings = [
+        # city, property_type, listing_type, price, area
+        ("Porlamar", "apartment", "sale", 100000, 100),
+        ("Porlamar", "apartment", "sale", 150000, 100),
+        ("Porlamar", "house", "sale", 300000, 200),
+        ("Porlamar", "house", "sale", 500000, None),
+        ("Porlamar", "apartment", "rent", 800, 80),
+        ("Pampatar", "house", "sale", 250000, 125),
+    ]
+    for index, (city, property_type, listing_type, price, area) in enumerate(listings):
+        Property.objects.create(
+            title=f"Market listing {index}",
+            description="Market listing.",
+            status=PropertyStatus.ACTIVE,
+            property_type=property_type,
+            listing_type=listing_type,
+            price=Decimal(price),
+            area_sqm=Decimal(area) if area else None,
+            address="Calle 1",
+            city=city,
+            state="Nueva Esparta",
+            location=location,
+            agent=agent_user,
+        )
+    Property.objects.create(
+        title="Inactive listing",
+        description="Not on the market.",
+        status=PropertyStatus.INACTIVE,
+        price=Decimal("9000000"),
+        address="Calle 2",
+        city="Porlamar",
+        state="Nueva Esparta",
+        agent=agent_user,
+    )
+    return location
+
+
+class TestGroupedStats:
+    """Tests for the vectorized per-group statistics."""
+
+    def test_matches_numpy_quantile(self):
+        """Test grouped quantiles equal np.quantile on each group."""
+        rng = np.random.default_rng(7)
+        codes = rng.integers(0, 5, size=200)
+        values = rng.normal(100, 20, size=200)
+        values[::13] = np.nan
+        levels = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+
+        stats = grouped_stats(codes, values, levels)
+
+        for code, (count, quantiles, mean) in stats.items():
+            group = values[(codes == code) & ~np.isnan(values)]
+            assert count == len(group)
+            assert np.allclose(quantiles, np.quantile(group, levels))
+            assert mean == pytest.approx(group.mean())
+
+
+@pytest.mark.django_db
+class TestMarketRollups:
+    """Tests for the market rollup command and endpoints."""
+
+    def test_command_computes_segments(self, market):
+        """Test the command writes price and price-per-sqm statistics."""
+        call_command("refresh_market_rollups", stdout=StringIO())
+
+        city = MarketRollup.objects.get(
+            scope=MarketRollup.Scope.CITY, key="Porlamar|Nueva Esparta", listing_type="sale", property_type=""
+        )
+        assert city.listing_count == 4
+        assert city.price_median == Decimal("225000.00")
+        assert city.price_min == Decimal("100000.00")
+        assert city.area_sample == 3
+        assert city.price_per_sqm_median == Decimal("1500.00")
+
+        apartments = MarketRollup.objects.get(
+            scope=MarketRollup.Scope.CITY,
+            key="Porlamar|Nueva Esparta",
+            listing_type="sale",
+            property_type="apartment",
+        )
+        assert apartments.listing_count == 2
+        assert apartments.price_median == Decimal("125000.00")
+
+        location = MarketRollup.objects.get(
+            scope=MarketRollup.Scope.LOCATION, key=str(market.pk), listing_type="sale", property_type=""
+        )
+        assert location.listing_count == 5
+        assert MarketRollup.objects.get(
+            scope=MarketRollup.Scope.MARKET, listing_type="rent", property_type=""
+        ).listing_count == 1
+
+    def test_market_endpoint_reads_rollups_only(self, api_client, market):
+        """Test the endpoint serves the latest snapshot without scanning properties."""
+        refresh_market_rollups()
+        url = reverse("market-analytics-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"state": "Nueva Esparta"})
+
+        assert response.status_code == 200
+        assert not [q for q in queries.captured_queries if "properties_property" in q["sql"]]
+        data = response.data["data"]
+        assert [row["city"] for row in data] == ["Porlamar", "Pampatar"]
+        assert data[0]["price"]["median"] == Decimal("225000.00")
+        assert data[0]["price_per_sqm"]["median"] == Decimal("1500.00")
+
+        response = api_client.get(url, {"location": "margarita", "property_type": "house"})
+        assert response.data["data"][0]["listing_count"] == 3
+        assert response.data["data"][0]["location"] == "margarita"
+
+        response = api_client.get(url, {"listing_type": "lease"})
+        assert response.status_code == 400
+
+    def test_trend_endpoint(self, api_client, market):
+        """Test the trend action returns one point per snapshot."""
+        today = datetime.date.today()
+        refresh_market_rollups(period=today - datetime.timedelta(days=1))
+        Property.objects.filter(city="Pampatar").update(status=PropertyStatus.INACTIVE)
+        refresh_market_rollups(period=today)
+        url = reverse("market-analytics-trend")
+
+        response = api_client.get(url, {"scope": "state", "state": "Nueva Esparta"})
+
+        assert response.status_code == 200
+        assert [point["listing_count"] for point in response.data["data"]] == [5, 4]
+
+        assert api_client.get(url, {"scope": "city", "city": "Porlamar"}).status_code == 400
@@ -0,0 +1,252 @@
+"""
+Tests for the common app.
+"""
+
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection, router
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.common import utils
+from apps.common.cache import bump_generation, get_or_refresh
+from apps.common.middleware import StaticFilesMiddleware
+from apps.common.models import Location
+from apps.common.replicas import PIN_COOKIE, ReadReplicaRouter, use_read_replica
+from apps.common.utils import allocate_slugs, generate_unique_slug
+
+
+class Counter:
+    """Callable returning an increasing value on every call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+@pytest.mark.django_db
+class TestStaleWhileRevalidate:
+    """Tests for the get_or_refresh cache helper."""
+
+    def test_fresh_value_is_reused(self, locmem_cache):
+        """Test a fresh value is computed once."""
+        compute = Counter()
+        assert get_or_refresh("swr-test", compute, soft_ttl=60, beta=0) == 1
+        assert get_or_refresh("swr-test", compute, soft_ttl=60, beta=0) == 1
+        assert compute.calls == 1
+
+    def test_stale_value_served_while_locked(self, locmem_cache):
+        """Test callers serve the stale value while another worker refreshes."""
+        compute = Counter()
+        get_or_refresh("swr-test", compute, soft_ttl=0)
+        locmem_cache.add("swr-test:lock", 1)
+
+        assert get_or_refresh("swr-test", compute, soft_ttl=0) == 1
+        assert compute.calls == 1
+
+    def test_stale_value_refreshed_by_lock_winner(self, locmem_cache):
+        """Test the caller that wins the lock recomputes and releases it."""
+        compute = Counter()
+        get_or_refresh("swr-test", compute, soft_ttl=0)
+
+        assert get_or_refresh("swr-test", compute, soft_ttl=0) == 2
+        assert locmem_cache.get("swr-test:lock") is None
+
+    def test_generation_bump_marks_value_stale(self, locmem_cache):
+        """Test bumping a tag forces a refresh before the soft TTL."""
+        compute = Counter()
+        get_or_refresh("swr-test", compute, tags=("locations",), soft_ttl=60, beta=0)
+        bump_generation("locations")
+
+        assert get_or_refresh("swr-test", compute, tags=("locations",), soft_ttl=60, beta=0) == 2
+
+
+@pytest.mark.django_db
+class TestLocationViewSet:
+    """Tests for LocationViewSet."""
+
+    def test_featured_locations_refresh_after_write(self, api_client, locmem_cache):
+        """Test the cached featured list picks up new featured locations."""
+        url = reverse("locations-featured")
+        Location.objects.create(
+            name="Los Roques", slug="los-roques", state="Dependencias Federales", is_featured=True
+        )
+        assert [row["slug"] for row in api_client.get(url).data["data"]] == ["los-roques"]
+
+        Location.objects.create(name="Mérida", slug="merida", state="Mérida", is_featured=True)
+
+        assert len(api_client.get(url).data["data"]) == 2
+
+    def test_list_supports_conditional_get(self, api_client, locmem_cache):
+        """Test the location list returns 304 until a location changes."""
+        url = reverse("locations-list")
+        location = Location.objects.create(name="Mérida", slug="merida", state="Mérida")
+        etag = api_client.get(url)["ETag"]
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        location.name = "Mérida (Ciudad)"
+        location.save()
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+class TestSlugAllocation:
+    """Tests for the set-based unique slug allocator."""
+
+    @pytest.fixture
+    def beaches(self):
+        for name, slug in [
+            ("Playa", "playa"),
+            ("Playa Uno", "playa-1"),
+            ("Playa Siete", "playa-7"),
+            ("Playa El Agua", "playa-el-agua"),
+        ]:
+            Location.objects.create(name=name, slug=slug, state="Nueva Esparta")
+
+    def test_next_suffix_in_one_query(self, beaches):
+        """Test the next free suffix is found with a single query."""
+        with CaptureQueriesContext(connection) as queries:
+            slug = generate_unique_slug(Location, "Playa")
+
+        assert slug == "playa-8"
+        assert len(queries) == 1
+
+    def test_batch_allocation(self, beaches):
+        """Test a batch gets distinct slugs, including within itself."""
+        slugs = allocate_slugs(Location, ["Playa", "Playa", "Playa 9", "Playa El Agua", "Coche"])
+
+        assert slugs == ["playa-8", "playa-9", "playa-9-1", "playa-el-agua-1", "coche"]
+
+    def test_save_retries_on_race(self, beaches, monkeypatch):
+        """Test a slug taken between allocation and insert is reallocated."""
+        calls = []
+        allocate = utils.generate_unique_slug
+
+        def stale_then_fresh(model_class, value, slug_field="slug"):
+            calls.append(value)
+            # First attempt returns a slug another writer already took
+            return "playa" if len(calls) == 1 else allocate(model_class, value, slug_field)
+
+        monkeypatch.setattr(utils, "generate_unique_slug", stale_then_fresh)
+        location = Location.objects.create(name="Playa Caribe", state="Nueva Esparta")
+
+        assert location.slug == "playa-caribe"
+        assert len(calls) == 2
+
+
+class TestStaticFilesMiddleware:
+    """Tests for WhiteNoise in sync and async middleware stacks."""
+
+    @pytest.fixture
+    def static_root(self, settings, tmp_path):
+        settings.STATIC_ROOT = tmp_path
+        (tmp_path / "site.css").write_text("body {}")
+        return tmp_path
+
+    def test_sync_stack_serves_static_files(self, static_root):
+        """Test static files are served and other paths passed through."""
+        middleware = StaticFilesMiddleware(lambda request: HttpResponse("app"))
+
+        response = middleware(RequestFactory().get("/static/site.css"))
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == b"body {}"
+        assert middleware(RequestFactory().get("/api/v1/")).content == b"app"
+
+    def test_async_stack_serves_static_files(self, static_root):
+        """Test the async stack only leaves the event loop for static files."""
+
+        async def get_response(request):
+            return HttpResponse("app")
+
+        middleware = StaticFilesMiddleware(get_response)
+
+        response = async_to_sync(middleware)(AsyncRequestFactory().get("/static/site.css"))
+        assert response.status_code == 200
+        assert b"".join(response.streaming_content) == b"body {}"
+        assert async_to_sync(middleware)(AsyncRequestFactory().get("/api/v1/")).content == b"app"
+
+
+@pytest.fixture
+def replica_reads(settings, locmem_cache):
+    """Record where reads are routed; queries still run on the primary."""
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.DATABASE_REPLICA_LAG = 0
+    routed = []
+    route = ReadReplicaRouter.db_for_read
+
+    def spy(self, model, **hints):
+        routed.append(route(self, model, **hints) or "default")
+        # The test database has no replica alias
+        return None
+
+    with mock.patch.object(ReadReplicaRouter, "db_for_read", spy):
+        yield routed
+
+
+@pytest.mark.django_db
+class TestReadReplicaRouting:
+    """Tests for routing anonymous catalogue reads to replicas."""
+
+    def test_anonymous_reads_use_replica(self, api_client, replica_reads):
+        """Test an anonymous list is read from a replica."""
+        Location.objects.create(name="Mérida", slug="merida", state="Mérida")
+
+        response = api_client.get(reverse("locations-list"))
+
+        assert response.status_code == 200
+        assert set(replica_reads) == {"replica"}
+        assert PIN_COOKIE not in response.cookies
+
+    def test_authenticated_reads_use_primary(self, authenticated_client, replica_reads):
+        """Test authenticated users always read from the primary."""
+        authenticated_client.get(reverse("locations-list"))
+
+        assert replica_reads
+        assert "replica" not in replica_reads
+
+    def test_recently_changed_data_uses_primary(self, api_client, replica_reads, settings):
+        """Test a view whose tags were just invalidated reads from the primary."""
+        settings.DATABASE_REPLICA_LAG = 60
+        bump_generation("locations")
+
+        api_client.get(reverse("locations-list"))
+
+        assert "replica" not in replica_reads
+
+    def test_write_pins_client_to_primary(self, authenticated_client, api_client, replica_reads, settings):
+        """Test a writing client reads its writes from the primary for a while."""
+        settings.DATABASE_REPLICA_LAG = 15
+        response = authenticated_client.patch(reverse("current-user"), {"first_name": "Renamed"})
+
+        cookie = response.cookies[PIN_COOKIE]
+        assert cookie["max-age"] == 15
+        assert cookie["httponly"]
+
+        settings.DATABASE_REPLICA_LAG = 0
+        api_client.cookies[PIN_COOKIE] = cookie.value
+        api_client.get(reverse("public-properties-list"))
+        assert "replica" not in replica_reads
+
+    def test_router_reads_primary_after_write(self, settings):
+        """Test writes go to the primary and pin the rest of the scope to it."""
+        settings.DATABASE_REPLICAS = ["replica"]
+        assert router.db_for_read(Location) == "default"
+
+        with use_read_replica() as alias:
+            assert alias == "replica"
+            assert router.db_for_read(Location) == "replica"
+            location = Location(slug="merida")
+            location._state.db = "replica"
+            assert router.db_for_write(Location, instance=location) == "default"
+            assert router.db_for_read(Location) == "default"
+
+        assert router.allow_migrate("replica", "common") is False
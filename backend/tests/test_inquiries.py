@@ -2,6 +2,7 @@
 Tests for the inquiries app.
 """
 
+import csv
 from decimal import Decimal
 
 import pytest
@@ -116,6 +117,16 @@ class TestAgentInquiryViewSet:
         assert response.status_code == 200
         assert len(response.data["data"]) == 1
 
+    def test_list_inquiries_with_cursor(self, agent_client, sample_inquiry):
+        """Test agent listing inquiries in keyset pagination mode."""
+        url = reverse("agent-inquiries-list")
+        response = agent_client.get(url, {"pagination": "cursor"})
+
+        assert response.status_code == 200
+        assert len(response.data["data"]) == 1
+        assert response.data["meta"]["next_cursor"] is None
+        assert response.data["meta"]["has_previous"] is False
+
     def test_retrieve_inquiry(self, agent_client, sample_inquiry):
         """Test agent viewing inquiry details."""
         url = reverse("agent-inquiries-detail", args=[sample_inquiry.id])
@@ -159,3 +170,28 @@ class TestAgentInquiryViewSet:
         response = api_client.get(url)
 
         assert response.status_code == 404
+
+    def test_export_inquiries_csv(self, agent_client, sample_inquiry):
+        """Test agents can stream their inquiries as CSV."""
+        Inquiry.objects.create(
+            property_listing=sample_inquiry.property_listing,
+            full_name="=HYPERLINK(\"http://evil\")",
+            email="jane@example.com",
+            message="Formula in the name.",
+        )
+        url = reverse("agent-inquiries-export")
+
+        response = agent_client.get(url, {"status": "new"})
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Disposition"].startswith('attachment; filename="inquiries-')
+        rows = list(csv.reader(b"".join(response.streaming_content).decode("utf-8-sig").splitlines()))
+        assert rows[0][:3] == ["id", "created_at", "status"]
+        assert {row[3] for row in rows[1:]} == {"John Doe", "'=HYPERLINK(\"http://evil\")"}
+
+    def test_export_rejects_unknown_format(self, agent_client, sample_inquiry):
+        """Test an unsupported export format is a validation error."""
+        response = agent_client.get(reverse("agent-inquiries-export"), {"export_format": "xlsx"})
+
+        assert response.status_code == 400
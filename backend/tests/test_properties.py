@@ -2,12 +2,59 @@
 Tests for the properties app.
 """
 
+import json
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from unittest import mock
 
+import numpy as np
 import pytest
+from PIL import Image
+from asgiref.sync import async_to_sync
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from redis.exceptions import ResponseError as RedisResponseError
+from rest_framework.throttling import AnonRateThrottle
 
-from apps.properties.models import Property, PropertyImage, PropertyStatus
+from apps.common.geo import bbox_cover, encode_geohash
+from apps.common.mirroring import mirror_external_images
+from apps.common.models import Location
+from apps.common.pagination import KeysetPagination
+from apps.common.renditions import available_formats, render
+from apps.common.search import full_text_search_enabled
+from apps.properties.importer import PropertyImporter, import_properties
+from apps.properties.models import (
+    ListingCount,
+    Property,
+    PropertyCard,
+    PropertyImage,
+    PropertyStatus,
+    SavedProperty,
+    SavedSearch,
+    SavedSearchMatch,
+    SimilarProperty,
+)
+from apps.properties.saved_searches import candidate_search_ids, search_terms
+from apps.properties.similarity import (
+    VALUE_FIELDS,
+    block_rows,
+    build_vectors,
+    refresh_similar_properties,
+    top_k,
+)
+from apps.properties.view_counts import flush_view_counts
+from apps.properties.views import AsyncPropertyDetailView, AsyncPropertyListView, PublicPropertyViewSet
 
 
 @pytest.fixture
@@ -126,6 +173,64 @@ class TestPublicPropertyViewSet:
         assert response.status_code == 200
         assert len(response.data["data"]) == 1
 
+    def test_search_matches_spanish_description(self, api_client, sample_property, agent_user):
+        """Test the search parameter covers the Spanish description."""
+        Property.objects.create(
+            title="Apartamento en Caracas",
+            description="City apartment.",
+            description_es="Apartamento con vista al Ávila.",
+            status=PropertyStatus.ACTIVE,
+            price=Decimal("90000.00"),
+            address="Av. Principal",
+            city="Caracas",
+            state="Distrito Capital",
+            agent=agent_user,
+        )
+        url = reverse("public-properties-list")
+        response = api_client.get(url, {"search": "vista"})
+
+        assert response.status_code == 200
+        assert len(response.data["data"]) == 1
+        assert response.data["data"][0]["city"] == "Caracas"
+        highlight = response.data["data"][0]["search_highlight"]
+        if full_text_search_enabled():
+            assert "<mark>vista</mark>" in highlight["es"]
+        else:
+            assert highlight is None
+
+    def test_search_highlight_escapes_listing_html(self, api_client, agent_user):
+        """Test search snippets escape agent-entered HTML around the matches."""
+        Property.objects.create(
+            title="<script>alert(1)</script> Villa",
+            description="Villa with a pool <img src=x onerror=alert(1)> & garden.",
+            status=PropertyStatus.ACTIVE,
+            price=Decimal("90000.00"),
+            address="Av. Principal",
+            city="Caracas",
+            state="Distrito Capital",
+            agent=agent_user,
+        )
+        url = reverse("public-properties-list")
+        response = api_client.get(url, {"search": "pool"})
+
+        assert response.status_code == 200
+        assert len(response.data["data"]) == 1
+        highlight = response.data["data"][0]["search_highlight"]
+        if full_text_search_enabled():
+            assert "<img" not in highlight["en"]
+            assert "&lt;img src=x onerror=alert(1)&gt; &amp; garden" in highlight["en"]
+            assert "<mark>pool</mark>" in highlight["en"]
+        else:
+            assert highlight is None
+
+    def test_search_respects_explicit_ordering(self, api_client, sample_property):
+        """Test search results can still be ordered explicitly."""
+        url = reverse("public-properties-list")
+        response = api_client.get(url, {"search": "beach", "ordering": "-price"})
+
+        assert response.status_code == 200
+        assert len(response.data["data"]) == 1
+
     def test_featured_properties(self, api_client, sample_property):
         """Test getting featured properties."""
         sample_property.is_featured = True
@@ -138,6 +243,1377 @@ class TestPublicPropertyViewSet:
         assert response.data["success"] is True
 
 
+@pytest.fixture
+def catalogue(agent_user):
+    """Create active properties with tied prices and some missing areas."""
+    properties = []
+    for index, (price, area) in enumerate(
+        [(100, 80), (200, None), (200, 120), (300, None), (150, 95), (200, 60), (50, None)]
+    ):
+        properties.append(
+            Property.objects.create(
+                title=f"Listing {index}",
+                description="Catalogue listing.",
+                status=PropertyStatus.ACTIVE,
+                price=Decimal(price * 1000),
+                area_sqm=Decimal(area) if area else None,
+                address="Calle 1",
+                city="Caracas",
+                state="Distrito Capital",
+                agent=agent_user,
+            )
+        )
+    return properties
+
+
+@pytest.mark.django_db
+class TestPropertyCard:
+    """Tests for the denormalized listing-card projection."""
+
+    def _add_listing(self, agent_user, index):
+        prop = Property.objects.create(
+            title=f"Card Listing {index}",
+            description="Listing with images.",
+            status=PropertyStatus.ACTIVE,
+            price=Decimal("120000.00"),
+            address="Calle 2",
+            city="Lechería",
+            state="Anzoátegui",
+            agent=agent_user,
+        )
+        PropertyImage.objects.create(property=prop, image_url=f"https://cdn.example.com/{index}-a.jpg")
+        PropertyImage.objects.create(
+            property=prop, image_url=f"https://cdn.example.com/{index}-b.jpg", is_main=True
+        )
+        return prop
+
+    def test_card_tracks_main_image_and_agent(self, agent_user):
+        """Test the card follows image and agent changes."""
+        prop = self._add_listing(agent_user, 0)
+        card = PropertyCard.objects.get(property=prop)
+        assert card.thumbnail_url == "https://cdn.example.com/0-b.jpg"
+        assert card.location_display == "Lechería, Anzoátegui"
+
+        prop.images.get(is_main=True).delete()
+        agent_user.first_name = "Renamed"
+        agent_user.save()
+
+        card = PropertyCard.objects.get(property=prop)
+        assert card.thumbnail_url == "https://cdn.example.com/0-a.jpg"
+        assert card.agent_name == "Renamed Agent"
+
+    def test_main_image_without_prefetch_reads_one_row(self, agent_user):
+        """Test main_image only loads every image when they are prefetched."""
+        prop = Property.objects.get(pk=self._add_listing(agent_user, 0).pk)
+        with CaptureQueriesContext(connection) as queries:
+            assert prop.main_image.image_url == "https://cdn.example.com/0-b.jpg"
+        assert len(queries) == 1
+        assert "LIMIT 1" in queries[0]["sql"]
+
+        prop = Property.objects.prefetch_related("images").get(pk=prop.pk)
+        with CaptureQueriesContext(connection) as queries:
+            assert prop.main_image.image_url == "https://cdn.example.com/0-b.jpg"
+        assert len(queries) == 0
+
+    def test_list_query_count_is_constant(self, api_client, agent_user, django_assert_num_queries):
+        """Test listing cost does not grow with the number of rows."""
+        url = reverse("public-properties-list")
+        self._add_listing(agent_user, 0)
+        with CaptureQueriesContext(connection) as single:
+            api_client.get(url)
+
+        for index in range(1, 6):
+            self._add_listing(agent_user, index)
+        with django_assert_num_queries(len(single)):
+            response = api_client.get(url)
+
+        assert len(response.data["data"]) == 6
+        assert response.data["data"][0]["main_image"].startswith("https://cdn.example.com/")
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+    """Tests for the keyset pagination mode."""
+
+    def _walk(self, api_client, params):
+        url = reverse("public-properties-list")
+        response = api_client.get(url, {**params, "pagination": "cursor", "page_size": 2})
+        pages = [response.data]
+        while response.data["meta"]["next_cursor"]:
+            response = api_client.get(
+                url, {**params, "cursor": response.data["meta"]["next_cursor"], "page_size": 2}
+            )
+            assert response.status_code == 200
+            pages.append(response.data)
+        return pages
+
+    @pytest.mark.parametrize("ordering", ["price", "-price", "area_sqm", "-area_sqm", "-created_at"])
+    def test_walks_every_row_once(self, api_client, catalogue, ordering):
+        """Test following next cursors yields the same rows as a full listing."""
+        expected = api_client.get(
+            reverse("public-properties-list"), {"ordering": ordering, "page_size": 100}
+        ).data["data"]
+
+        pages = self._walk(api_client, {"ordering": ordering})
+        ids = [row["id"] for page in pages for row in page["data"]]
+
+        assert len(ids) == len(catalogue)
+        assert len(set(ids)) == len(catalogue)
+        assert "total_count" not in pages[0]["meta"]
+        if "area_sqm" not in ordering:
+            # Page-number ordering leaves NULL placement to the database
+            assert [row["price"] for row in expected] == [
+                row["price"] for page in pages for row in page["data"]
+            ]
+
+    def test_previous_cursor_returns_prior_page(self, api_client, catalogue):
+        """Test walking backwards returns the previous page."""
+        pages = self._walk(api_client, {"ordering": "-area_sqm"})
+        response = api_client.get(
+            reverse("public-properties-list"),
+            {"ordering": "-area_sqm", "cursor": pages[2]["meta"]["previous_cursor"], "page_size": 2},
+        )
+
+        assert response.data["data"] == pages[1]["data"]
+        assert response.data["meta"]["has_next"] is True
+
+    def test_cursor_from_other_ordering_is_rejected(self, api_client, catalogue):
+        """Test a cursor cannot be replayed against a different ordering."""
+        pages = self._walk(api_client, {"ordering": "price"})
+        response = api_client.get(
+            reverse("public-properties-list"),
+            {"ordering": "-price", "cursor": pages[0]["meta"]["next_cursor"]},
+        )
+
+        assert response.status_code == 404
+
+
+@pytest.fixture
+def mapped_properties(agent_user):
+    """Create active properties in three Venezuelan cities."""
+    coordinates = {
+        "Caracas Centro": ("10.48060000", "-66.90360000"),
+        "Caracas Chacao": ("10.49630000", "-66.85300000"),
+        "Valencia": ("10.16200000", "-68.00770000"),
+        "Maracaibo": ("10.65440000", "-71.64000000"),
+    }
+    return {
+        title: Property.objects.create(
+            title=title,
+            description="Mapped listing.",
+            status=PropertyStatus.ACTIVE,
+            price=Decimal("100000.00"),
+            address="Calle 1",
+            city=title.split()[0],
+            state="Venezuela",
+            latitude=Decimal(latitude),
+            longitude=Decimal(longitude),
+            agent=agent_user,
+        )
+        for title, (latitude, longitude) in coordinates.items()
+    }
+
+
+@pytest.mark.django_db
+class TestGeoSearch:
+    """Tests for bounding-box and radius filtering."""
+
+    def test_geohash_encoding(self):
+        """Test geohash encoding matches the reference implementation."""
+        assert encode_geohash(57.64911, 10.40744) == "u4pruydqq"
+        assert encode_geohash(-25.382708, -49.265506, 5) == "6gkzw"
+
+    def test_geohash_maintained_on_save(self, mapped_properties):
+        """Test the geohash follows the coordinates."""
+        prop = mapped_properties["Valencia"]
+        assert prop.geohash == encode_geohash(prop.latitude, prop.longitude)
+
+        prop.latitude = None
+        prop.save(update_fields=["latitude"])
+        assert Property.objects.get(pk=prop.pk).geohash == ""
+
+    def test_bbox_cover_is_bounded(self):
+        """Test a bounding box is covered by a bounded set of prefixes."""
+        prefixes = bbox_cover(10.3, -67.1, 10.6, -66.7)
+        assert 0 < len(prefixes) <= 32
+        assert any(encode_geohash(10.4806, -66.9036).startswith(p) for p in prefixes)
+
+    def test_bbox_filter(self, api_client, mapped_properties):
+        """Test bbox returns only listings inside the box."""
+        response = api_client.get(
+            reverse("public-properties-list"), {"bbox": "10.3,-67.1,10.6,-66.7"}
+        )
+
+        assert response.status_code == 200
+        titles = {row["title"] for row in response.data["data"]}
+        assert titles == {"Caracas Centro", "Caracas Chacao"}
+
+    def test_near_orders_by_distance(self, api_client, mapped_properties):
+        """Test near filters by radius and supports distance ordering."""
+        response = api_client.get(
+            reverse("public-properties-list"),
+            {"near": "10.4806,-66.9036", "radius_km": 200, "ordering": "distance"},
+        )
+
+        assert response.status_code == 200
+        rows = response.data["data"]
+        assert [row["title"] for row in rows] == ["Caracas Centro", "Caracas Chacao", "Valencia"]
+        assert rows[0]["distance"] == pytest.approx(0, abs=0.01)
+        assert rows[1]["distance"] == pytest.approx(5.9, abs=0.5)
+
+    def test_distance_ordering_ignored_without_near(self, api_client, mapped_properties):
+        """Test distance ordering is a no-op when no point was given."""
+        response = api_client.get(reverse("public-properties-list"), {"ordering": "distance"})
+
+        assert response.status_code == 200
+        assert len(response.data["data"]) == 4
+        assert all(row["distance"] is None for row in response.data["data"])
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"bbox": "10,-67,9,-66"}, {"bbox": "1,2,3"}, {"near": "abc"}, {"near": "10,-66", "radius_km": -1}],
+    )
+    def test_invalid_geo_params(self, api_client, params):
+        """Test malformed geo parameters are rejected."""
+        response = api_client.get(reverse("public-properties-list"), params)
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestPropertyClusters:
+    """Tests for the map clustering endpoint."""
+
+    def test_national_zoom_groups_listings(self, api_client, mapped_properties):
+        """Test a zoomed-out view aggregates listings into few clusters."""
+        response = api_client.get(reverse("public-properties-clusters"), {"zoom": 2})
+
+        assert response.status_code == 200
+        assert response.data["meta"]["total_count"] == 4
+        assert len(response.data["data"]) == 1
+        cluster = response.data["data"][0]
+        assert cluster["count"] == 4
+        assert cluster["min_price"] == cluster["max_price"] == "100000.00"
+        assert cluster["sample_slug"] in {p.slug for p in mapped_properties.values()}
+
+    def test_street_zoom_splits_clusters_inside_bbox(self, api_client, mapped_properties):
+        """Test a zoomed-in view only clusters listings in the viewport."""
+        response = api_client.get(
+            reverse("public-properties-clusters"), {"zoom": 14, "bbox": "10.3,-67.1,10.6,-66.7"}
+        )
+
+        assert response.status_code == 200
+        assert sorted(cluster["count"] for cluster in response.data["data"]) == [1, 1]
+        centre = min(response.data["data"], key=lambda c: c["longitude"])
+        assert centre["latitude"] == pytest.approx(10.4806)
+
+    def test_respects_property_filters(self, api_client, mapped_properties):
+        """Test PropertyFilter parameters narrow the clustered listings."""
+        response = api_client.get(reverse("public-properties-clusters"), {"zoom": 2, "city": "Valencia"})
+
+        assert response.data["meta"]["total_count"] == 1
+
+    def test_invalid_zoom(self, api_client):
+        """Test a non-numeric zoom is rejected."""
+        response = api_client.get(reverse("public-properties-clusters"), {"zoom": "far"})
+
+        assert response.status_code == 400
+
+    def test_cached_until_properties_change(
+        self, api_client, mapped_properties, locmem_cache, django_assert_num_queries
+    ):
+        """Test clusters are served from cache and invalidated on writes."""
+        url = reverse("public-properties-clusters")
+        api_client.get(url, {"zoom": 2})
+        with django_assert_num_queries(0):
+            response = api_client.get(url, {"zoom": 2})
+        assert response.data["meta"]["total_count"] == 4
+
+        prop = mapped_properties["Maracaibo"]
+        prop.city = "Cabimas"
+        prop.save(update_fields=["city"])
+        Property.objects.filter(pk=prop.pk).delete()
+
+        response = api_client.get(url, {"zoom": 2})
+        assert response.data["meta"]["total_count"] == 3
+
+
+@pytest.mark.django_db
+class TestPropertyFacets:
+    """Tests for the faceted search counts endpoint."""
+
+    @pytest.fixture
+    def listings(self, agent_user):
+        margarita = Location.objects.create(
+            name="Isla de Margarita", slug="isla-de-margarita", state="Nueva Esparta"
+        )
+        rows = [
+            ("house", "sale", 3, 150_000, "Porlamar", "Nueva Esparta", True),
+            ("house", "sale", 4, 420_000, "Porlamar", "Nueva Esparta", False),
+            ("apartment", "sale", 2, 90_000, "Caracas", "Distrito Capital", False),
+            ("apartment", "rent", 1, 800, "Caracas", "Distrito Capital", False),
+            ("villa", "sale", 6, 1_500_000, "Pampatar", "Nueva Esparta", True),
+        ]
+        for index, (kind, listing, bedrooms, price, city, state, beachfront) in enumerate(rows):
+            Property.objects.create(
+                title=f"Facet {index}",
+                description="Facet listing.",
+                status=PropertyStatus.ACTIVE,
+                property_type=kind,
+                listing_type=listing,
+                bedrooms=bedrooms,
+                price=Decimal(price),
+                address="Calle 1",
+                city=city,
+                state=state,
+                location=margarita if state == "Nueva Esparta" else None,
+                is_beachfront=beachfront,
+                agent=agent_user,
+            )
+
+    def _facets(self, api_client, params=None):
+        response = api_client.get(reverse("public-properties-facets"), params or {})
+        assert response.status_code == 200
+        return response.data["data"]
+
+    @staticmethod
+    def _counts(rows, key="value"):
+        return {row[key]: row["count"] for row in rows if row["count"]}
+
+    def test_unfiltered_counts(self, api_client, listings):
+        """Test facet counts over every active listing."""
+        facets = self._facets(api_client)
+
+        assert facets["total"] == 5
+        assert self._counts(facets["property_type"]) == {"house": 2, "apartment": 2, "villa": 1}
+        assert self._counts(facets["state"]) == {"Nueva Esparta": 3, "Distrito Capital": 2}
+        assert self._counts(facets["location"]) == {"isla-de-margarita": 3}
+        assert self._counts(facets["bedrooms"]) == {"1": 1, "2": 1, "3": 1, "4": 1, "5+": 1}
+        assert facets["flags"]["is_beachfront"] == 2
+
+    def test_facets_exclude_their_own_selection(self, api_client, listings):
+        """Test a facet's counts ignore its own filter but apply the others."""
+        facets = self._facets(api_client, {"property_type": "house", "state": "Nueva Esparta"})
+
+        assert facets["total"] == 2
+        # Other property types stay visible, narrowed by the state filter
+        assert self._counts(facets["property_type"]) == {"house": 2, "villa": 1}
+        # Other states stay visible, narrowed by the property type filter
+        assert self._counts(facets["state"]) == {"Nueva Esparta": 2}
+        assert self._counts(facets["city"]) == {"Porlamar": 2}
+        assert facets["flags"]["is_beachfront"] == 1
+
+    def test_price_histogram_follows_listing_type(self, api_client, listings):
+        """Test rentals are binned on the monthly price scale."""
+        sale = self._facets(api_client, {"listing_type": "sale"})
+        rent = self._facets(api_client, {"listing_type": "rent"})
+
+        assert sum(row["count"] for row in sale["price"]) == 4
+        assert {(row["min"], row["max"]): row["count"] for row in sale["price"]}[(1_000_000, None)] == 1
+        assert self._counts(rent["price"], key="min") == {500: 1}
+        assert self._counts(rent["listing_type"]) == {"sale": 4, "rent": 1}
+
+    def test_shared_filters_narrow_every_facet(self, api_client, listings):
+        """Test non-facet filters such as search apply to all counts."""
+        facets = self._facets(api_client, {"location": "isla-de-margarita", "search": "Facet"})
+
+        assert facets["total"] == 3
+        assert self._counts(facets["location"]) == {"isla-de-margarita": 3}
+        assert self._counts(facets["city"]) == {"Porlamar": 2, "Pampatar": 1}
+
+    def test_invalid_filter_is_rejected(self, api_client):
+        """Test invalid filter input returns 400."""
+        response = api_client.get(reverse("public-properties-facets"), {"property_type": "castle"})
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Tests for the anonymous list response cache."""
+
+    def test_anonymous_list_is_cached_until_write(
+        self, api_client, sample_property, locmem_cache, django_assert_num_queries
+    ):
+        """Test a repeated list is served from cache and invalidated on save."""
+        url = reverse("public-properties-list")
+        api_client.get(url, {"city": "Porlamar", "listing_type": "sale"})
+        with django_assert_num_queries(0):
+            # Same parameters in a different order hit the same entry
+            response = api_client.get(f"{url}?listing_type=sale&city=Porlamar")
+        assert response.data["data"][0]["title"] == "Beautiful Beach House"
+
+        sample_property.title = "Renamed Beach House"
+        sample_property.save()
+
+        response = api_client.get(url, {"city": "Porlamar", "listing_type": "sale"})
+        assert response.data["data"][0]["title"] == "Renamed Beach House"
+
+    def test_agent_rename_invalidates_listings(self, api_client, sample_property, agent_user, locmem_cache):
+        """Test listings embedding agent data are invalidated by agent saves."""
+        url = reverse("public-properties-list")
+        api_client.get(url)
+
+        agent_user.first_name = "Renamed"
+        agent_user.save()
+
+        assert api_client.get(url).data["data"][0]["agent_name"] == "Renamed Agent"
+
+    def test_authenticated_requests_bypass_cache(self, authenticated_client, sample_property, locmem_cache):
+        """Test authenticated users always get a freshly computed response."""
+        url = reverse("public-properties-list")
+        authenticated_client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            authenticated_client.get(url)
+        assert len(queries) > 0
+
+
+@pytest.mark.django_db
+class TestSavedState:
+    """Tests for the batched is_saved flag."""
+
+    def test_list_marks_saved_properties(self, authenticated_client, buyer_user, catalogue):
+        """Test list rows expose is_saved for the requesting user."""
+        SavedProperty.objects.create(user=buyer_user, property=catalogue[0])
+
+        response = authenticated_client.get(reverse("public-properties-list"), {"page_size": 100})
+
+        saved = {row["id"] for row in response.data["data"] if row["is_saved"]}
+        assert saved == {str(catalogue[0].pk)}
+
+    def test_saved_state_costs_one_query(self, authenticated_client, buyer_user, catalogue):
+        """Test resolving saved state does not add per-row queries."""
+        url = reverse("public-properties-list")
+        SavedProperty.objects.create(user=buyer_user, property=catalogue[0])
+        with CaptureQueriesContext(connection) as one_saved:
+            authenticated_client.get(url, {"page_size": 100})
+
+        for prop in catalogue[1:]:
+            SavedProperty.objects.create(user=buyer_user, property=prop)
+        with CaptureQueriesContext(connection) as all_saved:
+            response = authenticated_client.get(url, {"page_size": 100})
+
+        assert all(row["is_saved"] for row in response.data["data"])
+        assert len(all_saved) == len(one_saved)
+
+    def test_toggle_invalidates_cached_ids(self, authenticated_client, sample_property, locmem_cache):
+        """Test saving a property is reflected in the cached saved-id set."""
+        sample_property.is_featured = True
+        sample_property.save()
+        detail = reverse("public-properties-detail", kwargs={"slug": sample_property.slug})
+        assert authenticated_client.get(detail).data["data"]["is_saved"] is False
+
+        authenticated_client.post(
+            reverse("saved-properties-toggle"), {"property_id": str(sample_property.pk)}
+        )
+
+        assert authenticated_client.get(detail).data["data"]["is_saved"] is True
+        featured = authenticated_client.get(reverse("public-properties-featured")).data["data"]
+        assert featured[0]["is_saved"] is True
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Tests for ETag / Last-Modified on property detail."""
+
+    def test_matching_etag_returns_304(self, api_client, sample_property, locmem_cache):
+        """Test revalidation with a current ETag skips the payload."""
+        url = reverse("public-properties-detail", kwargs={"slug": sample_property.slug})
+        response = api_client.get(url)
+        etag = response["ETag"]
+        assert etag.startswith('W/"')
+        assert response.has_header("Last-Modified")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        # Only the validator lookup ran, not the full object + images fetch
+        assert len(queries) == 1
+
+    def test_etag_changes_after_update(self, api_client, sample_property, locmem_cache):
+        """Test a changed property is served in full again."""
+        url = reverse("public-properties-detail", kwargs={"slug": sample_property.slug})
+        etag = api_client.get(url)["ETag"]
+
+        PropertyImage.objects.create(property=sample_property, image_url="https://example.com/new.jpg")
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_etag_varies_with_saved_state(self, authenticated_client, buyer_user, sample_property, locmem_cache):
+        """Test saving a property invalidates the user's cached detail."""
+        url = reverse("public-properties-detail", kwargs={"slug": sample_property.slug})
+        etag = authenticated_client.get(url)["ETag"]
+
+        SavedProperty.objects.create(user=buyer_user, property=sample_property)
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["data"]["is_saved"] is True
+
+
+@pytest.mark.django_db
+class TestAsyncReadPath:
+    """Tests for the async (ASGI) public read views."""
+
+    @staticmethod
+    def _get(view, path, slug=None, headers=None):
+        request = AsyncRequestFactory().get(path, headers=headers)
+        kwargs = {"slug": slug} if slug else {}
+        return async_to_sync(view.as_view())(request, **kwargs)
+
+    def test_cached_list_is_served_without_queries(self, api_client, sample_property, locmem_cache):
+        """Test a miss fills the shared cache and the next request needs no query."""
+        url = reverse("public-properties-list")
+        response = self._get(AsyncPropertyListView, url)
+        assert response.status_code == 200
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self._get(AsyncPropertyListView, url)
+        assert len(queries) == 0
+        assert cached["Content-Type"] == "application/json"
+        # Same bytes as the sync view, which now hits the same entry
+        assert cached.content == response.content == api_client.get(url).content
+
+    def test_requests_with_credentials_are_delegated(self, sample_property, locmem_cache):
+        """Test requests carrying credentials never get a cached response."""
+        url = reverse("public-properties-list")
+        self._get(AsyncPropertyListView, url)
+
+        with mock.patch.object(AsyncPropertyListView, "delegate", return_value=HttpResponse()) as delegate:
+            self._get(AsyncPropertyListView, url, headers={"Authorization": "Bearer token"})
+            self._get(AsyncPropertyListView, url, headers={"Cookie": "sessionid=abc"})
+        assert delegate.await_count == 2
+
+    def test_cache_hits_are_throttled(self, sample_property, locmem_cache):
+        """Test anonymous throttling applies before the cache is consulted."""
+        url = reverse("public-properties-list")
+        with (
+            mock.patch.object(PublicPropertyViewSet, "throttle_classes", [AnonRateThrottle]),
+            mock.patch.object(AnonRateThrottle, "rate", "2/min", create=True),
+        ):
+            assert self._get(AsyncPropertyListView, url).status_code == 200
+            assert self._get(AsyncPropertyListView, url).status_code == 200
+            response = self._get(AsyncPropertyListView, url)
+        assert response.status_code == 429
+        assert response.has_header("Retry-After")
+
+    def test_matching_etag_returns_304_and_counts_view(self, api_client, sample_property, locmem_cache):
+        """Test async revalidation accepts the sync ETag and still records the view."""
+        url = reverse("public-properties-detail", kwargs={"slug": sample_property.slug})
+        etag = api_client.get(url)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get(
+                AsyncPropertyDetailView,
+                url,
+                slug=sample_property.slug,
+                headers={"If-None-Match": etag, "User-Agent": "other-browser"},
+            )
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert response.has_header("Last-Modified")
+        assert len(queries) == 1
+        assert flush_view_counts() == {str(sample_property.pk): 2}
+
+    def test_unknown_slug_is_delegated(self, api_client, sample_property, locmem_cache):
+        """Test a missing property gets the regular DRF 404."""
+        url = reverse("public-properties-detail", kwargs={"slug": "missing"})
+        response = self._get(AsyncPropertyDetailView, url, slug="missing", headers={"If-None-Match": 'W/"x"'})
+        assert response.status_code == 404
+        assert response.content == api_client.get(url).content
+
+
+@pytest.mark.django_db
+class TestListingCounts:
+    """Tests for the incrementally maintained listing-count table."""
+
+    @staticmethod
+    def _count(scope, key, listing_type=""):
+        row = ListingCount.objects.filter(scope=scope, key=key, listing_type=listing_type).first()
+        return row.count if row else 0
+
+    def test_counts_follow_workflow_and_edits(self, sample_property, agent_user):
+        """Test counts move with FSM transitions, edits and deletes."""
+        city = ListingCount.Scope.CITY
+        assert self._count(city, "Porlamar|Nueva Esparta") == 1
+        assert self._count(city, "Porlamar|Nueva Esparta", "sale") == 1
+
+        Property.objects.create(
+            title="Pending Property",
+            description="Awaiting review.",
+            status=PropertyStatus.PENDING_REVIEW,
+            price=Decimal("50000.00"),
+            address="456 Review Street",
+            city="Caracas",
+            state="Distrito Capital",
+            agent=agent_user,
+        )
+        assert self._count(city, "Caracas|Distrito Capital") == 0
+
+        pending = Property.objects.get(title="Pending Property")
+        pending.approve()
+        pending.save()
+        assert self._count(city, "Caracas|Distrito Capital") == 1
+
+        moved = Property.objects.get(pk=sample_property.pk)
+        moved.city = "Pampatar"
+        moved.listing_type = "rent"
+        moved.save()
+        assert self._count(city, "Porlamar|Nueva Esparta") == 0
+        assert self._count(city, "Pampatar|Nueva Esparta", "rent") == 1
+
+        moved.deactivate()
+        moved.save()
+        assert self._count(city, "Pampatar|Nueva Esparta") == 0
+
+        Property.objects.filter(pk=pending.pk).delete()
+        assert self._count(city, "Caracas|Distrito Capital") == 0
+
+    def test_location_counts_and_reconcile(self, sample_property, api_client):
+        """Test location counts and the reconcile command."""
+        location = Location.objects.create(name="Margarita", slug="margarita", state="Nueva Esparta")
+        prop = Property.objects.get(pk=sample_property.pk)
+        prop.location = location
+        prop.save()
+        assert self._count(ListingCount.Scope.LOCATION, str(location.pk)) == 1
+
+        # Bulk updates bypass the signals until reconciled
+        Property.objects.filter(pk=prop.pk).update(status=PropertyStatus.SOLD)
+        call_command("reconcile_listing_counts")
+
+        assert self._count(ListingCount.Scope.LOCATION, str(location.pk)) == 0
+        response = api_client.get(reverse("locations-detail", kwargs={"slug": "margarita"}))
+        assert response.data["data"]["property_count"] == 0
+
+    def test_cities_endpoint_reads_counts(self, api_client, sample_property, catalogue):
+        """Test the cities action lists counts per listing type."""
+        response = api_client.get(reverse("public-properties-cities"))
+        assert response.data["data"] == [
+            {"city": "Caracas", "state": "Distrito Capital", "count": 7},
+            {"city": "Porlamar", "state": "Nueva Esparta", "count": 1},
+        ]
+
+        response = api_client.get(reverse("public-properties-cities"), {"listing_type": "rent"})
+        assert response.data["data"] == []
+
+
+class FakeRedis:
+    """The Redis hash commands used by the view counter, in memory."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def hincrby(self, key, field, amount):
+        self.hashes.setdefault(key, {})
+        self.hashes[key][field] = self.hashes[key].get(field, 0) + amount
+
+    def exists(self, key):
+        return int(key in self.hashes)
+
+    def rename(self, source, destination):
+        if source not in self.hashes:
+            raise RedisResponseError("no such key")
+        self.hashes[destination] = self.hashes.pop(source)
+
+    def hgetall(self, key):
+        return {field.encode(): str(value).encode() for field, value in self.hashes.get(key, {}).items()}
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+
+@pytest.mark.django_db
+class TestViewCounting:
+    """Tests for buffered property view counting."""
+
+    def _view(self, api_client, prop, agent="pytest"):
+        url = reverse("public-properties-detail", kwargs={"slug": prop.slug})
+        response = api_client.get(url, HTTP_USER_AGENT=agent)
+        assert response.status_code == 200
+
+    @staticmethod
+    def _view_count(prop):
+        return Property.objects.values_list("view_count", flat=True).get(pk=prop.pk)
+
+    def test_detail_view_does_not_write(self, api_client, sample_property, locmem_cache):
+        """Test a detail request buffers the view instead of updating the row."""
+        with CaptureQueriesContext(connection) as queries:
+            self._view(api_client, sample_property)
+
+        assert not [q for q in queries.captured_queries if q["sql"].startswith("UPDATE")]
+        assert self._view_count(sample_property) == 0
+
+    def test_flush_applies_deduplicated_views(
+        self, api_client, sample_property, locmem_cache, django_capture_on_commit_callbacks
+    ):
+        """Test repeat views by one client count once and flush in batch."""
+        self._view(api_client, sample_property)
+        self._view(api_client, sample_property)
+        self._view(api_client, sample_property, agent="other-browser")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("flush_view_counts")
+        assert self._view_count(sample_property) == 2
+
+        # Buffer is drained: a second flush adds nothing
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("flush_view_counts")
+        assert self._view_count(sample_property) == 2
+
+    def test_dedupe_can_be_disabled(self, api_client, sample_property, locmem_cache, settings):
+        """Test every view counts when the dedupe window is zero."""
+        settings.VIEW_COUNT_DEDUPE_SECONDS = 0
+        for _ in range(3):
+            self._view(api_client, sample_property)
+
+        assert flush_view_counts() == {str(sample_property.pk): 3}
+        assert self._view_count(sample_property) == 3
+
+    def test_failed_flush_is_retried(
+        self, api_client, sample_property, agent_user, locmem_cache, django_capture_on_commit_callbacks
+    ):
+        """Test a flush failing part-way applies nothing and leaves its views to the next run."""
+        other = Property.objects.create(
+            title="Second Listing",
+            description="Another one.",
+            status=PropertyStatus.ACTIVE,
+            price=Decimal("90000.00"),
+            address="Av. Principal",
+            city="Caracas",
+            state="Distrito Capital",
+            agent=agent_user,
+        )
+        self._view(api_client, sample_property)
+        self._view(api_client, other)
+        update = QuerySet.update
+        calls = []
+
+        def failing_update(queryset, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 2:
+                raise DatabaseError("connection lost")
+            return update(queryset, **kwargs)
+
+        with mock.patch("apps.properties.view_counts.FLUSH_BATCH_SIZE", 1), mock.patch.object(
+            QuerySet, "update", failing_update
+        ):
+            with pytest.raises(DatabaseError):
+                flush_view_counts()
+
+        assert self._view_count(sample_property) == 0
+        assert self._view_count(other) == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            flush_view_counts()
+        assert self._view_count(sample_property) == 1
+        assert self._view_count(other) == 1
+
+    @pytest.mark.parametrize("backend", ["cache", "redis"])
+    def test_overlapping_flushes_apply_views_once(
+        self, backend, api_client, sample_property, locmem_cache, django_capture_on_commit_callbacks
+    ):
+        """Test a flush started before the previous one cleaned up skips its views."""
+        redis = FakeRedis() if backend == "redis" else None
+        with mock.patch("apps.properties.view_counts._redis", return_value=redis):
+            self._view(api_client, sample_property)
+            with django_capture_on_commit_callbacks() as callbacks:
+                assert flush_view_counts() == {str(sample_property.pk): 1}
+                assert flush_view_counts() == {}
+            for callback in callbacks:
+                callback()
+            with django_capture_on_commit_callbacks(execute=True):
+                assert flush_view_counts() == {}
+
+        assert self._view_count(sample_property) == 1
+
+
+@pytest.mark.django_db
+class TestSimilarProperties:
+    """Tests for the precomputed similar-property index."""
+
+    @pytest.fixture
+    def neighbourhood(self, agent_user):
+        def create(title, price, bedrooms, listing_type="sale", latitude=11.0):
+            return Property.objects.create(
+                title=title,
+                description="Similarity listing.",
+                status=PropertyStatus.ACTIVE,
+                listing_type=listing_type,
+                price=Decimal(price),
+                bedrooms=bedrooms,
+                bathrooms=2,
+                address="Calle 1",
+                city="Porlamar",
+                state="Nueva Esparta",
+                latitude=Decimal(str(latitude)),
+                longitude=Decimal("-63.85"),
+                features=["pool"],
+                agent=agent_user,
+            )
+
+        return {
+            "base": create("Base", 150000, 3),
+            "twin": create("Twin", 155000, 3, latitude=11.001),
+            "bigger": create("Bigger", 600000, 6, latitude=10.5),
+            "rental": create("Rental", 1200, 3, listing_type="rent"),
+        }
+
+    def test_command_builds_neighbours(self, neighbourhood):
+        """Test the command stores ranked neighbours for every listing."""
+        call_command("build_similar_properties", "--top-k", "2", stdout=StringIO())
+
+        base = neighbourhood["base"]
+        ranked = list(
+            SimilarProperty.objects.filter(property=base).order_by("rank").values_list("similar_id", flat=True)
+        )
+        assert ranked[0] == neighbourhood["twin"].pk
+        assert len(ranked) == 2
+        assert SimilarProperty.objects.count() == 2 * len(neighbourhood)
+
+    def test_blocks_follow_memory_budget(self, neighbourhood):
+        """Test float32 vectors are compared in budget-sized blocks with the same result."""
+        rows = list(Property.objects.order_by("pk").values(*VALUE_FIELDS))
+        vectors = build_vectors(rows)
+        assert vectors.dtype == np.float32
+        assert block_rows(300_000, vectors.itemsize, 64 * 1024 * 1024) == 18
+        assert block_rows(10, vectors.itemsize, 1) == 1
+
+        everything = np.arange(len(rows))
+        whole = [(row, list(order)) for row, order, _scores in top_k(vectors, everything, 2)]
+        single = [(row, list(order)) for row, order, _scores in top_k(vectors, everything, 2, block_size=1)]
+        assert whole == single
+
+    def test_endpoint_returns_most_similar_first(self, api_client, neighbourhood):
+        """Test the similar action lists active neighbours in rank order."""
+        refresh_similar_properties(full=True)
+        neighbourhood["bigger"].deactivate()
+        neighbourhood["bigger"].save()
+
+        url = reverse("public-properties-similar", kwargs={"slug": neighbourhood["base"].slug})
+        response = api_client.get(url, {"limit": 5})
+
+        assert response.status_code == 200
+        slugs = [item["slug"] for item in response.data["data"]]
+        assert slugs[0] == neighbourhood["twin"].slug
+        assert neighbourhood["bigger"].slug not in slugs
+
+    def test_incremental_refresh(self, neighbourhood):
+        """Test incremental runs only recompute changed and affected listings."""
+        assert refresh_similar_properties(k=2) == len(neighbourhood)
+        assert refresh_similar_properties(k=2) == 0
+
+        rental = Property.objects.get(pk=neighbourhood["rental"].pk)
+        rental.price = Decimal("1300")
+        rental.save()
+        recomputed = refresh_similar_properties(k=2)
+        assert 1 <= recomputed <= len(neighbourhood)
+        assert refresh_similar_properties(k=2) == 0
+
+        Property.objects.filter(pk=neighbourhood["twin"].pk).delete()
+        refresh_similar_properties(k=2)
+        assert not SimilarProperty.objects.filter(similar_id=neighbourhood["twin"].pk).exists()
+
+
+@pytest.mark.django_db
+class TestSavedSearches:
+    """Tests for saved searches and new-listing matching."""
+
+    @staticmethod
+    def _pending(agent_user, **overrides):
+        values = {
+            "title": "New Listing",
+            "description": "Fresh on the market.",
+            "status": PropertyStatus.PENDING_REVIEW,
+            "property_type": "house",
+            "listing_type": "sale",
+            "price": Decimal("150000.00"),
+            "bedrooms": 3,
+            "address": "Calle 5",
+            "city": "Porlamar",
+            "state": "Nueva Esparta",
+            "agent": agent_user,
+        }
+        values.update(overrides)
+        return Property.objects.create(**values)
+
+    def test_search_terms_expand_ranges(self):
+        """Test ranges expand to bands and missing predicates become wildcards."""
+        terms = search_terms({"city": "Porlamar ", "min_price": "100000", "max_price": "300000"})
+
+        assert ("city", "porlamar") in terms
+        assert ("property_type", "*") in terms
+        assert [value for dimension, value in terms if dimension == "price_band"] == ["16", "17", "18"]
+        assert ("bedrooms", "*") in terms
+
+    def test_approval_records_matches(
+        self, buyer_user, agent_user, django_capture_on_commit_callbacks
+    ):
+        """Test approving a listing matches only the searches it satisfies."""
+        searches = {
+            name: SavedSearch.objects.create(user=buyer_user, name=name, query=query)
+            for name, query in {
+                "porlamar": {"city": "porlamar", "min_price": "100000", "max_price": "200000"},
+                "houses": {"property_type": "house", "min_bedrooms": "3"},
+                "caracas": {"city": "Caracas"},
+                "cheap": {"max_price": "149999"},
+                "text": {"city": "Porlamar", "search": "penthouse"},
+            }.items()
+        }
+        listing = self._pending(agent_user)
+
+        candidates = set(candidate_search_ids(listing))
+        assert searches["caracas"].pk not in candidates
+        assert searches["porlamar"].pk in candidates
+        assert searches["text"].pk in candidates
+
+        with django_capture_on_commit_callbacks(execute=True):
+            listing = Property.objects.get(pk=listing.pk)
+            listing.approve()
+            listing.save()
+
+        matched = set(SavedSearchMatch.objects.values_list("search__name", flat=True))
+        assert matched == {"porlamar", "houses"}
+
+        # Edits of an already active listing do not re-match
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            listing.price = Decimal("140000.00")
+            listing.save()
+        assert not [c for c in callbacks if c.__qualname__.startswith("match_saved_searches")]
+
+    def test_api_create_and_matches(
+        self, authenticated_client, agent_user, django_capture_on_commit_callbacks
+    ):
+        """Test saved searches are validated and list their matches."""
+        url = reverse("saved-searches-list")
+
+        response = authenticated_client.post(
+            url, {"name": "Bad", "query": {"rooms": "3"}}, format="json"
+        )
+        assert response.status_code == 400
+        response = authenticated_client.post(
+            url, {"name": "Bad", "query": {"property_type": "castle"}}, format="json"
+        )
+        assert response.status_code == 400
+
+        response = authenticated_client.post(
+            url,
+            {"name": "Beach", "query": {"city": "Porlamar", "page": "2", "is_beachfront": True}},
+            format="json",
+        )
+        assert response.status_code == 201
+        assert response.data["query"] == {"city": "Porlamar", "is_beachfront": "True"}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Property.objects.create(
+                title="Beach Villa",
+                description="On the sand.",
+                status=PropertyStatus.ACTIVE,
+                price=Decimal("400000.00"),
+                address="Playa 1",
+                city="Porlamar",
+                state="Nueva Esparta",
+                is_beachfront=True,
+                agent=agent_user,
+            )
+            self._pending(agent_user, is_beachfront=True)
+
+        matches_url = reverse("saved-searches-matches", kwargs={"pk": response.data["id"]})
+        response = authenticated_client.get(matches_url)
+        assert response.status_code == 200
+        assert [item["title"] for item in response.data["data"]] == ["Beach Villa"]
+
+    def test_matches_follow_cursor(self, authenticated_client, buyer_user, agent_user):
+        """Test match cursors key on the match time and page without gaps."""
+        search = SavedSearch.objects.create(user=buyer_user, name="All", query={})
+        for index in range(3):
+            listing = self._pending(agent_user, title=f"Listing {index}", status=PropertyStatus.ACTIVE)
+            SavedSearchMatch.objects.create(search=search, property=listing)
+
+        url = reverse("saved-searches-matches", kwargs={"pk": search.pk})
+        response = authenticated_client.get(url, {"pagination": "cursor", "page_size": 1})
+        titles = [item["title"] for item in response.data["data"]]
+        while response.data["meta"]["next_cursor"]:
+            response = authenticated_client.get(
+                url, {"cursor": response.data["meta"]["next_cursor"], "page_size": 1}
+            )
+            titles += [item["title"] for item in response.data["data"]]
+
+        assert titles == ["Listing 2", "Listing 1", "Listing 0"]
+
+    def test_keyset_rejects_ordering_across_to_many_relation(self):
+        """Test keyset pagination refuses orderings its cursor cannot encode."""
+        queryset = Property.objects.order_by("-saved_search_matches__created_at")
+        with pytest.raises(ImproperlyConfigured):
+            KeysetPagination().get_ordering(queryset)
+
+
+@pytest.mark.django_db
+class TestBulkImport:
+    """Tests for the streaming bulk property import."""
+
+    CSV = (
+        "title,description,price,property_type,bedrooms,address,city,state,features,image_urls,status\n"
+        "Apartment in Caracas,Nice.,120000,apartment,2,Av 1,Caracas,Distrito Capital,pool|gym,"
+        "https://img.example.com/1.jpg|https://img.example.com/2.jpg,active\n"
+        "Apartment in Caracas,Also nice.,not-a-price,apartment,2,Av 2,Caracas,Distrito Capital,,,\n"
+        ",Missing title.,90000,house,3,Av 3,Caracas,Distrito Capital,,,\n"
+        "Apartment in Caracas,Third.,99000,apartment,1,Av 4,Caracas,Distrito Capital,,,\n"
+    )
+
+    def test_api_import_reports_rows(self, agent_client, agent_user):
+        """Test valid rows are created as drafts and invalid rows reported."""
+        Property.objects.create(
+            title="Apartment in Caracas",
+            description="Existing.",
+            price=Decimal("1.00"),
+            address="Av 0",
+            city="Caracas",
+            state="Distrito Capital",
+            agent=agent_user,
+        )
+        upload = SimpleUploadedFile("listings.csv", self.CSV.encode(), content_type="text/csv")
+
+        response = agent_client.post(reverse("agent-properties-bulk-import"), {"file": upload})
+
+        assert response.status_code == 201
+        report = response.data["data"]
+        assert report["created"] == 2
+        assert [error["row"] for error in report["errors"]] == [2, 3]
+        assert "price" in report["errors"][0]["errors"]
+        assert "title" in report["errors"][1]["errors"]
+        assert [row["slug"] for row in report["properties"]] == [
+            "apartment-in-caracas-1",
+            "apartment-in-caracas-2",
+        ]
+
+        imported = Property.objects.get(slug="apartment-in-caracas-1")
+        assert imported.status == PropertyStatus.DRAFT
+        assert imported.features == ["pool", "gym"]
+        assert imported.images.count() == 2
+        assert imported.card.image_url == "https://img.example.com/1.jpg"
+        assert imported.card.agent_name == agent_user.full_name
+
+    def test_non_slug_integrity_error_is_not_retried(self, agent_user):
+        """Test only slug clashes are retried; other constraint failures fail the chunk."""
+        insert = mock.Mock(side_effect=IntegrityError("violates foreign key constraint"))
+        with mock.patch.object(PropertyImporter, "insert", insert), mock.patch(
+            "apps.properties.importer.logger"
+        ) as logger:
+            report = import_properties(self.CSV.splitlines(keepends=True), agent_user)
+
+        assert insert.call_count == 1
+        assert report["created"] == 0
+        assert report["errors"][0]["errors"]["non_field_errors"][0].startswith("Database error")
+        assert logger.error.call_args.kwargs["exc_info"] is True
+
+    def test_command_imports_ndjson(self, agent_user, tmp_path):
+        """Test the management command imports NDJSON and rejects bad lines."""
+        path = tmp_path / "listings.ndjson"
+        rows = [
+            {
+                "title": f"Imported House {index}",
+                "description": "Imported.",
+                "price": 100000 + index,
+                "address": "Calle 1",
+                "city": "Porlamar",
+                "state": "Nueva Esparta",
+                "latitude": "10.95",
+                "longitude": "-63.85",
+                "image_url": "https://img.example.com/house.jpg",
+            }
+            for index in range(5)
+        ]
+        path.write_text("\n".join([*map(json.dumps, rows), "{not json", '{"title": "x", "image_url": "ftp://x"}']))
+        out = StringIO()
+
+        call_command("import_properties", str(path), "--agent", agent_user.email, "--chunk-size", "2", stdout=out)
+
+        assert "Imported 5 properties (2 rows rejected)" in out.getvalue()
+        imported = Property.objects.filter(title__startswith="Imported House")
+        assert imported.count() == 5
+        assert all(prop.geohash for prop in imported)
+
+
+@pytest.mark.django_db
+class TestPropertyExport:
+    """Tests for the streaming property export."""
+
+    @staticmethod
+    def _records(response):
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_agent_exports_own_filtered_listings(self, agent_client, sample_property, draft_property, create_user):
+        """Test agents export only their listings, filtered like the list."""
+        other = create_user(email="other-agent@example.com", role="agent")
+        Property.objects.create(
+            title="Someone Else's",
+            description="Not mine.",
+            price=Decimal("1.00"),
+            address="X",
+            city="Porlamar",
+            state="Nueva Esparta",
+            agent=other,
+        )
+        url = reverse("agent-properties-export")
+
+        response = agent_client.get(url, {"export_format": "ndjson", "status": "active"})
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/x-ndjson"
+        records = self._records(response)
+        assert [record["slug"] for record in records] == [sample_property.slug]
+        assert records[0]["price"] == "150000.00"
+        assert records[0]["agent_email"] == "agent@example.com"
+
+    def test_staff_export_full_catalogue(self, api_client, admin_user, sample_property, draft_property):
+        """Test staff export every listing."""
+        api_client.force_authenticate(user=admin_user)
+
+        response = api_client.get(reverse("agent-properties-export"), {"export_format": "ndjson"})
+
+        assert response.status_code == 200
+        assert len(self._records(response)) == 2
+
+
+def _jpeg(size=(1600, 1000), color=(30, 120, 200)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestImageRenditions:
+    """Tests for pre-generated image renditions."""
+
+    def test_render_encodes_every_rendition(self):
+        """Test the worker produces each size in each supported format."""
+        formats = available_formats()
+        result = render(_jpeg(), formats)
+
+        assert (result["width"], result["height"]) == (1600, 1000)
+        sizes = {name: (r["width"], r["height"]) for name, r in result["sizes"].items()}
+        assert sizes == {"thumbnail": (400, 300), "card": (800, 600), "large": (1200, 750)}
+        assert "jpeg" in formats
+        for fmt, data in result["sizes"]["card"]["files"].items():
+            with Image.open(BytesIO(data)) as image:
+                assert image.format == {"jpeg": "JPEG", "webp": "WEBP", "avif": "AVIF"}[fmt]
+
+    def test_render_computes_metadata(self):
+        """Test intrinsic size honours EXIF rotation and colour/placeholder are compact."""
+        buffer = BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotated 90 degrees
+        Image.new("RGB", (1600, 1000), (200, 40, 40)).save(buffer, "JPEG", exif=exif)
+
+        result = render(buffer.getvalue(), available_formats())
+
+        assert (result["width"], result["height"]) == (1000, 1600)
+        assert result["sizes"]["large"]["height"] == 900
+        red, green, blue = (int(result["color"][i : i + 2], 16) for i in (1, 3, 5))
+        assert red > 150 and green < 90 and blue < 90
+        assert result["placeholder"].startswith("data:image/")
+        assert len(result["placeholder"]) < 1000
+
+    def test_upload_generates_renditions_after_commit(
+        self, agent_client, sample_property, media_root, django_capture_on_commit_callbacks
+    ):
+        """Test uploads are rendered after commit and lists serve them without Pillow."""
+        url = reverse("agent-properties-upload-image", kwargs={"pk": sample_property.pk})
+        upload = SimpleUploadedFile("beach.jpg", _jpeg(), content_type="image/jpeg")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = agent_client.post(url, {"image": upload, "is_main": True}, format="multipart")
+
+        assert response.status_code == 201
+        # Rendered after the response: the original is served meanwhile
+        assert response.data["data"]["thumbnail_url"] == response.data["data"]["url"]
+        image = PropertyImage.objects.get(property=sample_property)
+        thumbnail = image.renditions["sizes"]["thumbnail"]
+        assert (thumbnail["width"], thumbnail["height"]) == (400, 300)
+        assert (media_root / thumbnail["files"]["jpeg"]).exists()
+        card = PropertyCard.objects.get(property=sample_property)
+        assert card.thumbnail_url.endswith(thumbnail["files"]["jpeg"])
+
+        with mock.patch("PIL.Image.open", side_effect=AssertionError("Pillow on the request path")):
+            response = agent_client.get(reverse("public-properties-list"))
+            detail = agent_client.get(reverse("public-properties-detail", kwargs={"slug": sample_property.slug}))
+
+        listing = response.data["data"][0]
+        assert listing["main_image"].endswith(thumbnail["files"]["jpeg"])
+        assert "400w" in listing["main_image_srcset"]["jpeg"]
+        assert set(listing["main_image_srcset"]) == set(available_formats())
+        image_data = detail.data["data"]["images"][0]
+        assert image_data["large_url"].endswith(image.renditions["sizes"]["large"]["files"]["jpeg"])
+        assert image_data["srcset"] == listing["main_image_srcset"]
+        assert (image_data["width"], image_data["height"]) == (1600, 1000)
+        assert listing["main_image_meta"] == {
+            "width": 1600,
+            "height": 1000,
+            "dominant_color": image_data["dominant_color"],
+            "placeholder": image_data["placeholder"],
+        }
+        assert image_data["placeholder"].startswith("data:image/")
+
+    def test_replaced_and_deleted_images_drop_renditions(
+        self, sample_property, media_root, django_capture_on_commit_callbacks
+    ):
+        """Test stale renditions are removed and the command backfills missing ones."""
+        with django_capture_on_commit_callbacks(execute=True):
+            image = PropertyImage.objects.create(
+                property=sample_property, image=SimpleUploadedFile("a.jpg", _jpeg()), is_main=True
+            )
+        image.refresh_from_db()
+        old_files = [media_root / name for r in image.renditions["sizes"].values() for name in r["files"].values()]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            image.image = SimpleUploadedFile("b.jpg", _jpeg(color=(200, 10, 10)))
+            image.save()
+        image.refresh_from_db()
+        assert image.renditions["source"] == image.image.name
+        assert not any(path.exists() for path in old_files)
+
+        PropertyImage.objects.filter(pk=image.pk).update(renditions={})
+        call_command("generate_renditions", stdout=StringIO())
+        image.refresh_from_db()
+        new_files = [media_root / name for r in image.renditions["sizes"].values() for name in r["files"].values()]
+        assert all(path.exists() for path in new_files)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            image.delete()
+        assert not any(path.exists() for path in new_files)
+
+
+@pytest.fixture
+def image_server():
+    """Serve images from a local HTTP server; yields (base URL, routes, hits)."""
+    routes, hits = {}, []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            if self.path not in routes:
+                self.send_error(404)
+                return
+            content_type, body = routes[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", routes, hits
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.django_db
+class TestImageMirroring:
+    """Tests for mirroring external image URLs."""
+
+    def test_mirrors_and_deduplicates_by_content(
+        self, settings, sample_property, media_root, image_server, django_capture_on_commit_callbacks
+    ):
+        """Test URLs are fetched once, identical content shares one file and renditions."""
+        settings.IMAGE_MIRROR_ALLOW_PRIVATE_HOSTS = True
+        base, routes, hits = image_server
+        routes["/a.jpg"] = ("image/jpeg", _jpeg())
+        routes["/copy-of-a.jpg"] = ("image/jpeg", _jpeg())
+        routes["/page.html"] = ("text/html", b"<html></html>")
+        main = PropertyImage.objects.create(property=sample_property, image_url=f"{base}/a.jpg", is_main=True)
+        same_url = PropertyImage.objects.create(property=sample_property, image_url=f"{base}/a.jpg", order=1)
+        same_content = PropertyImage.objects.create(
+            property=sample_property, image_url=f"{base}/copy-of-a.jpg", order=2
+        )
+        missing = PropertyImage.objects.create(property=sample_property, image_url=f"{base}/gone.jpg", order=3)
+        html = PropertyImage.objects.create(property=sample_property, image_url=f"{base}/page.html", order=4)
+
+        report = mirror_external_images(PropertyImage, workers=4)
+
+        assert report["urls"] == 4
+        assert report["images"] == 3
+        assert (report["stored"], report["reused"]) == (1, 1)
+        assert [failure["error"] for failure in report["failed"]] == ["HTTP 404", "Not an image (text/html)"]
+        assert sorted(hits).count("/a.jpg") == 1
+        images = {image.pk: image for image in PropertyImage.objects.all()}
+        assert images[main.pk].image.name.startswith("mirror/")
+        assert images[main.pk].image.name == images[same_url.pk].image.name == images[same_content.pk].image.name
+        assert images[main.pk].image_url == f"{base}/a.jpg"
+        assert not images[missing.pk].image and not images[html.pk].image
+        assert len(list((media_root / "mirror").glob("*/*.jpg"))) == 1
+        # One set of renditions, shared by the three rows
+        assert images[main.pk].renditions == images[same_content.pk].renditions
+        assert images[main.pk].renditions["sizes"]["thumbnail"]["files"]["jpeg"]
+        card = PropertyCard.objects.get(property=sample_property)
+        assert card.thumbnail_url.endswith(images[main.pk].renditions["sizes"]["thumbnail"]["files"]["jpeg"])
+
+        # Shared rendition files survive until the last row is deleted
+        thumbnail = media_root / images[main.pk].renditions["sizes"]["thumbnail"]["files"]["jpeg"]
+        with django_capture_on_commit_callbacks(execute=True):
+            images[main.pk].delete()
+            images[same_url.pk].delete()
+        assert thumbnail.exists()
+        with django_capture_on_commit_callbacks(execute=True):
+            images[same_content.pk].delete()
+        assert not thumbnail.exists()
+
+    def test_waits_for_and_reports_rendition_failures(
+        self, settings, sample_property, media_root, image_server
+    ):
+        """Test mirroring waits for background renditions and reports the failed ones."""
+        settings.IMAGE_MIRROR_ALLOW_PRIVATE_HOSTS = True
+        settings.IMAGE_RENDITIONS_ASYNC = True
+        base, routes, _hits = image_server
+        routes["/a.jpg"] = ("image/jpeg", _jpeg())
+        routes["/b.jpg"] = ("image/jpeg", _jpeg(color=(0, 0, 255)))
+        good = PropertyImage.objects.create(property=sample_property, image_url=f"{base}/a.jpg")
+        bad = PropertyImage.objects.create(property=sample_property, image_url=f"{base}/b.jpg", order=1)
+
+        def schedule(model, pk):
+            future = Future()
+            if pk == bad.pk:
+                future.set_exception(BrokenProcessPool("worker died"))
+            else:
+                future.set_result(True)
+            return future
+
+        with mock.patch("apps.common.mirroring.schedule_renditions", side_effect=schedule) as scheduled:
+            report = mirror_external_images(PropertyImage)
+
+        assert {call.args[1] for call in scheduled.call_args_list} == {good.pk, bad.pk}
+        assert report["images"] == 2
+        assert report["rendition_failures"] == [{"id": str(bad.pk), "error": "worker died"}]
+
+    def test_private_hosts_are_refused(self, sample_property, media_root, image_server):
+        """Test loopback URLs are not fetched by default."""
+        base, routes, hits = image_server
+        routes["/a.jpg"] = ("image/jpeg", _jpeg())
+        PropertyImage.objects.create(property=sample_property, image_url=f"{base}/a.jpg")
+
+        report = mirror_external_images(PropertyImage)
+
+        assert report["images"] == 0
+        assert "non-public address" in report["failed"][0]["error"]
+        assert hits == []
+
+
 @pytest.mark.django_db
 class TestAgentPropertyViewSet:
     """Tests for AgentPropertyViewSet."""